@@ -1,12 +1,16 @@
 import os
 from flask import Flask
-from flask_sqlalchemy import SQLAlchemy
 from flask_migrate import Migrate
 from flask_wtf.csrf import CSRFProtect
 from config import Config
+from app.utils.db_routing import RoutingSQLAlchemy, init_read_routing
+from app.utils.query_budget import init_query_budget
+from app.utils.slow_query_log import init_slow_query_log
+from app.utils.assets import init_assets
+from app.utils.compression import init_compression
 
 # Initialize extensions
-db = SQLAlchemy()
+db = RoutingSQLAlchemy()
 migrate = Migrate()
 csrf = CSRFProtect()
 
@@ -29,15 +33,9 @@ def register_template_globals(app):
     """Register custom template global functions"""
     app.jinja_env.globals['hasattr'] = hasattr
 
-def register_context_processors(app):
-    """Register template context processors"""
-    import time
-    
-    @app.context_processor
-    def inject_cache_bust():
-        return {
-            'cache_bust_version': int(time.time())
-        }
+def register_template_extensions(app):
+    """Register Jinja extensions: {% cache %} fragment caching"""
+    app.jinja_env.add_extension('app.utils.fragment_cache.FragmentCacheExtension')
 
 
 def create_app(config_class=Config):
@@ -45,6 +43,13 @@ def create_app(config_class=Config):
     app = Flask(__name__)
     app.config.from_object(config_class)
 
+    # Time pool checkouts unless disabled; copied so the config class dict is never mutated
+    if app.config.get('DB_POOL_METRICS'):
+        from app.utils.pool_metrics import InstrumentedQueuePool
+        app.config['SQLALCHEMY_ENGINE_OPTIONS'] = dict(
+            app.config.get('SQLALCHEMY_ENGINE_OPTIONS', {}), poolclass=InstrumentedQueuePool
+        )
+
     # Initialize extensions with the app
     db.init_app(app)
     csrf.init_app(app)
@@ -69,8 +74,11 @@ def create_app(config_class=Config):
     # Register custom template globals
     register_template_globals(app)
     
-    # Register context processors
-    register_context_processors(app)
+    # Register custom template extensions
+    register_template_extensions(app)
+    
+    # Fingerprinted static assets and the static_url() template helper
+    init_assets(app)
 
     # Create local upload directory for temp files if needed (not the WebDAV mount)
     uploads_dir = app.config.get('UPLOAD_FOLDER')
@@ -120,6 +128,12 @@ def create_app(config_class=Config):
     except ImportError as e:
         app.logger.warning(f"Keyword API routes not available: {e}")
     
+    try:
+        from app.api.typeahead_api import typeahead_api
+        app.register_blueprint(typeahead_api)  # Already has url_prefix
+    except ImportError as e:
+        app.logger.warning(f"Typeahead API routes not available: {e}")
+    
     # Register web blueprints
     try:
         from app.web.component_routes import component_web
@@ -158,4 +172,23 @@ def create_app(config_class=Config):
     except ImportError as e:
         app.logger.warning(f"Admin web routes not available: {e}")
 
+    # Send GET-only endpoints to the read replica when one is configured
+    init_read_routing(app)
+
+    # Count statements per request in development and test
+    init_query_budget(app)
+
+    # Record slow statements for the admin slow-query page
+    init_slow_query_log(app)
+
+    # gzip/brotli for HTML, JSON and export responses
+    init_compression(app)
+
+    # Shared cache for service results and API responses; committed writes invalidate it by tag
+    try:
+        from app.cache_config import init_cache
+        init_cache(app)
+    except ImportError as e:
+        app.logger.warning(f"Caching not available: {e}")
+
     return app
\ No newline at end of file
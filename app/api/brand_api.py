@@ -1,6 +1,8 @@
 from flask import Blueprint, request, jsonify, current_app, make_response
 from app import db
 from app.models import Brand, Subbrand, Component
+from app.services.typeahead_service import TypeaheadService
+from app.services.brand_service import BrandService
 from sqlalchemy import or_, func
 from datetime import datetime
 import io
@@ -16,17 +18,20 @@ def api_brands_list():
         search = request.args.get('q', '').strip()
         limit = min(int(request.args.get('limit', 20)), 100)
 
-        query = Brand.query
         if search:
-            query = query.filter(Brand.name.ilike(f'%{search}%'))
-
-        brands = query.order_by(Brand.name).limit(limit).all()
+            # Ranked matches come from the in-memory typeahead index
+            brand_ids = TypeaheadService.search_ids('brand', search)[:limit]
+            brands_by_id = {brand.id: brand for brand in Brand.query.filter(Brand.id.in_(brand_ids)).all()}
+            brands = [brands_by_id[brand_id] for brand_id in brand_ids if brand_id in brands_by_id]
+        else:
+            brands = Brand.query.order_by(Brand.name).limit(limit).all()
 
+        counts = BrandService.get_brand_counts([brand.id for brand in brands])
         results = [{
             'id': brand.id,
             'name': brand.name,
-            'subbrands_count': len(brand.subbrands),
-            'components_count': brand.get_components_count()
+            'subbrands_count': counts.get(brand.id, {}).get('subbrands_count', 0),
+            'components_count': counts.get(brand.id, {}).get('components_count', 0)
         } for brand in brands]
 
         return jsonify(results)
@@ -129,29 +134,32 @@ def api_bulk_delete_brands():
         if not brand_ids:
             return jsonify({'success': False, 'error': 'No brands selected'}), 400
 
-        # Check if any brands have components or subbrands
-        brands_with_dependencies = []
-        for brand_id in brand_ids:
-            brand = Brand.query.get(brand_id)
-            if brand:
-                components_count = brand.get_components_count()
-                if components_count > 0 or brand.subbrands:
-                    brands_with_dependencies.append(brand.name)
+        try:
+            brand_ids = [int(id) for id in brand_ids]
+        except (ValueError, TypeError):
+            return jsonify({'success': False, 'error': 'All brand IDs must be valid integers'}), 400
+
+        # One grouped dependency check and one set-based delete
+        outcome = BrandService.bulk_delete(brand_ids)
+        deleted_count = outcome['deleted_count']
+        blocked = [r['name'] for r in outcome['results'] if r['status'] == 'blocked']
 
-        if brands_with_dependencies:
+        if not deleted_count and blocked:
             return jsonify({
                 'success': False,
-                'error': f'Cannot delete brands with dependencies: {", ".join(brands_with_dependencies)}'
+                'error': f'Cannot delete brands with dependencies: {", ".join(blocked)}',
+                'results': outcome['results']
             }), 400
 
-        # Delete brands
-        deleted_count = Brand.query.filter(Brand.id.in_(brand_ids)).delete()
-        db.session.commit()
+        message = f'{deleted_count} brand(s) deleted successfully'
+        if blocked:
+            message += f'; skipped brands with dependencies: {", ".join(blocked)}'
 
         return jsonify({
             'success': True,
             'deleted_count': deleted_count,
-            'message': f'{deleted_count} brand(s) deleted successfully'
+            'results': outcome['results'],
+            'message': message
         })
 
     except Exception as e:
@@ -167,11 +175,12 @@ def api_export_brands():
         # Get selected IDs if provided
         selected_ids = request.args.get('ids', '')
 
+        brand_ids = None
         if selected_ids:
             brand_ids = [int(id.strip()) for id in selected_ids.split(',') if id.strip()]
-            brands = Brand.query.filter(Brand.id.in_(brand_ids)).order_by(Brand.name).all()
-        else:
-            brands = Brand.query.order_by(Brand.name).all()
+
+        # Brands with counts in one grouped query
+        brands = BrandService.brand_stats_query(brand_ids=brand_ids).all()
 
         # Create CSV data
         output = io.StringIO()
@@ -181,11 +190,11 @@ def api_export_brands():
         writer.writerow(['Brand Name', 'Subbrands Count', 'Components Count', 'Created At', 'Updated At'])
 
         # Write data
-        for brand in brands:
+        for brand, subbrands_count, components_count in brands:
             writer.writerow([
                 brand.name,
-                len(brand.subbrands),
-                brand.get_components_count(),
+                subbrands_count,
+                components_count,
                 brand.created_at.strftime('%Y-%m-%d %H:%M:%S') if brand.created_at else '',
                 brand.updated_at.strftime('%Y-%m-%d %H:%M:%S') if brand.updated_at else ''
             ])
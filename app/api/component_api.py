@@ -1,10 +1,15 @@
-from flask import Blueprint, request, jsonify, current_app, send_file, session, url_for
+from flask import Blueprint, request, jsonify, current_app, send_file, session, url_for, stream_with_context
 from werkzeug.utils import secure_filename
 from app import db, csrf
 from app.models import Component, ComponentType, Supplier, Category, Brand, ComponentBrand, Picture, ComponentVariant, Keyword, keyword_component, Color, ComponentTypeProperty
 from app.utils.file_handling import save_uploaded_file, allowed_file, generate_picture_name
+from app.services.property_service import PropertyService
+from app.utils.db_routing import use_primary
+from app.utils.query_budget import query_budget
+from app.utils.loading_profiles import component_profile
+from app.utils.cache import cached_view, entity_tag
 from sqlalchemy import or_, and_, func
-from sqlalchemy.orm import joinedload, selectinload
+from sqlalchemy.orm import selectinload
 import io
 import csv
 import os
@@ -147,6 +152,7 @@ def create_component():
 
 
 @component_api.route('/components/search')
+@query_budget(5)
 def search_components():
     """
     API endpoint for searching components with autocomplete support
@@ -155,16 +161,21 @@ def search_components():
         query = request.args.get('q', '').strip()
         limit = request.args.get('limit', 10, type=int)
         
-        if not query:
+        property_filters = PropertyService.component_property_filters(request.args)
+        
+        if not query and not property_filters:
             return jsonify({'results': []})
         
         # Search for components
-        components = Component.query.filter(
-            or_(
+        filters = list(property_filters)
+        if query:
+            filters.append(or_(
                 Component.product_number.ilike(f'%{query}%'),
                 Component.description.ilike(f'%{query}%')
-            )
-        ).limit(limit).all()
+            ))
+        components = Component.query.options(
+            *component_profile('listing')
+        ).filter(*filters).limit(limit).all()
         
         results = []
         for comp in components:
@@ -218,7 +229,7 @@ def export_component(component_id):
     Export single component data as CSV
     """
     try:
-        component = Component.query.get_or_404(component_id)
+        component = Component.query.options(*component_profile('export')).get_or_404(component_id)
         
         # Create CSV in memory
         output = io.StringIO()
@@ -291,67 +302,71 @@ def bulk_delete_components():
         return jsonify({'success': False, 'error': str(e)}), 500
 
 
+def _build_export_query():
+    """
+    Build the filtered Component query shared by the export endpoints (same filters as index route)
+    """
+    search = request.args.get('search', '', type=str).strip()
+    component_type_ids = request.args.getlist('component_type_id')
+    component_type_ids = [int(id) for id in component_type_ids if id.isdigit()]
+    supplier_ids = request.args.getlist('supplier_id')
+    supplier_ids = [int(id) for id in supplier_ids if id.isdigit()]
+    brand_ids = request.args.getlist('brand_id')
+    brand_ids = [int(id) for id in brand_ids if id.isdigit()]
+    status = request.args.get('status', type=str)
+
+    query = Component.query
+
+    # Apply filters
+    filters = []
+
+    if search:
+        filters.append(or_(
+            Component.product_number.ilike(f'%{search}%'),
+            Component.description.ilike(f'%{search}%')
+        ))
+
+    if component_type_ids:
+        filters.append(Component.component_type_id.in_(component_type_ids))
+
+    if supplier_ids:
+        filters.append(Component.supplier_id.in_(supplier_ids))
+
+    if brand_ids:
+        brand_components_subquery = db.session.query(ComponentBrand.component_id).filter(
+            ComponentBrand.brand_id.in_(brand_ids)
+        ).subquery()
+        filters.append(Component.id.in_(brand_components_subquery))
+
+    if status:
+        if status == 'approved':
+            filters.append(and_(
+                Component.proto_status == 'ok',
+                Component.sms_status == 'ok',
+                Component.pps_status == 'ok'
+            ))
+        elif status == 'pending':
+            filters.append(or_(
+                Component.proto_status == 'pending',
+                Component.sms_status == 'pending',
+                Component.pps_status == 'pending'
+            ))
+
+    filters.extend(PropertyService.component_property_filters(request.args))
+
+    if filters:
+        query = query.filter(and_(*filters))
+
+    return query
+
+
 @component_api.route('/components/export')
 def export_components():
     """
     Export filtered components as CSV
     """
     try:
-        # Get filter parameters (same as index route)
-        search = request.args.get('search', '', type=str).strip()
-        component_type_ids = request.args.getlist('component_type_id')
-        component_type_ids = [int(id) for id in component_type_ids if id.isdigit()]
-        supplier_ids = request.args.getlist('supplier_id')
-        supplier_ids = [int(id) for id in supplier_ids if id.isdigit()]
-        brand_ids = request.args.getlist('brand_id')
-        brand_ids = [int(id) for id in brand_ids if id.isdigit()]
-        status = request.args.get('status', type=str)
-        
-        # Build query
-        query = Component.query.options(
-            joinedload(Component.component_type),
-            joinedload(Component.supplier),
-            joinedload(Component.category),
-            joinedload(Component.brands)
-        )
-        
-        # Apply filters
-        filters = []
-        
-        if search:
-            filters.append(or_(
-                Component.product_number.ilike(f'%{search}%'),
-                Component.description.ilike(f'%{search}%')
-            ))
-        
-        if component_type_ids:
-            filters.append(Component.component_type_id.in_(component_type_ids))
-        
-        if supplier_ids:
-            filters.append(Component.supplier_id.in_(supplier_ids))
-        
-        if brand_ids:
-            brand_components_subquery = db.session.query(ComponentBrand.component_id).filter(
-                ComponentBrand.brand_id.in_(brand_ids)
-            ).subquery()
-            filters.append(Component.id.in_(brand_components_subquery))
-        
-        if status:
-            if status == 'approved':
-                filters.append(and_(
-                    Component.proto_status == 'ok',
-                    Component.sms_status == 'ok',
-                    Component.pps_status == 'ok'
-                ))
-            elif status == 'pending':
-                filters.append(or_(
-                    Component.proto_status == 'pending',
-                    Component.sms_status == 'pending',
-                    Component.pps_status == 'pending'
-                ))
-        
-        if filters:
-            query = query.filter(and_(*filters))
+        query = _build_export_query().options(*component_profile('export'))
         
         components = query.all()
         
@@ -370,7 +385,7 @@ def export_components():
                 comp.product_number,
                 comp.description or '',
                 comp.supplier.supplier_code if comp.supplier else '',
-                comp.category.name if comp.category else '',
+                ', '.join([c.name for c in comp.categories]),
                 comp.component_type.name if comp.component_type else '',
                 brands,
                 comp.proto_status or '',
@@ -392,6 +407,80 @@ def export_components():
         return jsonify({'error': 'Export failed'}), 500
 
 
+@component_api.route('/components/export.jsonl')
+def export_components_jsonl():
+    """
+    Export filtered components as JSON Lines, one full component graph per line
+    (variants with SKUs, pictures, brands, categories, keywords and properties).
+    Streamed in windows so large catalogues are not held in memory.
+    """
+    from app.services.export_service import CatalogueExportService
+
+    try:
+        query = _build_export_query()
+        window_size = request.args.get('window', CatalogueExportService.DEFAULT_WINDOW_SIZE, type=int)
+        window_size = max(1, min(window_size, 1000))
+
+        response = current_app.response_class(
+            stream_with_context(CatalogueExportService.iter_jsonl(query, window_size)),
+            mimetype='application/x-ndjson'
+        )
+        response.headers['Content-Disposition'] = f'attachment; filename=components_export_{datetime.now().strftime("%Y%m%d")}.jsonl'
+
+        return response
+
+    except Exception as e:
+        current_app.logger.error(f"Components JSONL export error: {str(e)}")
+        return jsonify({'error': 'Export failed'}), 500
+
+
+@component_api.route('/components/changes')
+@use_primary  # The visibility bound reads the primary's open transactions
+def component_changes():
+    """
+    Incremental change feed as JSON Lines.
+    Pass ?since=<ISO timestamp> for the first call, then ?cursor=<next_cursor> from the previous page.
+    The last line is a cursor record; the same cursor is returned in the X-Next-Cursor header.
+    """
+    from app.services.change_feed_service import ChangeFeedService
+
+    try:
+        cursor = request.args.get('cursor', '', type=str).strip()
+        since = request.args.get('since', '', type=str).strip()
+        limit = request.args.get('limit', ChangeFeedService.DEFAULT_LIMIT, type=int)
+
+        if cursor:
+            position = ChangeFeedService.decode_cursor(cursor)
+        elif since:
+            position = ChangeFeedService.position_from_since(since)
+        else:
+            return jsonify({'success': False, 'error': 'Either since or cursor is required'}), 400
+
+        page = ChangeFeedService.get_changes(position, limit)
+        next_cursor = ChangeFeedService.encode_cursor(page['next_position'])
+
+        def generate():
+            for record in page['records']:
+                yield json.dumps(record) + '\n'
+            yield json.dumps({
+                'type': 'cursor',
+                'next_cursor': next_cursor,
+                'has_more': page['has_more'],
+                'count': len(page['records'])
+            }) + '\n'
+
+        response = current_app.response_class(generate(), mimetype='application/x-ndjson')
+        response.headers['X-Next-Cursor'] = next_cursor
+        response.headers['X-Has-More'] = 'true' if page['has_more'] else 'false'
+        return response
+
+    except ValueError as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+    except Exception as e:
+        current_app.logger.error(f"Change feed error: {str(e)}")
+        return jsonify({'success': False, 'error': 'Change feed failed'}), 500
+
+
 @component_api.route('/components/<int:component_id>/brands', methods=['GET', 'POST', 'DELETE'])
 def manage_component_brands(component_id):
     """
@@ -466,6 +555,8 @@ def manage_component_brands(component_id):
 
 
 @component_api.route('/components/<int:component_id>/variants')
+@query_budget(6)
+@cached_view(timeout=300, tags=lambda component_id: ('colors', entity_tag('component', component_id)))
 def get_component_variants(component_id):
     """
     API endpoint to get fresh variant data with pictures
@@ -475,19 +566,14 @@ def get_component_variants(component_id):
         # Clear session cache to ensure fresh data
         db.session.expunge_all()
         
-        # Query component with variants and pictures
+        # Query component with variants and pictures; the emptied session guarantees fresh rows,
+        # so nothing needs refreshing one object at a time
         component = Component.query.options(
-            joinedload(Component.variants).joinedload(ComponentVariant.color),
-            joinedload(Component.variants).joinedload(ComponentVariant.variant_pictures),
-            joinedload(Component.pictures)
+            selectinload(Component.variants).joinedload(ComponentVariant.color),
+            selectinload(Component.variants).selectinload(ComponentVariant.variant_pictures),
+            selectinload(Component.pictures)
         ).get_or_404(component_id)
         
-        # Explicitly refresh variant data to ensure pictures are loaded
-        for variant in component.variants:
-            db.session.refresh(variant)
-            for picture in variant.variant_pictures:
-                db.session.refresh(picture)
-        
         # Format variant data for frontend
         variants_data = []
         for variant in component.variants:
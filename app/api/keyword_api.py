@@ -5,11 +5,34 @@ Provides smart keyword suggestions to prevent duplicates and misspellings
 from flask import Blueprint, request, jsonify, current_app
 from app.models import Keyword, Component, keyword_component
 from app import db
+from app.utils.keyword_index import get_keyword_index
 from sqlalchemy import func, or_
-import difflib
 
 keyword_api = Blueprint('keyword_api', __name__, url_prefix='/api/keyword')
 
+
+def _usage_counts(keyword_ids):
+    """Usage counts for the given keywords, read from the trigger-maintained counter"""
+    if not keyword_ids:
+        return {}
+    rows = db.session.query(Keyword.id, Keyword.usage_count).filter(
+        Keyword.id.in_(keyword_ids)
+    ).all()
+    return dict(rows)
+
+
+def popular_keywords_query(limit):
+    """Most used keywords first, read in order from ix_keyword_usage_count_name"""
+    return db.session.query(
+        Keyword.id,
+        Keyword.name,
+        Keyword.usage_count
+    ).order_by(
+        Keyword.usage_count.desc(),
+        Keyword.name
+    ).limit(limit)
+
+
 @keyword_api.route('/search', methods=['GET'])
 def search_keywords():
     """
@@ -22,18 +45,7 @@ def search_keywords():
         
         if not query:
             # Return most frequently used keywords if no query
-            popular_keywords = db.session.query(
-                Keyword.id,
-                Keyword.name,
-                func.count(keyword_component.c.keyword_id).label('usage_count')
-            ).outerjoin(
-                keyword_component, Keyword.id == keyword_component.c.keyword_id
-            ).group_by(
-                Keyword.id, Keyword.name
-            ).order_by(
-                func.count(keyword_component.c.keyword_id).desc(),
-                Keyword.name
-            ).limit(limit).all()
+            popular_keywords = popular_keywords_query(limit).all()
             
             return jsonify({
                 'keywords': [
@@ -46,67 +58,55 @@ def search_keywords():
                 ]
             })
         
+        index = get_keyword_index()
+        
         # Direct matches (exact and starts with)
-        exact_matches = Keyword.query.filter(
-            Keyword.name.ilike(f'{query}%')
-        ).order_by(Keyword.name).limit(limit).all()
+        exact_matches = index.prefix(query, limit)
         
-        # Get all keywords for fuzzy matching if we need more results
-        all_keywords = []
+        # Fuzzy matches only among keywords sharing trigrams with the query
+        fuzzy_matches = []
         if len(exact_matches) < limit:
-            all_keywords = Keyword.query.all()
+            exclude = {keyword_id for keyword_id, _ in exact_matches}
+            fuzzy_matches = index.fuzzy(query, 0.6, exclude=exclude)
+        
+        usage_counts = _usage_counts(
+            [keyword_id for keyword_id, _ in exact_matches] +
+            [keyword_id for keyword_id, _, _ in fuzzy_matches]
+        )
         
         # Prepare results
         results = []
         
         # Add exact matches first
-        for keyword in exact_matches:
-            usage_count = db.session.query(func.count(keyword_component.c.keyword_id)).filter(
-                keyword_component.c.keyword_id == keyword.id
-            ).scalar() or 0
-            
-            match_type = 'exact' if keyword.name.lower() == query.lower() else 'starts_with'
+        for keyword_id, name in exact_matches:
+            match_type = 'exact' if name.lower() == query.lower() else 'starts_with'
             
             results.append({
-                'id': keyword.id,
-                'name': keyword.name,
-                'usage_count': usage_count,
+                'id': keyword_id,
+                'name': name,
+                'usage_count': usage_counts.get(keyword_id, 0),
                 'match_type': match_type,
                 'similarity': 1.0 if match_type == 'exact' else 0.9
             })
         
         # Add fuzzy matches if we need more results
-        if len(results) < limit and all_keywords:
-            fuzzy_matches = []
-            query_lower = query.lower()
-            
-            for keyword in all_keywords:
-                if keyword.id in [r['id'] for r in results]:
-                    continue  # Skip already added exact matches
-                
-                # Calculate similarity
-                similarity = difflib.SequenceMatcher(None, query_lower, keyword.name.lower()).ratio()
-                
-                # Only include if similarity is above threshold
-                if similarity > 0.6:
-                    usage_count = db.session.query(func.count(keyword_component.c.keyword_id)).filter(
-                        keyword_component.c.keyword_id == keyword.id
-                    ).scalar() or 0
-                    
-                    fuzzy_matches.append({
-                        'id': keyword.id,
-                        'name': keyword.name,
-                        'usage_count': usage_count,
-                        'match_type': 'fuzzy',
-                        'similarity': similarity
-                    })
+        if len(results) < limit and fuzzy_matches:
+            fuzzy_results = [
+                {
+                    'id': keyword_id,
+                    'name': name,
+                    'usage_count': usage_counts.get(keyword_id, 0),
+                    'match_type': 'fuzzy',
+                    'similarity': similarity
+                } for keyword_id, name, similarity in fuzzy_matches
+            ]
             
             # Sort fuzzy matches by similarity and usage
-            fuzzy_matches.sort(key=lambda x: (-x['similarity'], -x['usage_count']))
+            fuzzy_results.sort(key=lambda x: (-x['similarity'], -x['usage_count']))
             
             # Add fuzzy matches to fill the limit
             remaining_slots = limit - len(results)
-            results.extend(fuzzy_matches[:remaining_slots])
+            results.extend(fuzzy_results[:remaining_slots])
         
         return jsonify({'keywords': results})
         
@@ -137,26 +137,25 @@ def create_keyword():
                 'keyword': {
                     'id': existing_keyword.id,
                     'name': existing_keyword.name,
+                    'usage_count': existing_keyword.usage_count,
                     'created': False,
                     'message': 'Keyword already exists'
                 }
             })
         
         # Check for very similar keywords (potential duplicates)
-        all_keywords = Keyword.query.all()
-        similar_keywords = []
-        
-        for keyword in all_keywords:
-            similarity = difflib.SequenceMatcher(None, keyword_name.lower(), keyword.name.lower()).ratio()
-            if similarity > 0.8:  # High similarity threshold
-                similar_keywords.append({
-                    'id': keyword.id,
-                    'name': keyword.name,
-                    'similarity': similarity
-                })
+        similar_matches = get_keyword_index().fuzzy(keyword_name, 0.8)  # High similarity threshold
+        usage_counts = _usage_counts([keyword_id for keyword_id, _, _ in similar_matches])
+        similar_keywords = [
+            {
+                'id': keyword_id,
+                'name': name,
+                'similarity': similarity,
+                'usage_count': usage_counts.get(keyword_id, 0)
+            } for keyword_id, name, similarity in similar_matches
+        ]
         
         if similar_keywords:
-            similar_keywords.sort(key=lambda x: -x['similarity'])
             return jsonify({
                 'warning': 'Similar keywords found',
                 'similar_keywords': similar_keywords,
@@ -259,23 +258,11 @@ def keyword_stats():
     """
     try:
         # Most used keywords
-        popular_keywords = db.session.query(
-            Keyword.id,
-            Keyword.name,
-            func.count(keyword_component.c.keyword_id).label('usage_count')
-        ).outerjoin(
-            keyword_component, Keyword.id == keyword_component.c.keyword_id
-        ).group_by(
-            Keyword.id, Keyword.name
-        ).order_by(
-            func.count(keyword_component.c.keyword_id).desc()
-        ).limit(20).all()
+        popular_keywords = popular_keywords_query(20).all()
         
         # Total stats
         total_keywords = Keyword.query.count()
-        unused_keywords = db.session.query(Keyword).outerjoin(
-            keyword_component, Keyword.id == keyword_component.c.keyword_id
-        ).filter(keyword_component.c.keyword_id.is_(None)).count()
+        unused_keywords = Keyword.query.filter(Keyword.usage_count == 0).count()
         
         return jsonify({
             'total_keywords': total_keywords,
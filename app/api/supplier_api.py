@@ -5,10 +5,12 @@ import tempfile
 from flask import Blueprint, request, jsonify, current_app, send_file
 from app import db
 from app.models import Supplier, Component
-from app.utils.response import ApiResponse
+from app.utils.response import ApiResponse, paginated_response
 from app.utils.validators import validate_data, supplier_code_validator, description_validator
 from app.utils.database import safe_commit, safe_delete, safe_bulk_delete
 from app.services.csv_service import CSVProcessingService
+from app.services.typeahead_service import TypeaheadService
+from app.services.supplier_service import SupplierService
 
 supplier_api_bp = Blueprint('supplier_api', __name__, url_prefix='/api/suppliers')
 
@@ -116,47 +118,41 @@ def bulk_delete_suppliers():
         except (ValueError, TypeError):
             return ApiResponse.validation_error({'ids': 'All supplier IDs must be valid integers.'})
         
-        # Get suppliers and check for associated components
-        suppliers = Supplier.query.filter(Supplier.id.in_(supplier_ids)).all()
+        # One grouped dependency check and one set-based delete
+        outcome = SupplierService.bulk_delete(supplier_ids)
+        deleted_count = outcome['deleted_count']
+        blocked = [r for r in outcome['results'] if r['status'] == 'blocked']
         
-        if len(suppliers) != len(supplier_ids):
-            return ApiResponse.not_found('One or more suppliers not found.')
+        if not deleted_count:
+            if blocked:
+                return ApiResponse.error(
+                    message='Cannot delete suppliers with associated components.',
+                    errors={
+                        'suppliers_with_components': [
+                            {'supplier_code': r['supplier_code'], 'component_count': r['component_count']}
+                            for r in blocked
+                        ],
+                        'results': outcome['results']
+                    },
+                    status_code=409
+                )
+            return ApiResponse.not_found('No matching suppliers found.')
         
-        # Check for components
-        suppliers_with_components = []
-        for supplier in suppliers:
-            component_count = Component.query.filter_by(supplier_id=supplier.id).count()
-            if component_count > 0:
-                suppliers_with_components.append({
-                    'supplier_code': supplier.supplier_code,
-                    'component_count': component_count
-                })
-        
-        if suppliers_with_components:
-            return ApiResponse.error(
-                message='Cannot delete suppliers with associated components.',
-                errors={'suppliers_with_components': suppliers_with_components},
-                status_code=409
-            )
-        
-        # Safe to delete all
-        deleted_count = 0
-        deleted_suppliers = []
-        
-        for supplier in suppliers:
-            if safe_delete(supplier):
-                deleted_count += 1
-                deleted_suppliers.append(supplier.supplier_code)
+        message = f'Successfully deleted {deleted_count} supplier(s).'
+        if blocked:
+            message += f' Skipped {len(blocked)} supplier(s) with associated components.'
         
         return ApiResponse.success(
             data={
                 'deleted_count': deleted_count,
-                'deleted_suppliers': deleted_suppliers
+                'deleted_suppliers': [r['supplier_code'] for r in outcome['results'] if r['status'] == 'deleted'],
+                'results': outcome['results']
             },
-            message=f'Successfully deleted {deleted_count} supplier(s).'
+            message=message
         )
         
     except Exception as e:
+        db.session.rollback()
         current_app.logger.error(f"Error in bulk delete: {str(e)}")
         return ApiResponse.server_error('Error deleting suppliers.')
 
@@ -232,40 +228,75 @@ def export_suppliers():
         return ApiResponse.server_error('Error exporting suppliers.')
 
 
+@supplier_api_bp.route('/<int:supplier_id>/components', methods=['GET'])
+def supplier_components(supplier_id):
+    """Paginated components of one supplier, fetched on demand by the suppliers page."""
+    try:
+        if not db.session.query(Supplier.id).filter_by(id=supplier_id).first():
+            return ApiResponse.not_found('Supplier not found.')
+        
+        page = max(request.args.get('page', 1, type=int), 1)
+        per_page = max(min(request.args.get('per_page', 20, type=int), 100), 1)  # Max 100 per page
+        sort = request.args.get('sort', 'recent')
+        
+        result = paginated_response(
+            SupplierService.components_query(supplier_id, sort),
+            page, per_page, 'supplier_api.supplier_components',
+            supplier_id=supplier_id, sort=sort
+        )
+        
+        return ApiResponse.success(
+            data={
+                'components': [SupplierService.serialize_component_summary(c) for c in result['items']],
+                'pagination': result['pagination']
+            }
+        )
+        
+    except Exception as e:
+        current_app.logger.error(f"Error loading components for supplier {supplier_id}: {str(e)}")
+        return ApiResponse.server_error('Error loading supplier components.')
+
+
 @supplier_api_bp.route('/search', methods=['GET'])
 def search_suppliers():
     """Search suppliers by code or address."""
     try:
         query_param = request.args.get('q', '').strip()
-        page = request.args.get('page', 1, type=int)
-        per_page = min(request.args.get('per_page', 20, type=int), 100)  # Max 100 per page
+        page = max(request.args.get('page', 1, type=int), 1)
+        per_page = max(min(request.args.get('per_page', 20, type=int), 100), 1)  # Max 100 per page
         
         if not query_param:
             return ApiResponse.validation_error({'q': 'Search query is required.'})
         
-        # Build search query
-        search_query = Supplier.query.filter(
-            db.or_(
-                Supplier.supplier_code.ilike(f'%{query_param}%'),
-                Supplier.address.ilike(f'%{query_param}%')
-            )
-        ).order_by(Supplier.supplier_code)
+        # Ranked matches on code or address come from the in-memory typeahead index
+        supplier_ids = TypeaheadService.search_ids('supplier', query_param)
+        total = len(supplier_ids)
+        pages = (total + per_page - 1) // per_page
+        page_ids = supplier_ids[(page - 1) * per_page:page * per_page]
         
-        # Paginate results
-        pagination = search_query.paginate(
-            page=page,
-            per_page=per_page,
-            error_out=False
-        )
+        # Component counts for the page in one grouped query
+        component_counts = dict(
+            db.session.query(Component.supplier_id, db.func.count(Component.id))
+            .filter(Component.supplier_id.in_(page_ids))
+            .group_by(Component.supplier_id)
+            .all()
+        ) if page_ids else {}
+        suppliers_by_id = {
+            supplier.id: supplier
+            for supplier in Supplier.query.filter(Supplier.id.in_(page_ids)).all()
+        } if page_ids else {}
         
         # Format results
         suppliers_data = []
-        for supplier in pagination.items:
+        for supplier_id in page_ids:
+            supplier = suppliers_by_id.get(supplier_id)
+            if not supplier:
+                continue
             suppliers_data.append({
                 'id': supplier.id,
                 'supplier_code': supplier.supplier_code,
                 'address': supplier.address,
-                'component_count': len(supplier.components),
+                'component_count': component_counts.get(supplier.id, 0),
                 'created_at': supplier.created_at.isoformat() if supplier.created_at else None
             })
         
@@ -273,12 +304,12 @@ def search_suppliers():
             data={
                 'suppliers': suppliers_data,
                 'pagination': {
-                    'page': pagination.page,
-                    'pages': pagination.pages,
-                    'per_page': pagination.per_page,
-                    'total': pagination.total,
-                    'has_next': pagination.has_next,
-                    'has_prev': pagination.has_prev
+                    'page': page,
+                    'pages': pages,
+                    'per_page': per_page,
+                    'total': total,
+                    'has_next': page < pages,
+                    'has_prev': page > 1
                 }
             }
         )
@@ -0,0 +1,30 @@
+"""
+Typeahead API endpoint shared by brand, supplier, category and colour pickers
+Served from per-worker in-memory indexes instead of per-keystroke ilike queries
+"""
+from flask import Blueprint, request, jsonify, current_app
+from app.services.typeahead_service import TypeaheadService
+
+typeahead_api = Blueprint('typeahead_api', __name__, url_prefix='/api/typeahead')
+
+
+@typeahead_api.route('/<entity_type>', methods=['GET'])
+def typeahead(entity_type):
+    """
+    Ranked prefix and infix matches for one entity type (brand, supplier, category, color)
+    """
+    try:
+        if entity_type not in TypeaheadService.ENTITY_TYPES:
+            return jsonify({'error': f'Unknown entity type: {entity_type}'}), 404
+
+        query = request.args.get('q', '').strip()
+        limit = min(request.args.get('limit', 10, type=int), 100)
+
+        if not query:
+            return jsonify({'results': []})
+
+        return jsonify({'results': TypeaheadService.search(entity_type, query, limit)})
+
+    except Exception as e:
+        current_app.logger.error(f"Error in {entity_type} typeahead: {str(e)}")
+        return jsonify({'error': 'Typeahead search failed'}), 500
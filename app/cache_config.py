@@ -4,6 +4,8 @@ Cache configuration and utilities for the component management application.
 
 import os
 from flask_caching import Cache
+from app.utils.cache import entity_tag, invalidate_tags, stable_key
+from app.utils.cache_warming import init_cache_warming, warm_cache
 
 # Cache configuration based on environment
 CACHE_CONFIG = {
@@ -12,7 +14,12 @@ CACHE_CONFIG = {
         'CACHE_DEFAULT_TIMEOUT': 300
     },
     'production': {
-        'CACHE_TYPE': 'redis',   # Redis for production
+        # Per-worker LRU in front of Redis; writes are broadcast over Redis pub/sub
+        'CACHE_TYPE': 'app.utils.two_tier_cache.two_tier_redis',
+        'CACHE_LOCAL_MAX_ENTRIES': int(os.environ.get('CACHE_LOCAL_MAX_ENTRIES', 5000)),
+        'CACHE_LOCAL_MAX_BYTES': int(os.environ.get('CACHE_LOCAL_MAX_BYTES', 64 * 1024 * 1024)),
+        'CACHE_LOCAL_TIMEOUT': int(os.environ.get('CACHE_LOCAL_TIMEOUT', 30)),  # Staleness bound if a broadcast is missed
+        'CACHE_INVALIDATION_CHANNEL': 'webapp_components:invalidate',
         'CACHE_REDIS_HOST': os.environ.get('REDIS_HOST', 'localhost'),
         'CACHE_REDIS_PORT': int(os.environ.get('REDIS_PORT', 6379)),
         'CACHE_REDIS_DB': int(os.environ.get('REDIS_DB', 0)),
@@ -27,27 +34,36 @@ CACHE_CONFIG = {
 }
 
 def init_cache(app):
-    """Initialize cache with the Flask app"""
+    """
+    Initialize cache with the Flask app
+    
+    Settings come from CACHE_CONFIG for the environment (CACHE_ENV, else 'testing' for test apps,
+    else ENV); CACHE_* values already present in the app config take precedence.
+    """
     
     # Get environment
-    env = app.config.get('ENV', 'development')
+    env = app.config.get('CACHE_ENV') or ('testing' if app.testing else app.config.get('ENV', 'development'))
     
     # Get cache config for environment
     cache_config = CACHE_CONFIG.get(env, CACHE_CONFIG['development'])
     
-    # Update app config
-    app.config.update(cache_config)
+    # Update app config without overriding explicit settings
+    for key, value in cache_config.items():
+        app.config.setdefault(key, value)
     
-    # Initialize cache
-    cache = Cache(app)
+    # Initialize cache; {% cache %} is provided by app.utils.fragment_cache with tag invalidation
+    cache = Cache(app, with_jinja2_ext=False)
     
     # Add cache instance to app for access elsewhere
     app.cache = cache
     
+    # Fill the cache before the first request and keep aggregates fresh in the background
+    init_cache_warming(app)
+    
     return cache
 
 def create_cache_key(*args, **kwargs):
-    """Create a consistent cache key from arguments"""
+    """Create a consistent cache key from arguments (identical across worker processes)"""
     key_parts = []
     
     # Add positional arguments
@@ -57,7 +73,7 @@ def create_cache_key(*args, **kwargs):
         elif hasattr(arg, 'id'):
             key_parts.append(f"{arg.__class__.__name__}_{arg.id}")
         else:
-            key_parts.append(str(hash(str(arg))))
+            key_parts.append(stable_key(arg))
     
     # Add keyword arguments
     for k, v in sorted(kwargs.items()):
@@ -66,68 +82,11 @@ def create_cache_key(*args, **kwargs):
     return ":".join(key_parts)
 
 def invalidate_component_cache(cache, component_id=None):
-    """Invalidate component-related cache entries"""
-    patterns_to_clear = [
-        'filter_options',
-        'component_stats',
-        'optimized_components_index',
-        'optimized_suppliers'
-    ]
-    
-    for pattern in patterns_to_clear:
-        try:
-            cache.delete(pattern)
-        except:
-            pass  # Continue if deletion fails
-    
-    # Clear specific component cache if ID provided
+    """
+    Invalidate component-related cache entries: listings, filter options and dashboard stats,
+    plus everything tagged with the component when an ID is given
+    """
+    tags = ['components']
     if component_id:
-        try:
-            cache.delete(f'component_detail_{component_id}')
-        except:
-            pass
-
-def warm_cache(cache, db):
-    """Pre-populate frequently accessed cache entries"""
-    from app.models import ComponentType, Supplier, Category, Brand, ComponentBrand, Component
-    from sqlalchemy import func
-    
-    try:
-        # Warm filter options cache
-        component_types = db.session.query(ComponentType).join(Component).distinct().order_by(ComponentType.name).all()
-        suppliers = db.session.query(Supplier).join(Component).distinct().order_by(Supplier.supplier_code).all()
-        categories = db.session.query(Category).join(Component).distinct().order_by(Category.name).all()
-        brands = db.session.query(Brand).join(ComponentBrand).join(Component).distinct().order_by(Brand.name).all()
-        
-        filter_options = {
-            'component_types': component_types,
-            'suppliers': suppliers,
-            'categories': categories,
-            'brands': brands,
-            'brands_count': len(brands)
-        }
-        
-        cache.set('filter_options', filter_options, timeout=600)
-        
-        # Warm dashboard stats cache
-        stats = db.session.query(
-            func.count(Component.id).label('total_components'),
-            func.count(func.distinct(Component.supplier_id)).label('total_suppliers'),
-            func.count(func.distinct(ComponentBrand.brand_id)).label('total_brands'),
-            func.sum(func.case([(Component.proto_status == 'ok', 1)], else_=0)).label('approved_components')
-        ).outerjoin(ComponentBrand).first()
-        
-        dashboard_stats = {
-            'total_components': stats.total_components or 0,
-            'total_suppliers': stats.total_suppliers or 0,
-            'total_brands': stats.total_brands or 0,
-            'approved_components': stats.approved_components or 0,
-        }
-        
-        cache.set('component_stats', dashboard_stats, timeout=900)
-        
-        return True
-        
-    except Exception as e:
-        print(f"Error warming cache: {e}")
-        return False
\ No newline at end of file
+        tags.append(entity_tag('component', component_id))
+    invalidate_tags(*tags, cache=cache)
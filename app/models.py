@@ -2,6 +2,7 @@ from app import db
 from datetime import datetime
 import json
 from sqlalchemy.orm.attributes import flag_modified
+from sqlalchemy.dialects.postgresql import JSONB
 
 # Define a base class with the schema setting
 class Base(db.Model):
@@ -142,6 +143,7 @@ component_category = db.Table('component_category',
     db.Column('component_id', db.Integer, db.ForeignKey('component_app.component.id'), nullable=False),
     db.Column('category_id', db.Integer, db.ForeignKey('component_app.category.id'), nullable=False),
     db.UniqueConstraint('component_id', 'category_id'),
+    db.Index('ix_component_category_category_id', 'category_id', 'component_id'),
     schema='component_app'
 )
 
@@ -200,7 +202,7 @@ class Brand(Base):
 
     def get_components_count(self):
         """Get count of components using this brand"""
-        return len(self.component_associations)
+        return ComponentBrand.query.filter_by(brand_id=self.id).count()
 
     @property
     def components(self):
@@ -219,6 +221,7 @@ class Subbrand(Base):
     # Ensure unique subbrand name per brand
     __table_args__ = (
         db.UniqueConstraint('name', 'brand_id', name='_brand_subbrand_uc'),
+        db.Index('ix_subbrand_brand_id', 'brand_id'),
         {'schema': 'component_app'}
     )
 
@@ -234,6 +237,12 @@ class Keyword(Base):
     
     id = db.Column(db.Integer, primary_key=True)
     name = db.Column(db.String(100), unique=True, nullable=False)
+    usage_count = db.Column(db.Integer, nullable=False, default=0, server_default='0')  # Maintained by database trigger on keyword_component
+
+    __table_args__ = (
+        db.Index('ix_keyword_usage_count_name', db.text('usage_count DESC'), 'name'),
+        {'schema': 'component_app'}
+    )
 
     def __repr__(self):
         return f'<Keyword {self.name}>'
@@ -244,6 +253,7 @@ keyword_component = db.Table('keyword_component',
     db.Column('component_id', db.Integer, db.ForeignKey('component_app.component.id'), nullable=False),
     db.Column('keyword_id', db.Integer, db.ForeignKey('component_app.keyword.id'), nullable=False),
     db.UniqueConstraint('component_id', 'keyword_id'),
+    db.Index('ix_keyword_component_keyword_id', 'keyword_id', 'component_id'),
     schema='component_app'
 )
 
@@ -260,6 +270,7 @@ class ComponentBrand(Base):
     # Unique constraint
     __table_args__ = (
         db.UniqueConstraint('component_id', 'brand_id'),
+        db.Index('ix_component_brand_brand_id', 'brand_id', 'component_id'),
         {'schema': 'component_app'}
     )
 
@@ -295,20 +306,21 @@ class Component(Base):
     pps_comment = db.Column(db.Text)
     pps_date = db.Column(db.DateTime)
     
-    # FLEXIBLE properties as JSONB
-    properties = db.Column(db.JSON, default={})
+    # FLEXIBLE properties as JSONB (GIN-indexed for containment filters)
+    properties = db.Column(JSONB, default={})
     
     # Metadata
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
-    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, server_default=db.FetchedValue(), server_onupdate=db.FetchedValue())  # Stamped by database trigger
     
     # RELATIONSHIPS
+    # All load lazily; callers choose eager loading through app.utils.loading_profiles
     variants = db.relationship('ComponentVariant', backref='component', lazy=True, cascade='all, delete-orphan')
-    keywords = db.relationship('Keyword', secondary=keyword_component, lazy='subquery',
+    keywords = db.relationship('Keyword', secondary=keyword_component, lazy=True,
                               backref=db.backref('components', lazy=True))
 
     # Many-to-many relationship to categories
-    categories = db.relationship('Category', secondary=component_category, lazy='subquery',
+    categories = db.relationship('Category', secondary=component_category, lazy=True,
                                 backref=db.backref('components', lazy=True))
 
     # Use the ComponentBrand association object for the brand relationship
@@ -324,6 +336,20 @@ class Component(Base):
     __table_args__ = (
         # Updated unique constraint to handle null supplier_id
         db.UniqueConstraint('product_number', 'supplier_id', name='_product_supplier_uc'),
+        # Listing sorts and filters; the status indexes are partial on the listing's status predicates
+        db.Index('ix_component_created_at_id', db.text('created_at DESC'), db.text('id DESC')),
+        db.Index('ix_component_supplier_id_created_at', 'supplier_id', db.text('created_at DESC')),
+        db.Index('ix_component_component_type_id', 'component_type_id'),
+        db.Index('ix_component_approved_created_at', db.text('created_at DESC'),
+                 postgresql_where=db.text("proto_status = 'ok' AND sms_status = 'ok' AND pps_status = 'ok'")),
+        db.Index('ix_component_pending_created_at', db.text('created_at DESC'),
+                 postgresql_where=db.text("proto_status = 'pending' OR sms_status = 'pending' OR pps_status = 'pending'")),
+        db.Index('ix_component_rejected_created_at', db.text('created_at DESC'),
+                 postgresql_where=db.text("proto_status = 'not_ok' OR sms_status = 'not_ok' OR pps_status = 'not_ok'")),
+        db.Index('ix_component_properties', 'properties', postgresql_using='gin',
+                 postgresql_ops={'properties': 'jsonb_path_ops'}),
+        # Keyset scans of the change feed
+        db.Index('ix_component_updated_at_id', 'updated_at', 'id'),
         {'schema': 'component_app'}
     )
 
@@ -625,7 +651,7 @@ class ComponentVariant(Base):
     variant_sku = db.Column(db.String(255), unique=True, nullable=True)  # Generated by database trigger
     
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
-    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, server_default=db.FetchedValue(), server_onupdate=db.FetchedValue())  # Stamped by database trigger
     
     # Pictures that belong to this specific variant
     variant_pictures = db.relationship('Picture', 
@@ -636,6 +662,10 @@ class ComponentVariant(Base):
 
     __table_args__ = (
         db.UniqueConstraint('component_id', 'color_id', name='_component_color_uc'),
+        db.Index('ix_component_variant_active_component_id', 'component_id', 'id',
+                 postgresql_where=db.text('is_active')),
+        # Keyset scans of the change feed
+        db.Index('ix_component_variant_updated_at_id', 'updated_at', 'id'),
         {'schema': 'component_app'}
     )
 
@@ -732,11 +762,16 @@ class Picture(Base):
     file_size = db.Column(db.Integer)
     is_primary = db.Column(db.Boolean, default=False)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, server_default=db.FetchedValue(), server_onupdate=db.FetchedValue())  # Stamped by database trigger
     
     __table_args__ = (
         # component_id is always required now - consistency ensured by database trigger
         # Unique picture order per variant (multiple variants can have same order for different colors)
         db.UniqueConstraint('variant_id', 'picture_order', name='_variant_picture_order_uc'),
+        db.Index('ix_picture_component_id_order', 'component_id', 'picture_order'),
+        db.Index('ix_picture_variant_id_primary', 'variant_id', postgresql_where=db.text('is_primary')),
+        # Keyset scans of the change feed
+        db.Index('ix_picture_updated_at_id', 'updated_at', 'id'),
         {'schema': 'component_app'}
     )
 
@@ -811,6 +846,45 @@ class Picture(Base):
         else:
             return 'Unknown Picture Type'
 
+class ChangeTombstone(Base):
+    """Record of a deleted component, variant or picture for the incremental change feed"""
+    __tablename__ = 'change_tombstone'
+
+    id = db.Column(db.Integer, primary_key=True)
+    entity_type = db.Column(db.String(20), nullable=False)  # 'component', 'variant', 'picture'
+    entity_id = db.Column(db.Integer, nullable=False)
+    component_id = db.Column(db.Integer)  # Owning component, kept for downstream grouping
+    deleted_at = db.Column(db.DateTime, nullable=False, server_default=db.text("(clock_timestamp() AT TIME ZONE 'utc')"))  # Set by database trigger
+
+    __table_args__ = (
+        db.Index('ix_change_tombstone_deleted_at_id', 'deleted_at', 'id'),
+        {'schema': 'component_app'}
+    )
+
+    def __repr__(self):
+        return f'<ChangeTombstone {self.entity_type} {self.entity_id}>'
+
+class SlowQueryLog(Base):
+    """Statement that exceeded the slow-query threshold (written when SLOW_QUERY_PERSIST is on)"""
+    __tablename__ = 'slow_query_log'
+
+    id = db.Column(db.Integer, primary_key=True)
+    recorded_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    duration_ms = db.Column(db.Float, nullable=False)
+    shape = db.Column(db.Text, nullable=False)  # Statement with parameters and literals normalized
+    statement = db.Column(db.Text, nullable=False)
+    parameters = db.Column(JSONB)  # Redacted: only numbers, booleans and NULLs are kept
+    endpoint = db.Column(db.String(200))
+    plan = db.Column(JSONB)  # EXPLAIN plan for statements above SLOW_QUERY_EXPLAIN_MS
+
+    __table_args__ = (
+        db.Index('ix_slow_query_log_recorded_at', 'recorded_at'),
+        {'schema': 'component_app'}
+    )
+
+    def __repr__(self):
+        return f'<SlowQueryLog {self.duration_ms}ms {self.endpoint}>'
+
 # Helper functions for working with ComponentBrand relationships
 def add_brand_to_component(component_id, brand_id):
     """Add a brand to a component"""
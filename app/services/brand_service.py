@@ -0,0 +1,190 @@
+"""
+Brand Service
+Brand listing with subbrand and component counts computed in grouped queries
+"""
+from app import db
+from app.models import Brand, Subbrand, ComponentBrand
+from app.utils.cache import cached
+from app.utils.db_routing import read_only
+from sqlalchemy import func, exists
+
+
+class BrandService:
+    """Brand statistics for list pages and APIs"""
+
+    SORT_FIELDS = ('name', 'created_at', 'components_count', 'subbrands_count')
+
+    @staticmethod
+    def _count_subqueries():
+        """Per-brand subbrand and component counts as grouped subqueries"""
+        subbrand_counts = db.session.query(
+            Subbrand.brand_id.label('brand_id'),
+            func.count(Subbrand.id).label('subbrands_count')
+        ).group_by(Subbrand.brand_id).subquery()
+
+        component_counts = db.session.query(
+            ComponentBrand.brand_id.label('brand_id'),
+            func.count(ComponentBrand.component_id).label('components_count')
+        ).group_by(ComponentBrand.brand_id).subquery()
+
+        return subbrand_counts, component_counts
+
+    @staticmethod
+    def brand_stats_query(brand_ids=None, search=None, sort_by='name', sort_order='asc'):
+        """
+        Query yielding (Brand, subbrands_count, components_count) rows, sortable by any of them in SQL
+
+        Args:
+            brand_ids: Optional list of brand IDs to restrict to
+            search: Optional case-insensitive name filter
+            sort_by: One of SORT_FIELDS
+            sort_order: 'asc' or 'desc'
+        """
+        subbrand_counts, component_counts = BrandService._count_subqueries()
+        subbrands_count = func.coalesce(subbrand_counts.c.subbrands_count, 0).label('subbrands_count')
+        components_count = func.coalesce(component_counts.c.components_count, 0).label('components_count')
+
+        query = db.session.query(Brand, subbrands_count, components_count).outerjoin(
+            subbrand_counts, subbrand_counts.c.brand_id == Brand.id
+        ).outerjoin(
+            component_counts, component_counts.c.brand_id == Brand.id
+        )
+
+        if brand_ids is not None:
+            query = query.filter(Brand.id.in_(brand_ids))
+        if search:
+            query = query.filter(Brand.name.ilike(f'%{search}%'))
+
+        sort_columns = {
+            'name': Brand.name,
+            'created_at': Brand.created_at,
+            'components_count': components_count,
+            'subbrands_count': subbrands_count,
+        }
+        sort_column = sort_columns.get(sort_by, Brand.name)
+        sort_column = sort_column.desc() if sort_order == 'desc' else sort_column.asc()
+
+        # Brand.id keeps pagination stable when counts tie
+        return query.order_by(sort_column, Brand.id)
+
+    @staticmethod
+    @read_only
+    def get_brand_counts(brand_ids):
+        """
+        Subbrand and component counts for a set of brands
+
+        Returns:
+            dict: brand_id -> {'subbrands_count': int, 'components_count': int}
+        """
+        if not brand_ids:
+            return {}
+        return {
+            brand.id: {'subbrands_count': subbrands, 'components_count': components}
+            for brand, subbrands, components in BrandService.brand_stats_query(brand_ids=brand_ids)
+        }
+
+    @staticmethod
+    @cached(timeout=60, tags=('brands',))
+    @read_only
+    def get_brands_page(search=None, sort_by='name', sort_order='asc', page=1, per_page=20):
+        """
+        One page of brands with counts and subbrands, in three queries (count, page, subbrands).
+        Cached under the 'brands' tag, which writes to brands, subbrands and brand links invalidate.
+
+        Returns:
+            dict: brands (list of dicts), page, per_page, total, pages
+        """
+        pagination = BrandService.brand_stats_query(
+            search=search, sort_by=sort_by, sort_order=sort_order
+        ).paginate(page=page, per_page=per_page, error_out=False)
+
+        brand_ids = [brand.id for brand, _, _ in pagination.items]
+        subbrands_by_brand = {}
+        if brand_ids:
+            for subbrand in Subbrand.query.filter(Subbrand.brand_id.in_(brand_ids)).order_by(Subbrand.name).all():
+                subbrands_by_brand.setdefault(subbrand.brand_id, []).append(subbrand)
+
+        brands_data = []
+        for brand, subbrands_count, components_count in pagination.items:
+            brands_data.append({
+                'id': brand.id,
+                'name': brand.name,
+                'created_at': brand.created_at.isoformat() if brand.created_at else None,
+                'updated_at': brand.updated_at.isoformat() if brand.updated_at else None,
+                'subbrands_count': subbrands_count,
+                'components_count': components_count,
+                'subbrands': [
+                    {
+                        'id': sb.id,
+                        'name': sb.name,
+                        'full_name': f"{brand.name} - {sb.name}",
+                        'created_at': sb.created_at.isoformat() if sb.created_at else None
+                    } for sb in subbrands_by_brand.get(brand.id, [])
+                ]
+            })
+
+        return {
+            'brands': brands_data,
+            'page': pagination.page,
+            'per_page': pagination.per_page,
+            'total': pagination.total,
+            'pages': pagination.pages
+        }
+
+    @staticmethod
+    def bulk_delete(brand_ids):
+        """
+        Delete brands in one set-based statement, skipping brands that still have dependencies.
+        Dependencies are checked with one grouped query; nothing is loaded into the session.
+
+        Args:
+            brand_ids: List of brand IDs
+
+        Returns:
+            dict: deleted_count and results, a per-ID list of
+                  {'id', 'status': 'deleted' | 'blocked' | 'not_found', ...}
+        """
+        brand_ids = list(dict.fromkeys(brand_ids))
+        rows = {
+            brand.id: (brand.name, subbrands, components)
+            for brand, subbrands, components in BrandService.brand_stats_query(brand_ids=brand_ids)
+        }
+
+        results = []
+        deletable_ids = []
+        for brand_id in brand_ids:
+            if brand_id not in rows:
+                results.append({'id': brand_id, 'status': 'not_found'})
+                continue
+            name, subbrands_count, components_count = rows[brand_id]
+            if subbrands_count or components_count:
+                results.append({
+                    'id': brand_id,
+                    'name': name,
+                    'status': 'blocked',
+                    'subbrands_count': subbrands_count,
+                    'components_count': components_count,
+                    'error': f'Brand has {components_count} component(s) and {subbrands_count} subbrand(s)'
+                })
+                continue
+            deletable_ids.append(brand_id)
+            results.append({'id': brand_id, 'name': name, 'status': 'deleted'})
+
+        deleted_ids = set()
+        if deletable_ids:
+            # NOT EXISTS guards against dependencies added since the check
+            brand_table = Brand.__table__
+            deleted_ids = set(db.session.execute(
+                brand_table.delete().where(
+                    brand_table.c.id.in_(deletable_ids),
+                    ~exists().where(Subbrand.brand_id == brand_table.c.id),
+                    ~exists().where(ComponentBrand.brand_id == brand_table.c.id)
+                ).returning(brand_table.c.id)
+            ).scalars())
+            db.session.commit()
+
+        for result in results:
+            if result['status'] == 'deleted' and result['id'] not in deleted_ids:
+                result.update(status='blocked', error='Brand gained dependencies during deletion')
+
+        return {'deleted_count': len(deleted_ids), 'results': results}
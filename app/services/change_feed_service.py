@@ -0,0 +1,253 @@
+"""
+Change Feed Service
+Incremental "changes since" export of components, variants and pictures for downstream sync.
+Updates are found through updated_at, deletes through change_tombstone rows written by database triggers.
+Keyword, category and brand link writes bump component.updated_at through triggers on the link tables.
+Every timestamp is stamped by the database with clock_timestamp(), so they share one clock.
+"""
+from app import db
+from app.models import Component, ComponentVariant, Picture, ChangeTombstone
+from sqlalchemy import and_, or_, text
+from sqlalchemy.orm import selectinload
+from datetime import datetime
+import base64
+import heapq
+import itertools
+
+
+class ChangeFeedService:
+    """Keyset-paginated change feed over components, variants, pictures and tombstones"""
+
+    DEFAULT_LIMIT = 500
+    MAX_LIMIT = 5000
+
+    # Upper bound of a page: rows are stamped when written but only become visible at commit,
+    # so nothing at or after the start of the oldest open write transaction is handed out yet.
+    # The one-second margin covers a write stamped just before its transaction gets an xid.
+    # Must run on the primary as a role that sees the writers' sessions (the app role itself,
+    # or pg_read_all_stats).
+    VISIBLE_UNTIL_SQL = text("""
+        SELECT LEAST(statement_timestamp() - interval '1 second', min(xact_start)) AT TIME ZONE 'utc'
+        FROM pg_stat_activity
+        WHERE datname = current_database()
+          AND backend_xid IS NOT NULL
+          AND pid <> pg_backend_pid()
+    """)
+
+    # Tie-break order for records sharing the same timestamp
+    SOURCE_RANKS = {
+        'component': 0,
+        'variant': 1,
+        'picture': 2,
+        'delete': 3,
+    }
+
+    @staticmethod
+    def encode_cursor(position):
+        """Encode a (timestamp, rank, id) position as an opaque URL-safe cursor"""
+        timestamp, rank, entity_id = position
+        raw = f"{timestamp.isoformat()}|{rank}|{entity_id}"
+        return base64.urlsafe_b64encode(raw.encode('utf-8')).decode('ascii')
+
+    @staticmethod
+    def decode_cursor(cursor):
+        """
+        Decode a cursor produced by encode_cursor
+
+        Raises:
+            ValueError: If the cursor is malformed
+        """
+        try:
+            raw = base64.urlsafe_b64decode(cursor.encode('ascii')).decode('utf-8')
+            timestamp, rank, entity_id = raw.split('|')
+            return datetime.fromisoformat(timestamp), int(rank), int(entity_id)
+        except Exception:
+            raise ValueError('Invalid cursor')
+
+    @staticmethod
+    def position_from_since(since):
+        """
+        Build a starting position from an ISO timestamp; everything changed at or after it is returned
+
+        Raises:
+            ValueError: If the timestamp is malformed
+        """
+        try:
+            timestamp = datetime.fromisoformat(since.strip().replace('Z', '+00:00'))
+        except (AttributeError, ValueError):
+            raise ValueError(f'Invalid since timestamp: {since}')
+        if timestamp.tzinfo is not None:
+            # Stored timestamps are naive UTC
+            timestamp = (timestamp - timestamp.utcoffset()).replace(tzinfo=None)
+        return timestamp, -1, 0
+
+    @staticmethod
+    def get_changes(position, limit=DEFAULT_LIMIT):
+        """
+        Fetch the next page of changes after a position
+
+        Args:
+            position: (timestamp, rank, id) tuple from decode_cursor or position_from_since
+            limit: Maximum number of records to return
+
+        Returns:
+            dict: records (list of change dicts), next_position and has_more
+        """
+        limit = max(1, min(limit, ChangeFeedService.MAX_LIMIT))
+        until = ChangeFeedService.visible_until()
+
+        sources = [
+            ChangeFeedService._component_changes(position, until, limit + 1),
+            ChangeFeedService._variant_changes(position, until, limit + 1),
+            ChangeFeedService._picture_changes(position, until, limit + 1),
+            ChangeFeedService._tombstone_changes(position, until, limit + 1),
+        ]
+        page, has_more = ChangeFeedService._merge_sources(sources, limit)
+
+        next_position = page[-1][0] if page else position
+        return {
+            'records': [record for _, record in page],
+            'next_position': next_position,
+            'has_more': has_more,
+        }
+
+    @staticmethod
+    def visible_until():
+        """Timestamp (naive UTC) below which every stamped row is committed or never will be"""
+        return db.session.execute(ChangeFeedService.VISIBLE_UNTIL_SQL).scalar()
+
+    @staticmethod
+    def _merge_sources(sources, limit):
+        """Merge per-source (position, record) lists, each already ordered, into one page"""
+        merged = heapq.merge(*sources, key=lambda item: item[0])
+        page = list(itertools.islice(merged, limit + 1))
+        return page[:limit], len(page) > limit
+
+    @staticmethod
+    def _after_position(timestamp_column, id_column, source, position):
+        """Keyset filter for rows of one source that sort after the position"""
+        timestamp, rank, entity_id = position
+        source_rank = ChangeFeedService.SOURCE_RANKS[source]
+
+        if source_rank > rank:
+            return timestamp_column >= timestamp
+        if source_rank < rank:
+            return timestamp_column > timestamp
+        return or_(
+            timestamp_column > timestamp,
+            and_(timestamp_column == timestamp, id_column > entity_id)
+        )
+
+    @staticmethod
+    def _keyset_query(query, model_timestamp, model_id, source, position, until, limit):
+        return query.filter(
+            ChangeFeedService._after_position(model_timestamp, model_id, source, position),
+            model_timestamp < until
+        ).order_by(model_timestamp, model_id).limit(limit)
+
+    @staticmethod
+    def _component_changes(position, until, limit):
+        rank = ChangeFeedService.SOURCE_RANKS['component']
+        query = Component.query.options(
+            selectinload(Component.brand_associations),
+            selectinload(Component.categories),
+            selectinload(Component.keywords)
+        )
+        components = ChangeFeedService._keyset_query(
+            query, Component.updated_at, Component.id, 'component', position, until, limit
+        ).all()
+
+        return [
+            ((component.updated_at, rank, component.id), {
+                'type': 'component',
+                'op': 'upsert',
+                'id': component.id,
+                'changed_at': component.updated_at.isoformat(),
+                'data': {
+                    'product_number': component.product_number,
+                    'description': component.description,
+                    'component_type_id': component.component_type_id,
+                    'supplier_id': component.supplier_id,
+                    'proto_status': component.proto_status,
+                    'sms_status': component.sms_status,
+                    'pps_status': component.pps_status,
+                    'properties': component.properties or {},
+                    'brand_ids': sorted(assoc.brand_id for assoc in component.brand_associations),
+                    'category_ids': sorted(category.id for category in component.categories),
+                    'keywords': sorted(keyword.name for keyword in component.keywords),
+                    'created_at': component.created_at.isoformat() if component.created_at else None,
+                }
+            })
+            for component in components
+        ]
+
+    @staticmethod
+    def _variant_changes(position, until, limit):
+        rank = ChangeFeedService.SOURCE_RANKS['variant']
+        variants = ChangeFeedService._keyset_query(
+            ComponentVariant.query, ComponentVariant.updated_at, ComponentVariant.id,
+            'variant', position, until, limit
+        ).all()
+
+        return [
+            ((variant.updated_at, rank, variant.id), {
+                'type': 'variant',
+                'op': 'upsert',
+                'id': variant.id,
+                'changed_at': variant.updated_at.isoformat(),
+                'data': {
+                    'component_id': variant.component_id,
+                    'color_id': variant.color_id,
+                    'variant_name': variant.variant_name,
+                    'variant_sku': variant.variant_sku,
+                    'is_active': variant.is_active,
+                    'created_at': variant.created_at.isoformat() if variant.created_at else None,
+                }
+            })
+            for variant in variants
+        ]
+
+    @staticmethod
+    def _picture_changes(position, until, limit):
+        rank = ChangeFeedService.SOURCE_RANKS['picture']
+        pictures = ChangeFeedService._keyset_query(
+            Picture.query, Picture.updated_at, Picture.id, 'picture', position, until, limit
+        ).all()
+
+        return [
+            ((picture.updated_at, rank, picture.id), {
+                'type': 'picture',
+                'op': 'upsert',
+                'id': picture.id,
+                'changed_at': picture.updated_at.isoformat(),
+                'data': {
+                    'component_id': picture.component_id,
+                    'variant_id': picture.variant_id,
+                    'picture_name': picture.picture_name,
+                    'url': picture.url,
+                    'picture_order': picture.picture_order,
+                    'alt_text': picture.alt_text,
+                    'is_primary': picture.is_primary,
+                }
+            })
+            for picture in pictures
+        ]
+
+    @staticmethod
+    def _tombstone_changes(position, until, limit):
+        rank = ChangeFeedService.SOURCE_RANKS['delete']
+        tombstones = ChangeFeedService._keyset_query(
+            db.session.query(ChangeTombstone), ChangeTombstone.deleted_at, ChangeTombstone.id,
+            'delete', position, until, limit
+        ).all()
+
+        return [
+            ((tombstone.deleted_at, rank, tombstone.id), {
+                'type': tombstone.entity_type,
+                'op': 'delete',
+                'id': tombstone.entity_id,
+                'changed_at': tombstone.deleted_at.isoformat(),
+                'data': {'component_id': tombstone.component_id}
+            })
+            for tombstone in tombstones
+        ]
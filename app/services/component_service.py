@@ -18,11 +18,13 @@ from app.utils.file_handling import allowed_file
 from app.services.webdav_config_service import WebDAVConfigService
 from app.services.interfaces import IFileStorageService
 from app.services.property_service import PropertyService
-from sqlalchemy.orm import joinedload, selectinload
+from app.utils.loading_profiles import component_profile
+from app.utils.cache import cached, entity_tag
 from sqlalchemy import and_
 import time
 import os
 import io
+from datetime import datetime
 
 
 class ComponentService:
@@ -280,8 +282,8 @@ class ComponentService:
             current_app.logger.info(f"ComponentService.update_component called for component {component_id}")
             current_app.logger.info(f"Data keys: {list(data.keys())}")
             
-            # Get component to update
-            component = Component.query.get(component_id)
+            # Get component to update; associations are compared and replaced below
+            component = Component.query.options(*component_profile('edit')).get(component_id)
             if not component:
                 raise ValueError(f'Component {component_id} not found')
             
@@ -303,6 +305,8 @@ class ComponentService:
             try:
                 self._handle_component_associations(component, data, is_edit=True)
                 changes['associations'] = 'updated'
+                # Association-only edits don't touch component columns; bump updated_at so the change feed sees them
+                component.updated_at = datetime.utcnow()
                 current_app.logger.info("Associations updated successfully")
             except Exception as e:
                 current_app.logger.error(f"Error updating associations: {str(e)}")
@@ -367,6 +371,12 @@ class ComponentService:
             current_app.logger.error(f"Full error traceback: ", exc_info=True)
             raise
     
+    @cached(
+        timeout=300,
+        tags=lambda self, component_id: ('properties', entity_tag('component', component_id)),
+        result_tags=lambda data: ComponentService._component_data_tags(data),
+        skip_self=True
+    )
     def get_component_for_edit(self, component_id):
         """
         Get component with all relationships for editing
@@ -379,16 +389,7 @@ class ComponentService:
         """
         try:
             # Load component with optimized relationships
-            component = Component.query.options(
-                joinedload(Component.component_type),
-                joinedload(Component.supplier),
-                selectinload(Component.variants).joinedload(ComponentVariant.color),
-                selectinload(Component.variants).selectinload(ComponentVariant.variant_pictures),
-                selectinload(Component.pictures),
-                selectinload(Component.keywords),
-                selectinload(Component.brand_associations).joinedload(ComponentBrand.brand),
-                selectinload(Component.categories)
-            ).get(component_id)
+            component = Component.query.options(*component_profile('edit')).get(component_id)
             
             if not component:
                 raise ValueError(f'Component {component_id} not found')
@@ -670,6 +671,20 @@ class ComponentService:
             'variants': self._build_variants_data(component.variants)
         }
     
+    @staticmethod
+    def _component_data_tags(data):
+        """Tags of the related rows a component payload shows by name"""
+        tags = {entity_tag('brand', brand['id']) for brand in data['brands']}
+        tags |= {entity_tag('category', category['id']) for category in data['categories']}
+        tags |= {entity_tag('keyword', keyword['id']) for keyword in data['keywords']}
+        tags |= {entity_tag('color', variant['color']['id']) for variant in data['variants']}
+        if data['supplier']:
+            tags.add(entity_tag('supplier', data['supplier']['id']))
+        if data['component_type']:
+            # Includes the sources of the option lists in property_config
+            tags.update(PropertyService.property_schema_tags(data['component_type']['id']))
+        return tags
+    
     def _build_variants_data(self, variants):
         """Build variant data for API responses"""
         variants_data = []
@@ -1070,13 +1085,7 @@ class ComponentService:
             current_app.logger.info(f"ComponentService.delete_component called for component {component_id}")
             
             # Get component with all associations loaded
-            component = Component.query.options(
-                selectinload(Component.variants).selectinload(ComponentVariant.variant_pictures),
-                selectinload(Component.pictures),
-                selectinload(Component.brand_associations),
-                selectinload(Component.keywords),
-                selectinload(Component.categories)
-            ).filter_by(id=component_id).first()
+            component = Component.query.options(*component_profile('edit')).filter_by(id=component_id).first()
             
             if not component:
                 raise ValueError(f'Component {component_id} not found')
@@ -1201,7 +1210,7 @@ class ComponentService:
             from datetime import datetime
             
             # Find the original component
-            original = Component.query.get(component_id)
+            original = Component.query.options(*component_profile('edit')).get(component_id)
             if not original:
                 raise ValueError(f'Component {component_id} not found')
             
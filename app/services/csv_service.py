@@ -1,23 +1,52 @@
 """CSV processing service."""
 
 import csv
+import json
 import os
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Iterable
+import pandas as pd
 from flask import current_app
 from app import db
 from app.models import (
     Supplier, Category, Color, Material, Component, Picture, 
-    ComponentType, Keyword
+    ComponentType, Keyword, keyword_component, component_category
 )
 from app.utils.database import get_or_create, DatabaseTransaction
 
 
+# Columns compared between the import file and the current catalogue in dry-run mode
+DRY_RUN_KEY_COLUMNS = ['supplier_code', 'product_number']
+DRY_RUN_COMPARED_FIELDS = [
+    'description', 'component_type', 'category_name', 'keywords', 'properties', 'pictures'
+]
+
+# Properties the import reads from the CSV for each component type
+CSV_TYPE_PROPERTIES = {
+    'Fabrics': ['material', 'color', 'gender', 'brand', 'finish', 'weight'],
+    'Shapes': ['gender', 'style', 'brand', 'subbrand', 'subcategory'],
+    'Buttons': ['material', 'color', 'brand', 'size'],
+    'Zippers': ['material', 'color', 'brand', 'size'],
+    'Labels': ['brand', 'subbrand', 'material'],
+    'Hangtags': ['brand', 'subbrand', 'material'],
+    'Packaging': ['brand', 'material']
+}
+CSV_ARRAY_PROPERTIES = ['gender', 'style', 'subbrand']
+CSV_MAX_PICTURES = 5
+
+
 class CSVProcessingService:
     """Service for processing CSV files for component import/export."""
     
     @staticmethod
-    def process_csv_file(file_path: str) -> Dict[str, Any]:
-        """Process the uploaded CSV file for the flexible schema."""
+    def process_csv_file(file_path: str, dry_run: bool = False) -> Dict[str, Any]:
+        """Process the uploaded CSV file for the flexible schema.
+
+        With dry_run=True nothing is written; the diff computed by
+        preview_csv_import is returned instead.
+        """
+        if dry_run:
+            return CSVProcessingService.preview_csv_import(file_path)
+
         results = {
             'created': 0,
             'updated': 0,
@@ -58,6 +87,291 @@ class CSVProcessingService:
             results['errors'].append(f"Error processing CSV file: {str(e)}")
             return results
 
+    @staticmethod
+    def preview_csv_import(file_path: str, sample_size: int = 10) -> Dict[str, Any]:
+        """
+        Compute what an import would create, update or delete without writing anything.
+
+        The file and the current catalogue snapshot of the suppliers it mentions are
+        loaded into DataFrames and compared with a single merge on
+        (supplier_code, product_number).
+        """
+        try:
+            file_df = pd.read_csv(
+                file_path, sep=';', dtype=str, keep_default_na=False, encoding='utf-8'
+            )
+        except Exception as e:
+            current_app.logger.error(f"Error reading CSV file for dry run: {str(e)}")
+            return CSVProcessingService._empty_preview([f"Error reading CSV file: {str(e)}"])
+
+        required_columns = [
+            'product_number', 'description', 'supplier_code',
+            'component_type', 'category_name'
+        ]
+        missing_columns = [col for col in required_columns if col not in file_df.columns]
+        if missing_columns:
+            return CSVProcessingService._empty_preview(
+                [f"Missing required columns: {', '.join(missing_columns)}"]
+            )
+
+        file_df = CSVProcessingService._normalize_import_frame(file_df)
+        supplier_codes = file_df['supplier_code'].unique().tolist()
+        snapshot_df = CSVProcessingService._load_component_snapshot(supplier_codes)
+
+        return CSVProcessingService._diff_import_frames(file_df, snapshot_df, sample_size)
+
+    @staticmethod
+    def _empty_preview(errors: List[str]) -> Dict[str, Any]:
+        """Preview result used when the file cannot be compared."""
+        return {
+            'dry_run': True,
+            'summary': {'rows': 0, 'create': 0, 'update': 0, 'unchanged': 0,
+                        'delete': 0, 'duplicates': 0},
+            'field_changes': {field: 0 for field in DRY_RUN_COMPARED_FIELDS},
+            'samples': {'create': [], 'update': [], 'delete': [], 'duplicates': []},
+            'errors': errors
+        }
+
+    @staticmethod
+    def _normalize_import_frame(file_df: 'pd.DataFrame') -> 'pd.DataFrame':
+        """Bring file values into the same shape the import writes to the database."""
+        # Keys, type and category are looked up exactly as written, like the import does
+        frame = pd.DataFrame({
+            'supplier_code': file_df['supplier_code'],
+            'product_number': file_df['product_number'],
+            'description': file_df['description'],
+            'component_type': file_df['component_type'],
+            'category_name': file_df['category_name'],
+        })
+
+        # The import lowercases keywords and replaces the whole set; only rows with
+        # a non-empty keywords cell touch existing keywords
+        if 'keywords' in file_df.columns:
+            keywords = (
+                file_df['keywords'].str.lower().str.split(',')
+                .apply(lambda names: ','.join(sorted({n.strip() for n in names if n.strip()})))
+            )
+        else:
+            keywords = pd.Series('', index=file_df.index)
+        frame['keywords'] = keywords
+
+        # Properties and pictures are replaced on every import, from whatever the row holds
+        rows = file_df.to_dict(orient='records')
+        frame['properties'] = [
+            CSVProcessingService._properties_key(CSVProcessingService._row_properties(row))
+            for row in rows
+        ]
+        frame['pictures'] = [
+            CSVProcessingService._pictures_key(CSVProcessingService._row_pictures(row))
+            for row in rows
+        ]
+        frame['row_number'] = file_df.index + 2  # Header is row 1
+
+        return frame
+
+    @staticmethod
+    def _row_properties(row: Dict[str, str]) -> Dict[str, Any]:
+        """Property values the import would store for a row, by property key."""
+        values = {}
+        for prop in CSV_TYPE_PROPERTIES.get(row['component_type'], []):
+            value = (row.get(prop) or '').strip()
+            if not value:
+                continue
+            if prop in CSV_ARRAY_PROPERTIES:
+                items = [v.strip() for v in value.split(',') if v.strip()]
+                if items:
+                    values[prop] = items
+            else:
+                values[prop] = value
+        return values
+
+    @staticmethod
+    def _row_pictures(row: Dict[str, str]) -> List[List[str]]:
+        """(name, url) pairs the import would create for a row, in picture order."""
+        pictures = []
+        for i in range(1, CSV_MAX_PICTURES + 1):
+            name = row.get(f'picture_{i}_name')
+            url = row.get(f'picture_{i}_url')
+            if name and url:
+                pictures.append([name, url])
+        return pictures
+
+    @staticmethod
+    def _properties_key(values: Dict[str, Any]) -> str:
+        """Comparable form of a property dict; empty when there are none."""
+        return json.dumps(values, sort_keys=True) if values else ''
+
+    @staticmethod
+    def _pictures_key(pictures: List[List[str]]) -> str:
+        """Comparable form of an ordered picture list; empty when there are none."""
+        return json.dumps(pictures) if pictures else ''
+
+    @staticmethod
+    def _load_component_snapshot(supplier_codes: List[str]) -> 'pd.DataFrame':
+        """Load the current components of the given suppliers as a flat DataFrame."""
+        columns = ['component_id'] + DRY_RUN_KEY_COLUMNS + DRY_RUN_COMPARED_FIELDS
+        if not supplier_codes:
+            return pd.DataFrame(columns=columns)
+
+        rows = db.session.query(
+            Component.id,
+            Supplier.supplier_code,
+            Component.product_number,
+            Component.description,
+            ComponentType.name,
+            Component.properties
+        ).join(
+            Supplier, Component.supplier_id == Supplier.id
+        ).outerjoin(
+            ComponentType, Component.component_type_id == ComponentType.id
+        ).filter(
+            Supplier.supplier_code.in_(supplier_codes)
+        ).all()
+
+        snapshot = pd.DataFrame.from_records(
+            rows, columns=['component_id', 'supplier_code', 'product_number',
+                           'description', 'component_type', 'properties']
+        )
+        if snapshot.empty:
+            return pd.DataFrame(columns=columns)
+        snapshot['properties'] = snapshot['properties'].apply(
+            lambda properties: CSVProcessingService._properties_key({
+                key: prop['value'] if isinstance(prop, dict) and 'value' in prop else prop
+                for key, prop in (properties or {}).items()
+            })
+        )
+
+        component_ids = snapshot['component_id'].tolist()
+        category_rows = db.session.query(
+            component_category.c.component_id, Category.name
+        ).join(
+            Category, component_category.c.category_id == Category.id
+        ).filter(component_category.c.component_id.in_(component_ids)).all()
+        keyword_rows = db.session.query(
+            keyword_component.c.component_id, Keyword.name
+        ).join(
+            Keyword, keyword_component.c.keyword_id == Keyword.id
+        ).filter(keyword_component.c.component_id.in_(component_ids)).all()
+        picture_rows = db.session.query(
+            Picture.component_id, Picture.picture_name, Picture.url
+        ).filter(
+            Picture.component_id.in_(component_ids)
+        ).order_by(Picture.component_id, Picture.picture_order, Picture.id).all()
+
+        pictures = {}
+        for component_id, name, url in picture_rows:
+            pictures.setdefault(component_id, []).append([name, url])
+        snapshot['pictures'] = snapshot['component_id'].map(
+            lambda component_id: CSVProcessingService._pictures_key(pictures.get(component_id, []))
+        )
+
+        snapshot = snapshot.merge(
+            CSVProcessingService._join_names(category_rows, 'category_name'),
+            on='component_id', how='left'
+        ).merge(
+            CSVProcessingService._join_names(keyword_rows, 'keywords'),
+            on='component_id', how='left'
+        )
+        snapshot['description'] = snapshot['description'].fillna('')
+        snapshot['component_type'] = snapshot['component_type'].fillna('')
+        snapshot['category_name'] = snapshot['category_name'].fillna('')
+        snapshot['keywords'] = snapshot['keywords'].fillna('')
+
+        return snapshot[columns]
+
+    @staticmethod
+    def _join_names(rows, column: str) -> 'pd.DataFrame':
+        """Collapse (component_id, name) pairs into one sorted, comma-joined value per component."""
+        pairs = pd.DataFrame.from_records(rows, columns=['component_id', column])
+        if pairs.empty:
+            return pd.DataFrame(columns=['component_id', column])
+        return (
+            pairs.sort_values(['component_id', column])
+            .groupby('component_id', as_index=False)[column]
+            .agg(','.join)
+        )
+
+    @staticmethod
+    def _diff_import_frames(file_df: 'pd.DataFrame', snapshot_df: 'pd.DataFrame',
+                            sample_size: int = 10) -> Dict[str, Any]:
+        """
+        Diff a normalized import frame against a catalogue snapshot.
+
+        Both frames carry DRY_RUN_KEY_COLUMNS and DRY_RUN_COMPARED_FIELDS. Deletions
+        are components of the suppliers in the file that the file no longer lists;
+        the import itself never deletes them.
+        """
+        duplicate_mask = file_df.duplicated(subset=DRY_RUN_KEY_COLUMNS, keep='last')
+        duplicates = file_df[duplicate_mask]
+        # Later rows win, matching the row-by-row import
+        file_df = file_df[~duplicate_mask]
+
+        merged = file_df.merge(
+            snapshot_df, on=DRY_RUN_KEY_COLUMNS, how='outer',
+            suffixes=('_file', '_db'), indicator=True
+        )
+        # Outer merges turn integer columns with gaps into floats
+        merged['row_number'] = merged['row_number'].astype('Int64')
+        merged['component_id'] = merged['component_id'].astype('Int64')
+        creates = merged[merged['_merge'] == 'left_only']
+        deletes = merged[merged['_merge'] == 'right_only']
+        matched = merged[merged['_merge'] == 'both']
+
+        changed = pd.DataFrame(index=matched.index)
+        for field in DRY_RUN_COMPARED_FIELDS:
+            file_values = matched[f'{field}_file'].fillna('')
+            db_values = matched[f'{field}_db'].fillna('')
+            field_changed = file_values != db_values
+            if field == 'keywords':
+                # Blank keyword cells leave existing keywords untouched
+                field_changed &= file_values != ''
+            changed[field] = field_changed
+
+        update_mask = changed.any(axis=1) if not changed.empty else pd.Series(dtype=bool)
+        updates = matched[update_mask] if not matched.empty else matched
+
+        def key_records(frame, extra_columns=()):
+            columns = DRY_RUN_KEY_COLUMNS + [c for c in extra_columns if c in frame.columns]
+            return frame[columns].head(sample_size).to_dict(orient='records')
+
+        update_samples = []
+        for index, row in updates.head(sample_size).iterrows():
+            update_samples.append({
+                'supplier_code': row['supplier_code'],
+                'product_number': row['product_number'],
+                'component_id': int(row['component_id']),
+                'row_number': int(row['row_number']),
+                'changes': {
+                    field: {'old': row[f'{field}_db'], 'new': row[f'{field}_file']}
+                    for field in DRY_RUN_COMPARED_FIELDS if changed.at[index, field]
+                }
+            })
+
+        return {
+            'dry_run': True,
+            'summary': {
+                'rows': int(len(file_df) + len(duplicates)),
+                'create': int(len(creates)),
+                'update': int(len(updates)),
+                'unchanged': int(len(matched) - len(updates)),
+                'delete': int(len(deletes)),
+                'duplicates': int(len(duplicates))
+            },
+            'field_changes': {
+                field: int(changed[field].sum()) if field in changed else 0
+                for field in DRY_RUN_COMPARED_FIELDS
+            },
+            'samples': {
+                'create': key_records(creates.rename(columns={
+                    f'{field}_file': field for field in DRY_RUN_COMPARED_FIELDS
+                }), ['row_number'] + DRY_RUN_COMPARED_FIELDS),
+                'update': update_samples,
+                'delete': key_records(deletes, ['component_id']),
+                'duplicates': key_records(duplicates, ['row_number'])
+            },
+            'errors': []
+        }
+
     @staticmethod
     def _process_component_row(row: Dict[str, str], results: Dict[str, Any]) -> None:
         """Process a single row from the CSV."""
@@ -134,22 +448,11 @@ class CSVProcessingService:
                                    component_type_name: str) -> None:
         """Process flexible properties based on component type."""
         
-        # Define which properties each component type can have from CSV
-        type_properties = {
-            'Fabrics': ['material', 'color', 'gender', 'brand', 'finish', 'weight'],
-            'Shapes': ['gender', 'style', 'brand', 'subbrand', 'subcategory'],
-            'Buttons': ['material', 'color', 'brand', 'size'],
-            'Zippers': ['material', 'color', 'brand', 'size'],
-            'Labels': ['brand', 'subbrand', 'material'],
-            'Hangtags': ['brand', 'subbrand', 'material'],
-            'Packaging': ['brand', 'material']
-        }
-        
         # Clear existing properties
         component.properties = {}
         
         # Get allowed properties for this component type
-        allowed_properties = type_properties.get(component_type_name, [])
+        allowed_properties = CSV_TYPE_PROPERTIES.get(component_type_name, [])
         
         # Process each allowed property if it exists in the CSV row
         for prop in allowed_properties:
@@ -157,7 +460,7 @@ class CSVProcessingService:
                 value = row[prop].strip()
                 if value:
                     # Handle array properties (multiple values separated by comma)
-                    if prop in ['gender', 'style', 'subbrand']:
+                    if prop in CSV_ARRAY_PROPERTIES:
                         # Split by comma and clean up
                         values = [v.strip() for v in value.split(',') if v.strip()]
                         if values:
@@ -174,7 +477,7 @@ class CSVProcessingService:
 
         # Process up to 5 pictures with auto-assigned order
         picture_order = 1
-        for i in range(1, 6):
+        for i in range(1, CSV_MAX_PICTURES + 1):
             pic_name_key = f'picture_{i}_name'
             pic_url_key = f'picture_{i}_url'
 
@@ -192,11 +495,13 @@ class CSVProcessingService:
                 picture_order += 1  # Increment for next picture
 
     @staticmethod
-    def export_components_to_csv(file_path: str, components: List[Component] = None) -> bool:
+    def export_components_to_csv(file_path: str, components: Iterable[Component] = None) -> bool:
         """Export components to CSV file."""
         try:
             if components is None:
-                components = Component.query.all()
+                # Stream in windows with associations eager-loaded instead of lazy-loading per component
+                from app.services.export_service import CatalogueExportService
+                components = CatalogueExportService.iter_components()
 
             # Define CSV headers
             headers = [
@@ -218,9 +523,9 @@ class CSVProcessingService:
                     row = {
                         'product_number': component.product_number,
                         'description': component.description or '',
-                        'supplier_code': component.supplier.supplier_code,
+                        'supplier_code': component.supplier.supplier_code if component.supplier else '',
                         'component_type': component.component_type.name,
-                        'category_name': component.category.name,
+                        'category_name': ','.join([c.name for c in component.categories]),
                         'keywords': ','.join([k.name for k in component.keywords])
                     }
 
@@ -0,0 +1,75 @@
+"""
+Dashboard Service
+Filter options and catalogue totals for the component index, cached as plain data
+"""
+from app import db
+from app.models import Component, ComponentType, Supplier, Brand, Category
+from app.utils.cache import cached
+from app.utils.db_routing import read_only
+from sqlalchemy import func, case
+
+
+class DashboardService:
+    """Data shared by every index page, independent of the current filters"""
+
+    @staticmethod
+    @cached(timeout=600, tags=('types', 'suppliers', 'brands', 'categories'))
+    @read_only
+    def filter_options():
+        """
+        Options for the index filter panel
+
+        Returns:
+            dict: component_types, suppliers, brands and categories as lists of
+                  {'id', 'name'} dicts (suppliers carry 'supplier_code'), sorted for display
+        """
+        return {
+            'component_types': [
+                {'id': type_id, 'name': name}
+                for type_id, name in db.session.query(ComponentType.id, ComponentType.name)
+                .order_by(ComponentType.name)
+            ],
+            'suppliers': [
+                {'id': supplier_id, 'supplier_code': code}
+                for supplier_id, code in db.session.query(Supplier.id, Supplier.supplier_code)
+                .order_by(Supplier.supplier_code)
+            ],
+            'brands': [
+                {'id': brand_id, 'name': name}
+                for brand_id, name in db.session.query(Brand.id, Brand.name).order_by(Brand.name)
+            ],
+            'categories': [
+                {'id': category_id, 'name': name}
+                for category_id, name in db.session.query(Category.id, Category.name).order_by(Category.name)
+            ],
+        }
+
+    @staticmethod
+    @cached(timeout=300, tags=('components', 'suppliers', 'brands'))
+    @read_only
+    def stats():
+        """
+        Catalogue-wide totals for the dashboard header, in one aggregate query plus two counts
+
+        Returns:
+            dict: total_components, approved_components, pending_components,
+                  rejected_components, total_suppliers, total_brands
+        """
+        approved = (Component.proto_status == 'ok') & (Component.sms_status == 'ok') & (Component.pps_status == 'ok')
+        rejected = (Component.proto_status == 'not_ok') | (Component.sms_status == 'not_ok') | (Component.pps_status == 'not_ok')
+
+        totals = db.session.query(
+            func.count(Component.id),
+            func.coalesce(func.sum(case((approved, 1), else_=0)), 0),
+            func.coalesce(func.sum(case((rejected, 1), else_=0)), 0)
+        ).one()
+        total_components, approved_count, rejected_count = totals
+
+        return {
+            'total_components': total_components,
+            'approved_components': int(approved_count),
+            'rejected_components': int(rejected_count),
+            'pending_components': total_components - int(approved_count) - int(rejected_count),
+            'total_suppliers': db.session.query(func.count(Supplier.id)).scalar(),
+            'total_brands': db.session.query(func.count(Brand.id)).scalar(),
+        }
@@ -0,0 +1,112 @@
+"""
+Catalogue Export Service
+Streams components with their full graph (variants, SKUs, pictures, brands, categories,
+keywords and properties) without loading the whole catalogue into memory
+"""
+from app.models import Component
+from app.utils.loading_profiles import component_profile
+import json
+
+
+class CatalogueExportService:
+    """Batched loading and serialization of full component graphs for exports"""
+
+    DEFAULT_WINDOW_SIZE = 200
+
+    @staticmethod
+    def graph_options():
+        """
+        Loader options for a component's full graph (the "export" profile).
+        Every collection is selectin-loaded, so each window costs a fixed number of queries.
+        """
+        return component_profile('export')
+
+    @staticmethod
+    def iter_components(query=None, window_size=DEFAULT_WINDOW_SIZE):
+        """
+        Yield components ordered by ID, loaded in windows of window_size.
+
+        yield_per fetches rows in windows and the selectinload options run once per window,
+        so memory stays bounded and query count grows linearly with the export size.
+
+        Args:
+            query: Optional filtered Component query; defaults to all components
+            window_size: Number of components per window
+        """
+        if query is None:
+            query = Component.query
+
+        yield from (
+            query.options(*CatalogueExportService.graph_options())
+            .order_by(Component.id)
+            .yield_per(window_size)
+        )
+
+    @staticmethod
+    def serialize_component(component):
+        """Build the nested export record for a component loaded with graph_options()"""
+        pictures_by_variant = {}
+        for picture in sorted(component.pictures, key=lambda p: (p.picture_order, p.id)):
+            pictures_by_variant.setdefault(picture.variant_id, []).append(
+                CatalogueExportService._serialize_picture(picture)
+            )
+
+        return {
+            'id': component.id,
+            'product_number': component.product_number,
+            'description': component.description,
+            'component_type': {
+                'id': component.component_type.id,
+                'name': component.component_type.name
+            } if component.component_type else None,
+            'supplier': {
+                'id': component.supplier.id,
+                'supplier_code': component.supplier.supplier_code
+            } if component.supplier else None,
+            'status': {
+                'proto': component.proto_status,
+                'sms': component.sms_status,
+                'pps': component.pps_status
+            },
+            'properties': component.properties or {},
+            'brands': [
+                {'id': assoc.brand.id, 'name': assoc.brand.name}
+                for assoc in sorted(component.brand_associations, key=lambda a: a.brand_id)
+            ],
+            'categories': [
+                {'id': category.id, 'name': category.name}
+                for category in sorted(component.categories, key=lambda c: c.id)
+            ],
+            'keywords': sorted(keyword.name for keyword in component.keywords),
+            'pictures': pictures_by_variant.get(None, []),
+            'variants': [
+                {
+                    'id': variant.id,
+                    'sku': variant.variant_sku,
+                    'variant_name': variant.variant_name,
+                    'color': {'id': variant.color.id, 'name': variant.color.name} if variant.color else None,
+                    'is_active': variant.is_active,
+                    'pictures': pictures_by_variant.get(variant.id, [])
+                }
+                for variant in sorted(component.variants, key=lambda v: v.id)
+            ],
+            'created_at': component.created_at.isoformat() if component.created_at else None,
+            'updated_at': component.updated_at.isoformat() if component.updated_at else None
+        }
+
+    @staticmethod
+    def _serialize_picture(picture):
+        return {
+            'id': picture.id,
+            'picture_name': picture.picture_name,
+            'url': picture.url,
+            'picture_order': picture.picture_order,
+            'alt_text': picture.alt_text,
+            'is_primary': picture.is_primary
+        }
+
+    @staticmethod
+    def iter_jsonl(query=None, window_size=DEFAULT_WINDOW_SIZE):
+        """Yield one JSON line per component"""
+        for component in CatalogueExportService.iter_components(query, window_size):
+            yield json.dumps(CatalogueExportService.serialize_component(component)) + '\n'
@@ -1,11 +1,46 @@
 from app import db
-from app.models import Property, ComponentTypeProperty, Material, Color, Category, Brand, Supplier
+from app.models import Property, ComponentTypeProperty, Material, Color, Category, Brand, Supplier, Component
+from app.utils.cache import cached, entity_tag
 from flask import current_app
+from sqlalchemy import or_
 from sqlalchemy.orm import selectinload
 from sqlalchemy.exc import IntegrityError
 
 class PropertyService:
     
+    FILTER_PREFIX = 'prop.'
+    
+    @staticmethod
+    def parse_property_filters(args):
+        # ?prop.material=polyester&prop.gender=ladies&prop.gender=men -> {'material': [...], 'gender': [...]}
+        filters = {}
+        for key in args:
+            if not key.startswith(PropertyService.FILTER_PREFIX):
+                continue
+            name = key[len(PropertyService.FILTER_PREFIX):].strip()
+            values = [value.strip() for value in args.getlist(key) if value.strip()]
+            if name and values:
+                filters[name] = values
+        return filters
+    
+    @staticmethod
+    def component_property_filter(name, values):
+        # Values are stored either bare or as {'value': ...}, as a string or a list of strings;
+        # every shape is matched with @> so the GIN index on component.properties is used
+        clauses = []
+        for value in values:
+            for stored in (value, [value]):
+                clauses.append(Component.properties.contains({name: stored}))
+                clauses.append(Component.properties.contains({name: {'value': stored}}))
+        return or_(*clauses)
+    
+    @staticmethod
+    def component_property_filters(args):
+        return [
+            PropertyService.component_property_filter(name, values)
+            for name, values in PropertyService.parse_property_filters(args).items()
+        ]
+    
     @staticmethod
     def get_all_properties():
         return Property.query.filter(Property.is_active == True).order_by(Property.property_key).all()
@@ -21,6 +56,15 @@ class PropertyService:
         ).order_by(ComponentTypeProperty.display_order).all()
     
     @staticmethod
+    def property_schema_tags(component_type_id):
+        # The type's property rows plus every table dynamic select options are read from
+        return (
+            'properties', 'materials', 'colors', 'categories', 'brands', 'suppliers',
+            entity_tag('type', component_type_id)
+        )
+    
+    @staticmethod
+    @cached(timeout=600, tags=lambda component_type_id: PropertyService.property_schema_tags(component_type_id))
     def get_property_form_config(component_type_id):
         type_properties = PropertyService.get_properties_for_component_type(component_type_id)
         config = {}
@@ -0,0 +1,189 @@
+"""
+Supplier Service
+Supplier overview aggregates and on-demand component listing
+"""
+from app import db
+from app.models import Supplier, Component, ComponentType
+from app.utils.db_routing import read_only
+from app.utils.loading_profiles import component_profile
+from sqlalchemy import func, case, and_, or_, distinct, exists
+from sqlalchemy.orm import joinedload
+
+
+class SupplierService:
+    """Supplier statistics computed in grouped queries instead of per-supplier component loads"""
+
+    SORT_OPTIONS = ('code', 'name', 'components', 'created')
+
+    @staticmethod
+    def _component_aggregates():
+        """Per-supplier component count, status breakdown, type names and last activity"""
+        approved = and_(
+            Component.proto_status == 'ok',
+            Component.sms_status == 'ok',
+            Component.pps_status == 'ok'
+        )
+        rejected = or_(
+            Component.proto_status == 'not_ok',
+            Component.sms_status == 'not_ok',
+            Component.pps_status == 'not_ok'
+        )
+
+        return db.session.query(
+            Component.supplier_id.label('supplier_id'),
+            func.count(Component.id).label('component_count'),
+            func.count(case((approved, 1))).label('approved_count'),
+            func.count(case((rejected, 1))).label('rejected_count'),
+            func.max(func.coalesce(Component.updated_at, Component.created_at)).label('last_component_activity'),
+            func.array_agg(distinct(ComponentType.name)).label('component_types')
+        ).outerjoin(
+            ComponentType, ComponentType.id == Component.component_type_id
+        ).filter(
+            Component.supplier_id.isnot(None)
+        ).group_by(Component.supplier_id).subquery()
+
+    @staticmethod
+    def overview_query(sort_by='code'):
+        """Query yielding (Supplier, aggregates...) rows for every supplier, sorted in SQL"""
+        stats = SupplierService._component_aggregates()
+        component_count = func.coalesce(stats.c.component_count, 0)
+
+        query = db.session.query(
+            Supplier,
+            component_count.label('component_count'),
+            func.coalesce(stats.c.approved_count, 0).label('approved_count'),
+            func.coalesce(stats.c.rejected_count, 0).label('rejected_count'),
+            stats.c.last_component_activity,
+            stats.c.component_types
+        ).outerjoin(stats, stats.c.supplier_id == Supplier.id)
+
+        if sort_by == 'components':
+            query = query.order_by(component_count.desc(), Supplier.supplier_code)
+        elif sort_by == 'created':
+            query = query.order_by(Supplier.created_at.desc())
+        else:  # code and name both sort by supplier code
+            query = query.order_by(Supplier.supplier_code)
+
+        return query
+
+    @staticmethod
+    @read_only
+    def get_overview(sort_by='code'):
+        """
+        Supplier overview rows with aggregates, in a single grouped query
+
+        Returns:
+            list: Dicts with supplier fields, component_count, status_breakdown,
+                  component_types and last_activity
+        """
+        overview = []
+        for supplier, component_count, approved, rejected, last_component_activity, component_types in \
+                SupplierService.overview_query(sort_by).all():
+            activity = [ts for ts in (supplier.updated_at, supplier.created_at, last_component_activity) if ts]
+            overview.append({
+                'id': supplier.id,
+                'supplier_code': supplier.supplier_code,
+                'address': supplier.address,
+                'created_at': supplier.created_at,
+                'updated_at': supplier.updated_at,
+                'component_count': component_count,
+                'status_breakdown': {
+                    'approved': approved,
+                    'rejected': rejected,
+                    'pending': component_count - approved - rejected
+                },
+                'component_types': sorted(name for name in (component_types or []) if name),
+                'last_activity': max(activity) if activity else None
+            })
+        return overview
+
+    @staticmethod
+    def components_query(supplier_id, sort='recent'):
+        """Query for one supplier's components, ready for pagination"""
+        # Summaries show the type name and nothing else from related tables
+        query = Component.query.options(
+            *component_profile('minimal'),
+            joinedload(Component.component_type)
+        ).filter(Component.supplier_id == supplier_id)
+
+        if sort == 'product_number':
+            return query.order_by(Component.product_number)
+        return query.order_by(Component.created_at.desc(), Component.id.desc())
+
+    @staticmethod
+    def serialize_component_summary(component):
+        """Lightweight component payload for supplier pages"""
+        return {
+            'id': component.id,
+            'product_number': component.product_number,
+            'description': component.description,
+            'component_type': component.component_type.name if component.component_type else None,
+            'proto_status': component.proto_status,
+            'sms_status': component.sms_status,
+            'pps_status': component.pps_status,
+            'created_at': component.created_at.isoformat() if component.created_at else None,
+            'updated_at': component.updated_at.isoformat() if component.updated_at else None
+        }
+
+    @staticmethod
+    def bulk_delete(supplier_ids):
+        """
+        Delete suppliers in one set-based statement, skipping suppliers that still have components.
+        Component counts for all requested suppliers come from one grouped query.
+
+        Args:
+            supplier_ids: List of supplier IDs
+
+        Returns:
+            dict: deleted_count and results, a per-ID list of
+                  {'id', 'status': 'deleted' | 'blocked' | 'not_found', ...}
+        """
+        supplier_ids = list(dict.fromkeys(supplier_ids))
+        codes = dict(
+            db.session.query(Supplier.id, Supplier.supplier_code)
+            .filter(Supplier.id.in_(supplier_ids))
+            .all()
+        )
+        component_counts = dict(
+            db.session.query(Component.supplier_id, func.count(Component.id))
+            .filter(Component.supplier_id.in_(supplier_ids))
+            .group_by(Component.supplier_id)
+            .all()
+        )
+
+        results = []
+        deletable_ids = []
+        for supplier_id in supplier_ids:
+            if supplier_id not in codes:
+                results.append({'id': supplier_id, 'status': 'not_found'})
+                continue
+            component_count = component_counts.get(supplier_id, 0)
+            if component_count:
+                results.append({
+                    'id': supplier_id,
+                    'supplier_code': codes[supplier_id],
+                    'status': 'blocked',
+                    'component_count': component_count,
+                    'error': f'Supplier has {component_count} associated component(s)'
+                })
+                continue
+            deletable_ids.append(supplier_id)
+            results.append({'id': supplier_id, 'supplier_code': codes[supplier_id], 'status': 'deleted'})
+
+        deleted_ids = set()
+        if deletable_ids:
+            # NOT EXISTS guards against components added since the check
+            supplier_table = Supplier.__table__
+            deleted_ids = set(db.session.execute(
+                supplier_table.delete().where(
+                    supplier_table.c.id.in_(deletable_ids),
+                    ~exists().where(Component.supplier_id == supplier_table.c.id)
+                ).returning(supplier_table.c.id)
+            ).scalars())
+            db.session.commit()
+
+        for result in results:
+            if result['status'] == 'deleted' and result['id'] not in deleted_ids:
+                result.update(status='blocked', error='Supplier gained components during deletion')
+
+        return {'deleted_count': len(deleted_ids), 'results': results}
@@ -0,0 +1,243 @@
+"""
+Typeahead Service
+Shared in-memory prefix/infix lookup for brands, suppliers, categories and colours.
+Each worker keeps one sorted index per entity type and rebuilds it when the rows change.
+"""
+from bisect import bisect_left
+from sqlalchemy import event, func, literal_column
+from sqlalchemy.dialects.postgresql import aggregate_order_by
+from sqlalchemy.orm import Session
+from app.utils.db_routing import read_only
+import threading
+import time
+
+
+class TypeaheadIndex:
+    """
+    Sorted suffix array over entity labels.
+    Every suffix of every searchable term is stored, so infix matches are prefix lookups too.
+    """
+
+    # Lower rank sorts first
+    RANK_EXACT = 0
+    RANK_PREFIX = 1
+    RANK_WORD_PREFIX = 2
+    RANK_INFIX = 3
+    RANK_SECONDARY = 4
+
+    MATCH_TYPES = {
+        RANK_EXACT: 'exact',
+        RANK_PREFIX: 'prefix',
+        RANK_WORD_PREFIX: 'word_prefix',
+        RANK_INFIX: 'infix',
+        RANK_SECONDARY: 'secondary',
+    }
+
+    def __init__(self, entries=()):
+        """
+        Args:
+            entries: Iterable of (entity_id, label, secondary_text) tuples.
+                     The label is what gets displayed; secondary_text (may be None) is
+                     searchable but ranks below any label match.
+        """
+        self._labels = {}
+        suffixes = []
+        for entity_id, label, secondary in entries:
+            if not label:
+                continue
+            self._labels[entity_id] = label
+            suffixes.extend(self._suffixes(entity_id, label.lower(), is_label=True))
+            if secondary:
+                suffixes.extend(self._suffixes(entity_id, secondary.lower(), is_label=False))
+        suffixes.sort()
+        self._suffixes_sorted = suffixes
+
+    def __len__(self):
+        return len(self._labels)
+
+    @staticmethod
+    def _suffixes(entity_id, text, is_label):
+        for start in range(len(text)):
+            if text[start].isspace():
+                continue
+            word_start = start == 0 or not text[start - 1].isalnum()
+            yield text[start:], start, word_start, is_label, entity_id
+
+    def search(self, query, limit=None):
+        """
+        Return (entity_id, label, match_type) tuples ranked exact > prefix > word prefix > infix,
+        then by label length and label.
+        """
+        query_lower = query.strip().lower()
+        if not query_lower:
+            return []
+
+        best = {}
+        position = bisect_left(self._suffixes_sorted, (query_lower,))
+        while position < len(self._suffixes_sorted):
+            suffix, start, word_start, is_label, entity_id = self._suffixes_sorted[position]
+            if not suffix.startswith(query_lower):
+                break
+            if not is_label:
+                rank = self.RANK_SECONDARY
+            elif start == 0:
+                rank = self.RANK_EXACT if len(suffix) == len(query_lower) else self.RANK_PREFIX
+            else:
+                rank = self.RANK_WORD_PREFIX if word_start else self.RANK_INFIX
+            if rank < best.get(entity_id, self.RANK_SECONDARY + 1):
+                best[entity_id] = rank
+            position += 1
+
+        ranked = sorted(
+            best.items(),
+            key=lambda item: (item[1], len(self._labels[item[0]]), self._labels[item[0]].lower(), item[0])
+        )
+        if limit is not None:
+            ranked = ranked[:limit]
+        return [(entity_id, self._labels[entity_id], self.MATCH_TYPES[rank]) for entity_id, rank in ranked]
+
+
+class TypeaheadService:
+    """Per-worker typeahead indexes, refreshed from a version stamp"""
+
+    # How often the database stamp is re-read; searches in between never touch the database
+    STAMP_CHECK_SECONDS = 15
+
+    ENTITY_TYPES = ('brand', 'supplier', 'category', 'color')
+
+    _indexes = {}   # entity_type -> (TypeaheadIndex, local_version, db_stamp, checked_at)
+    _local_versions = {entity_type: 0 for entity_type in ENTITY_TYPES}
+    _lock = threading.Lock()
+
+    @staticmethod
+    def _source(entity_type):
+        """Return (model, label column, secondary column or None, updated_at column or None)"""
+        from app.models import Brand, Supplier, Category, Color
+        sources = {
+            'brand': (Brand, Brand.name, None, Brand.updated_at),
+            'supplier': (Supplier, Supplier.supplier_code, Supplier.address, Supplier.updated_at),
+            'category': (Category, Category.name, None, None),
+            'color': (Color, Color.name, None, None),
+        }
+        if entity_type not in sources:
+            raise ValueError(f'Unknown typeahead entity: {entity_type}')
+        return sources[entity_type]
+
+    @staticmethod
+    @read_only
+    def _db_stamp(entity_type):
+        """
+        Cheap change stamp in one aggregate query: row count, highest ID and latest update.
+        Categories and colours have no updated_at, so a hash of their labels stands in for it;
+        otherwise a rename in another worker would change neither count nor highest ID.
+        """
+        from app import db
+        model, label_column, _, updated_column = TypeaheadService._source(entity_type)
+        columns = [func.count(model.id), func.max(model.id)]
+        if updated_column is not None:
+            columns.append(func.max(updated_column))
+        else:
+            labels = func.string_agg(
+                func.concat(model.id, ':', label_column),
+                aggregate_order_by(literal_column("E'\\n'"), model.id)
+            )
+            columns.append(func.md5(labels))
+        return tuple(db.session.query(*columns).one())
+
+    @staticmethod
+    @read_only
+    def _build(entity_type):
+        from app import db
+        model, label_column, secondary_column, _ = TypeaheadService._source(entity_type)
+        if secondary_column is not None:
+            rows = db.session.query(model.id, label_column, secondary_column).all()
+        else:
+            rows = [(entity_id, label, None) for entity_id, label in db.session.query(model.id, label_column).all()]
+        return TypeaheadIndex(rows)
+
+    @classmethod
+    def get_index(cls, entity_type):
+        """Return the current index for an entity type, rebuilding it if the rows changed"""
+        if entity_type not in cls.ENTITY_TYPES:
+            raise ValueError(f'Unknown typeahead entity: {entity_type}')
+        now = time.monotonic()
+        local_version = cls._local_versions[entity_type]
+        cached = cls._indexes.get(entity_type)
+
+        if cached is not None:
+            index, built_version, db_stamp, checked_at = cached
+            if built_version == local_version and now - checked_at < cls.STAMP_CHECK_SECONDS:
+                return index
+
+        with cls._lock:
+            cached = cls._indexes.get(entity_type)
+            current_stamp = cls._db_stamp(entity_type)
+            if cached is not None and cached[1] == local_version and cached[2] == current_stamp:
+                index = cached[0]
+            else:
+                index = cls._build(entity_type)
+            cls._indexes[entity_type] = (index, local_version, current_stamp, now)
+            return index
+
+    @classmethod
+    def search(cls, entity_type, query, limit=10):
+        """
+        Ranked typeahead matches for one entity type
+
+        Returns:
+            list: Dicts with id, name and match_type
+        """
+        return [
+            {'id': entity_id, 'name': label, 'match_type': match_type}
+            for entity_id, label, match_type in cls.get_index(entity_type).search(query, limit)
+        ]
+
+    @classmethod
+    def search_ids(cls, entity_type, query):
+        """All matching IDs in rank order, for endpoints that page or enrich results themselves"""
+        return [entity_id for entity_id, _, _ in cls.get_index(entity_type).search(query)]
+
+    @classmethod
+    def invalidate(cls, entity_type):
+        """Force a rebuild of one entity type's index on next use"""
+        cls._local_versions[entity_type] += 1
+
+
+# ========================================
+# SESSION HOOKS
+# ========================================
+
+_PENDING_KEY = 'typeahead_pending'
+
+
+def _entity_type_for(obj):
+    from app.models import Brand, Supplier, Category, Color
+    for model, entity_type in ((Brand, 'brand'), (Supplier, 'supplier'), (Category, 'category'), (Color, 'color')):
+        if isinstance(obj, model):
+            return entity_type
+    return None
+
+
+@event.listens_for(Session, 'after_flush')
+def _collect_typeahead_changes(session, flush_context):
+    pending = session.info.setdefault(_PENDING_KEY, set())
+    for obj in list(session.new) + list(session.deleted):
+        entity_type = _entity_type_for(obj)
+        if entity_type:
+            pending.add(entity_type)
+    for obj in session.dirty:
+        entity_type = _entity_type_for(obj)
+        # Collection changes (e.g. a supplier gaining a component) don't affect labels
+        if entity_type and session.is_modified(obj, include_collections=False):
+            pending.add(entity_type)
+
+
+@event.listens_for(Session, 'after_commit')
+def _bump_typeahead_versions(session):
+    for entity_type in session.info.pop(_PENDING_KEY, ()):
+        TypeaheadService.invalidate(entity_type)
+
+
+@event.listens_for(Session, 'after_rollback')
+def _discard_typeahead_changes(session):
+    session.info.pop(_PENDING_KEY, None)
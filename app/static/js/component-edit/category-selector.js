@@ -9,6 +9,7 @@ class CategorySelector {
         this.selectedCategoryIds = new Set();
         this.isDropdownOpen = false;
         this.searchDebounceTimer = null;
+        this.searchSequence = 0;
         this.focusedCategoryIndex = -1;
         
         // DOM elements
@@ -85,7 +86,7 @@ class CategorySelector {
         this.categorySearch.addEventListener('input', (e) => {
             clearTimeout(this.searchDebounceTimer);
             this.searchDebounceTimer = setTimeout(() => {
-                this.performCategorySearch(e.target.value.toLowerCase().trim());
+                this.searchCategories(e.target.value.toLowerCase().trim());
             }, 150);
         });
         
@@ -103,7 +104,7 @@ class CategorySelector {
                 e.preventDefault();
                 e.stopPropagation();
                 this.categorySearch.value = '';
-                this.performCategorySearch('');
+                this.searchCategories('');
                 this.showCategoryDropdown();
                 this.categorySearch.focus();
             });
@@ -113,7 +114,7 @@ class CategorySelector {
         if (this.categoryClearSearch) {
             this.categoryClearSearch.addEventListener('click', () => {
                 this.categorySearch.value = '';
-                this.performCategorySearch('');
+                this.searchCategories('');
             });
         }
         
@@ -151,20 +152,50 @@ class CategorySelector {
         });
     }
     
-    performCategorySearch(query) {
+    async searchCategories(query) {
+        // A slower earlier response must not overwrite a newer search
+        const sequence = ++this.searchSequence;
+        if (!query) {
+            this.performCategorySearch('');
+            return;
+        }
+        
+        // Ranked by the shared typeahead index
+        let ranking = null;
+        try {
+            const results = await ApiUtils.typeahead('category', query, 100);
+            ranking = new Map(results.map((result, index) => [result.id, index]));
+        } catch (error) {
+            console.error('Category typeahead failed, filtering locally:', error);
+        }
+        if (sequence === this.searchSequence) {
+            this.performCategorySearch(query, ranking);
+        }
+    }
+    
+    performCategorySearch(query, ranking = null) {
         let visibleCount = 0;
         let hasExactMatch = false;
         let exactMatchIsSelected = false;
         
         this.allCategoryOptions.forEach(option => {
             const categoryName = option.dataset.name.toLowerCase();
-            const isSelected = this.selectedCategoryIds.has(parseInt(option.dataset.id));
+            const categoryId = parseInt(option.dataset.id);
+            const isSelected = this.selectedCategoryIds.has(categoryId);
             let isVisible = false;
             
             if (query === '') {
                 // Show all when no search query
                 isVisible = true;
                 option.style.order = isSelected ? '1' : '2';
+            } else if (ranking) {
+                // Server order: exact > prefix > word prefix > infix
+                isVisible = ranking.has(categoryId);
+                option.style.order = isVisible ? String(ranking.get(categoryId) + 1) : '';
+                if (categoryName === query) {
+                    hasExactMatch = true;
+                    exactMatchIsSelected = isSelected;
+                }
             } else {
                 // Smart matching: exact > starts with > contains
                 if (categoryName === query) {
@@ -390,7 +421,7 @@ class CategorySelector {
                 }, 3000);
                 
                 this.categorySearch.focus();
-                this.performCategorySearch('');
+                this.searchCategories('');
                 
             } else {
                 throw new Error(data.error || 'Failed to create category');
@@ -14,6 +14,7 @@ class VariantManager {
         this.variantCount = 0;
         this.pendingVariants = new Map(); // Store new variants before creation
         this.stagedChanges = new Map(); // Store staged picture changes for existing variants
+        this.colorSuggestionTimers = new Map(); // Debounce per custom color input
         this.init();
     }
     
@@ -178,7 +179,7 @@ class VariantManager {
                                    class="form-input" 
                                    placeholder="Enter new color name..."
                                    onchange="variantManager.updateCustomColorName('${variantId}')"
-                                   oninput="variantManager.updateCustomColorName('${variantId}')"
+                                   oninput="variantManager.updateCustomColorName('${variantId}')">
                             <small class="form-help">This will create a new color in the system</small>
                         </div>
                         <div class="form-help">Select a color for this variant</div>
@@ -434,6 +435,67 @@ class VariantManager {
         this.updateVariantTitle(variantId);
         this.updateVariantValidationStatus(variantId);
         this.updateOverallValidationStatus();
+        
+        this.suggestExistingColors(variantId);
+    }
+    
+    suggestExistingColors(variantId) {
+        // Offer existing colors matching a typed new color name, so near-duplicates are not created
+        clearTimeout(this.colorSuggestionTimers.get(variantId));
+        this.colorSuggestionTimers.set(variantId, setTimeout(async () => {
+            const customInput = document.getElementById(`custom_color_${variantId}`);
+            const colorSelect = document.getElementById(`color_select_${variantId}`);
+            if (!customInput || !colorSelect) return;
+            
+            const query = customInput.value.trim();
+            let results = [];
+            if (query.length >= 2) {
+                try {
+                    results = await ApiUtils.typeahead('color', query, 5);
+                } catch (error) {
+                    console.error('Color typeahead failed:', error);
+                }
+            }
+            if (customInput.value.trim() !== query) return; // A newer keystroke is pending
+            
+            this.renderColorSuggestions(variantId, customInput, colorSelect, results);
+        }, 150));
+    }
+    
+    renderColorSuggestions(variantId, customInput, colorSelect, results) {
+        let container = document.getElementById(`color_suggestions_${variantId}`);
+        if (!container) {
+            container = document.createElement('div');
+            container.id = `color_suggestions_${variantId}`;
+            container.className = 'form-help';
+            customInput.insertAdjacentElement('afterend', container);
+        }
+        container.innerHTML = '';
+        
+        // Only colors this variant can still use
+        const usable = results.filter(result => {
+            const option = colorSelect.querySelector(`option[value="${result.id}"]`);
+            return option && !option.disabled;
+        });
+        if (usable.length === 0) return;
+        
+        const label = document.createElement('span');
+        label.textContent = usable[0].match_type === 'exact' ? 'This color already exists: ' : 'Existing colors: ';
+        container.appendChild(label);
+        
+        usable.forEach(result => {
+            const button = document.createElement('button');
+            button.type = 'button';
+            button.className = 'btn btn-sm btn-outline-secondary';
+            button.textContent = result.name;
+            button.addEventListener('click', () => {
+                customInput.value = '';
+                container.innerHTML = '';
+                colorSelect.value = String(result.id);
+                this.handleColorSelection(variantId);
+            });
+            container.appendChild(button);
+        });
     }
     
     isDuplicateColor(currentVariantId, colorId) {
@@ -218,7 +218,7 @@ function supplierManagement() {
                 this.supplierToDelete = {
                     id: supplier.id,
                     code: supplier.supplier_code,
-                    componentCount: supplier.components ? supplier.components.length : 0
+                    componentCount: supplier.component_count || 0
                 };
                 
                 const modalElement = document.getElementById('deleteConfirmModal');
@@ -311,5 +311,53 @@ function supplierManagement() {
     };
 }
 
-// Make function available globally for Alpine.js
-window.supplierManagement = supplierManagement;
\ No newline at end of file
+/**
+ * Recent components list for one supplier card
+ * Fetched from the API only once the card scrolls into view
+ */
+function supplierRecentComponents(supplierId, total) {
+    return {
+        components: [],
+        total: total,
+        loading: total > 0,
+
+        init() {
+            if (!this.total) return;
+
+            if (!('IntersectionObserver' in window)) {
+                this.load();
+                return;
+            }
+
+            const observer = new IntersectionObserver((entries) => {
+                if (entries.some(entry => entry.isIntersecting)) {
+                    observer.disconnect();
+                    this.load();
+                }
+            });
+            observer.observe(this.$el);
+        },
+
+        async load() {
+            try {
+                const response = await ApiUtils.get(`/api/suppliers/${supplierId}/components?per_page=5`);
+                this.components = response.data.components;
+                this.total = response.data.pagination.total;
+            } catch (error) {
+                console.error('Error loading supplier components:', error);
+            } finally {
+                this.loading = false;
+            }
+        },
+
+        formatShortDate(value) {
+            if (!value) return 'N/A';
+            const date = new Date(value);
+            return `${String(date.getMonth() + 1).padStart(2, '0')}/${String(date.getDate()).padStart(2, '0')}`;
+        }
+    };
+}
+
+// Make functions available globally for Alpine.js
+window.supplierManagement = supplierManagement;
+window.supplierRecentComponents = supplierRecentComponents;
\ No newline at end of file
@@ -197,6 +197,23 @@ class ApiUtils {
         return queryString ? `${baseUrl}?${queryString}` : baseUrl;
     }
 
+    /**
+     * Ranked matches from the shared typeahead index (no flash message on failure)
+     * @param {string} entityType - brand, supplier, category or color
+     * @param {string} query - Text typed so far
+     * @param {number} limit - Maximum number of results
+     * @returns {Promise<Array>} Results with id, name and match_type, best first
+     */
+    static async typeahead(entityType, query, limit = 10) {
+        const url = this.buildUrl(`/api/typeahead/${entityType}`, { q: query, limit });
+        const response = await fetch(url, { credentials: 'same-origin' });
+        if (!response.ok) {
+            throw new Error(`HTTP ${response.status}: ${response.statusText}`);
+        }
+        const data = await response.json();
+        return data.results || [];
+    }
+
     /**
      * Show loading state
      * @param {HTMLElement} element - Element to show loading state on
@@ -0,0 +1,346 @@
+"""
+Static asset fingerprinting
+build_manifest copies every JS and CSS file under app/static into ASSETS_OUTPUT_FOLDER under a
+name carrying its content hash (css/main.css -> css/main.3f9a1c2b7d.css) and writes
+manifest.json mapping the source names to them. Relative url()/@import references inside CSS
+are rewritten to the fingerprinted names first, so a stylesheet's hash changes whenever
+anything it imports changes. Templates call static_url('css/main.css'); fingerprinted files are
+served from ASSETS_URL_PREFIX with a one-year immutable Cache-Control, so repeat page loads
+download no JS or CSS until a deploy changes them.
+
+BUNDLES concatenates the files each page loads into one minified file per page (stylesheet
+@imports are inlined), and every output is also written precompressed as .gz and, when the
+brotli package is installed, .br; the asset route picks the variant the client accepts.
+Templates load bundles with bundle_urls('component-detail.js'), which lists the individual
+source files instead when bundles are not built.
+
+The manifest is rebuilt at startup (unchanged files keep their names and are not rewritten);
+tools/scripts/build_assets.py builds it at image build time for deployments whose code folder is
+read-only, and startup then uses that manifest. With ASSETS_FINGERPRINT off (development)
+static_url falls back to the plain static route with the file's modification time as a query
+string, so edits show up without a restart.
+"""
+from flask import Blueprint, current_app, request, send_from_directory, url_for
+import gzip
+import hashlib
+import json
+import mimetypes
+import os
+import posixpath
+import re
+import tempfile
+
+try:
+    import brotli
+except ImportError:  # .br variants are skipped; gzip is always available
+    brotli = None
+
+try:
+    import rcssmin
+    import rjsmin
+except ImportError:  # Whitespace-only minification
+    rcssmin = rjsmin = None
+
+
+ASSET_EXTENSIONS = ('.css', '.js')
+MANIFEST_NAME = 'manifest.json'
+IMMUTABLE_MAX_AGE = 365 * 24 * 60 * 60
+BUNDLE_FOLDER = 'bundles'
+
+# Smaller files gain nothing from a compressed variant
+PRECOMPRESS_MIN_BYTES = 512
+
+# Per-page bundles, in load order. Scripts loaded with defer stay separate from blocking ones.
+BUNDLES = {
+    'base.css': ['css/main.css'],
+    'base.js': [
+        'js/utils/common.js', 'js/utils/validation.js', 'js/utils/api.js',
+        'js/components/base.js', 'js/components/form-validation.js', 'js/main.js',
+    ],
+    'component-detail.css': [
+        'css/component-detail/main.css', 'css/component-detail/gallery.css',
+        'css/component-detail/loading.css', 'css/component-detail/workflow.css',
+        'css/component-detail/tabs.css',
+    ],
+    'component-detail.js': [
+        'js/component-detail/state-management.js', 'js/component-detail/gallery.js',
+        'js/component-detail/loading-system.js', 'js/component-detail/tabs.js',
+    ],
+    'component-edit.css': ['css/component-edit/main.css'],
+    'component-edit.js': [
+        'js/component-edit/form-handler.js', 'js/component-edit/keyword-autocomplete.js',
+        'js/component-edit/category-selector.js', 'js/component-edit/variant-manager.js',
+        'js/component-edit/brand-manager.js',
+    ],
+}
+
+# url(...) and @import "..." references; quotes optional for url()
+_CSS_REFERENCE = re.compile(r'''url\(\s*(['"]?)([^'")]+)\1\s*\)|@import\s+(['"])([^'"]+)\3''')
+_CSS_IMPORT = re.compile(r'''@import\s+(?:url\(\s*(['"]?)([^'")]+)\1\s*\)|(['"])([^'"]+)\3)\s*;''')
+_ABSOLUTE_REFERENCE = re.compile(r'^([a-z]+:|/|#)', re.IGNORECASE)
+
+
+def _content_hash(content):
+    return hashlib.sha256(content).hexdigest()[:10]
+
+
+def fingerprinted_name(name, content):
+    """'css/main.css' + content -> 'css/main.<hash>.css'"""
+    root, extension = posixpath.splitext(name)
+    return f'{root}.{_content_hash(content)}{extension}'
+
+
+def _source_files(static_folder, skip_folders):
+    for directory, subdirectories, files in os.walk(static_folder):
+        subdirectories[:] = sorted(
+            subdirectory for subdirectory in subdirectories
+            if os.path.abspath(os.path.join(directory, subdirectory)) not in skip_folders
+        )
+        for filename in sorted(files):
+            if filename.endswith(ASSET_EXTENSIONS):
+                path = os.path.join(directory, filename)
+                yield os.path.relpath(path, static_folder).replace(os.sep, '/')
+
+
+def _write_atomic(path, content):
+    # Several workers may build at the same time; readers only ever see complete files
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    descriptor, temporary = tempfile.mkstemp(dir=os.path.dirname(path), prefix='.tmp-')
+    with os.fdopen(descriptor, 'wb') as handle:
+        handle.write(content)
+    os.chmod(temporary, 0o644)  # mkstemp creates 0600; the build user may not be the serving user
+    os.replace(temporary, path)
+
+
+class _Builder:
+    def __init__(self, static_folder, names):
+        self.static_folder = static_folder
+        self.names = set(names)
+        self.outputs = {}  # source name -> (fingerprinted name, content)
+        self._building = set()
+
+    def build(self, name):
+        if name in self.outputs:
+            return self.outputs[name]
+        with open(os.path.join(self.static_folder, name), 'rb') as handle:
+            content = handle.read()
+        if name.endswith('.css'):
+            if name in self._building:
+                raise ValueError(f'Circular CSS import involving {name}')
+            self._building.add(name)
+            content = self._rewrite_css(name, content.decode('utf-8')).encode('utf-8')
+            self._building.discard(name)
+        self.outputs[name] = (fingerprinted_name(name, content), content)
+        return self.outputs[name]
+
+    def _rewrite_css(self, name, css):
+        directory = posixpath.dirname(name)
+
+        def replace(match):
+            reference = match.group(2) or match.group(4)
+            return match.group(0).replace(reference, self._reference(reference, directory, directory))
+
+        return _CSS_REFERENCE.sub(replace, css)
+
+    def _reference(self, reference, directory, from_directory):
+        """reference (relative to directory) as seen from from_directory, fingerprinted when known"""
+        if _ABSOLUTE_REFERENCE.match(reference):
+            return reference  # Absolute URLs, data: URIs and fragments stay as they are
+        path, _, suffix = reference.partition('?')
+        target = posixpath.normpath(posixpath.join(directory, path))
+        if target in self.names:
+            target, _ = self.build(target)
+        relative = posixpath.relpath(target, from_directory or '.')
+        return relative + (f'?{suffix}' if suffix else '')
+
+    def bundle(self, name, sources):
+        """(fingerprinted name, minified content) of a bundle concatenating sources"""
+        output = posixpath.join(BUNDLE_FOLDER, name)
+        if name.endswith('.css'):
+            content = minify_css('\n'.join(self._inline_css(source, set()) for source in sources))
+        else:
+            # A source without a trailing semicolon must not run into the next one
+            content = ';\n'.join(minify_js(self._read(source)) for source in sources)
+        content = content.encode('utf-8')
+        return fingerprinted_name(output, content), content
+
+    def _read(self, name):
+        with open(os.path.join(self.static_folder, name), encoding='utf-8') as handle:
+            return handle.read()
+
+    def _inline_css(self, name, seen):
+        # @import statements are replaced by the imported file; other references are rebased
+        # from the file's folder to the bundle folder
+        if name in seen:
+            raise ValueError(f'Circular CSS import involving {name}')
+        seen = seen | {name}
+        directory = posixpath.dirname(name)
+
+        def inline(match):
+            reference = match.group(2) or match.group(4)
+            if _ABSOLUTE_REFERENCE.match(reference):
+                return match.group(0)
+            target = posixpath.normpath(posixpath.join(directory, reference.partition('?')[0]))
+            if target not in self.names:
+                return match.group(0)
+            return self._inline_css(target, seen)
+
+        def rebase(match):
+            reference = match.group(2)
+            return match.group(0).replace(reference, self._reference(reference, directory, BUNDLE_FOLDER))
+
+        css = _CSS_IMPORT.sub(inline, self._read(name))
+        return _CSS_REFERENCE.sub(lambda match: rebase(match) if match.group(2) else match.group(0), css)
+
+
+def minify_css(css):
+    """rcssmin when installed, otherwise comments and redundant whitespace removed"""
+    if rcssmin is not None:
+        return rcssmin.cssmin(css)
+    css = re.sub(r'/\*.*?\*/', '', css, flags=re.DOTALL)
+    css = re.sub(r'\s+', ' ', css)
+    return re.sub(r'\s*([{};,])\s*', r'\1', css).strip()
+
+
+def minify_js(js):
+    """rjsmin when installed, otherwise indentation and blank lines removed (always safe)"""
+    if rjsmin is not None:
+        return rjsmin.jsmin(js)
+    return '\n'.join(line.strip() for line in js.splitlines() if line.strip())
+
+
+def _precompress(path, content):
+    """Write path.gz (and path.br with brotli installed) when compression pays off"""
+    if len(content) < PRECOMPRESS_MIN_BYTES:
+        return
+    variants = [('.gz', gzip.compress(content, compresslevel=9, mtime=0))]
+    if brotli is not None:
+        variants.append(('.br', brotli.compress(content, quality=11)))
+    for suffix, compressed in variants:
+        if len(compressed) < len(content) and not os.path.exists(path + suffix):
+            _write_atomic(path + suffix, compressed)
+
+
+def _write_output(output_folder, name, content):
+    target = os.path.join(output_folder, name)
+    if not os.path.exists(target):
+        _write_atomic(target, content)
+    _precompress(target, content)
+
+
+def build_manifest(static_folder, output_folder):
+    """
+    Fingerprint every asset under static_folder into output_folder, build the BUNDLES whose
+    sources all exist, and precompress the results
+
+    Returns:
+        dict: source name -> fingerprinted name, also written to output_folder/manifest.json
+    """
+    static_folder = os.path.abspath(static_folder)
+    output_folder = os.path.abspath(output_folder)
+    skip = {output_folder, os.path.join(static_folder, 'uploads')}
+    names = list(_source_files(static_folder, skip))
+
+    builder = _Builder(static_folder, names)
+    manifest = {}
+    for name in names:
+        fingerprinted, content = builder.build(name)
+        _write_output(output_folder, fingerprinted, content)
+        manifest[name] = fingerprinted
+
+    for bundle, sources in BUNDLES.items():
+        if all(source in builder.names for source in sources):
+            fingerprinted, content = builder.bundle(bundle, sources)
+            _write_output(output_folder, fingerprinted, content)
+            manifest[posixpath.join(BUNDLE_FOLDER, bundle)] = fingerprinted
+
+    _write_atomic(
+        os.path.join(output_folder, MANIFEST_NAME),
+        json.dumps(manifest, indent=2, sort_keys=True).encode('utf-8')
+    )
+    return manifest
+
+
+def load_manifest(output_folder):
+    """The manifest written by build_manifest, or None when there is none"""
+    try:
+        with open(os.path.join(output_folder, MANIFEST_NAME), encoding='utf-8') as handle:
+            return json.load(handle)
+    except (OSError, ValueError):
+        return None
+
+
+# ========================================
+# FLASK INTEGRATION
+# ========================================
+
+assets_bp = Blueprint('assets', __name__)
+
+
+# Content-Encoding -> suffix of the precompressed variant, in order of preference
+_PRECOMPRESSED = (('br', '.br'), ('gzip', '.gz'))
+
+
+@assets_bp.route('/<path:filename>')
+def fingerprinted_asset(filename):
+    """
+    Serve a fingerprinted file; its name changes with its content, so it may be cached forever.
+    The .br or .gz variant is sent instead when the client accepts it.
+    """
+    folder = current_app.config['ASSETS_OUTPUT_FOLDER']
+    mimetype = mimetypes.guess_type(filename)[0] or 'application/octet-stream'
+    encoding, served = None, filename
+    for candidate, suffix in _PRECOMPRESSED:
+        if request.accept_encodings[candidate] and os.path.isfile(os.path.join(folder, filename + suffix)):
+            encoding, served = candidate, filename + suffix
+            break
+
+    response = send_from_directory(folder, served, mimetype=mimetype, max_age=IMMUTABLE_MAX_AGE)
+    if encoding:
+        response.headers['Content-Encoding'] = encoding
+    response.vary.add('Accept-Encoding')
+    response.cache_control.public = True
+    response.cache_control.immutable = True
+    return response
+
+
+def static_url(filename):
+    """URL for a file under app/static: fingerprinted when listed in the manifest"""
+    manifest = current_app.extensions.get('asset_manifest')
+    if manifest and filename in manifest:
+        return url_for('assets.fingerprinted_asset', filename=manifest[filename])
+
+    path = os.path.join(current_app.static_folder, filename)
+    try:
+        version = int(os.path.getmtime(path))
+    except OSError:
+        return url_for('static', filename=filename)
+    return url_for('static', filename=filename, v=version)
+
+
+def bundle_urls(name):
+    """URLs loading a bundle: the bundle itself when built, otherwise its sources in order"""
+    manifest = current_app.extensions.get('asset_manifest')
+    bundle = posixpath.join(BUNDLE_FOLDER, name)
+    if manifest and bundle in manifest:
+        return [url_for('assets.fingerprinted_asset', filename=manifest[bundle])]
+    return [static_url(source) for source in BUNDLES[name]]
+
+
+def init_assets(app):
+    """Register the fingerprinted asset route and load (or build) the manifest"""
+    app.register_blueprint(assets_bp, url_prefix=app.config.get('ASSETS_URL_PREFIX', '/assets'))
+    app.jinja_env.globals['static_url'] = static_url
+    app.jinja_env.globals['bundle_urls'] = bundle_urls
+
+    if not app.config.get('ASSETS_FINGERPRINT'):
+        return
+    output_folder = app.config['ASSETS_OUTPUT_FOLDER']
+    try:
+        manifest = build_manifest(app.static_folder, output_folder)
+    except (OSError, ValueError) as e:
+        manifest = load_manifest(output_folder)
+        if manifest is None:
+            app.logger.warning(f"Could not fingerprint static assets: {str(e)}")
+            return
+    app.extensions['asset_manifest'] = manifest
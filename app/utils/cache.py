@@ -0,0 +1,351 @@
+"""
+Application caching helpers
+Service-level (@cached) and endpoint-level (@cached_view) decorators on top of the cache set up
+by app.cache_config.init_cache, with tag-based invalidation: every entry records the version token
+of each tag it depends on ("component:12", "brand:3", "suppliers", ...), and invalidating a tag
+replaces its token so dependent entries read as misses. Committed writes invalidate their tags
+through session hooks, so write paths never need to know which keys exist.
+Without a configured cache every decorator simply calls through, and so does a cache that fails
+(e.g. Redis down): a cache outage costs speed, never availability.
+"""
+from flask import current_app, has_app_context, request, make_response
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session
+import functools
+import hashlib
+import uuid
+
+
+# Every entry depends on this tag; bulk statements that cannot be attributed to IDs invalidate it
+ALL_TAG = 'all'
+
+_TAG_PREFIX = 'tag:'
+
+
+def entity_tag(kind, entity_id):
+    """Tag for one entity, e.g. entity_tag('component', 12) -> 'component:12'"""
+    return f'{kind}:{entity_id}'
+
+
+_DISABLED_TYPES = ('null', 'NullCache')
+
+
+def _app_cache(app):
+    cache = getattr(app, 'cache', None)
+    if cache is None or app.config.get('CACHE_TYPE') in _DISABLED_TYPES:
+        return None
+    return cache
+
+
+def get_cache():
+    """The application's cache, or None when caching is not configured"""
+    if not has_app_context():
+        return None
+    return _app_cache(current_app)
+
+
+def log_cache_error(error):
+    """Report a cache backend failure that the caller recovers from by calling through"""
+    current_app.logger.warning(f"Cache unavailable, calling through: {str(error)}")
+
+
+def stable_key(*parts):
+    """Cache key fragment that is identical in every worker process (unlike hash())"""
+    raw = repr(parts).encode('utf-8')
+    return hashlib.md5(raw).hexdigest()
+
+
+# ========================================
+# TAGS
+# ========================================
+
+def tag_tokens(cache, tags):
+    """
+    Current token per tag, creating tokens for tags seen for the first time.
+    Read tokens before computing a value: a write committed meanwhile then invalidates it.
+    """
+    tags = sorted(set(tags))
+    tokens = dict(zip(tags, cache.get_many(*[_TAG_PREFIX + tag for tag in tags]))) if tags else {}
+    for tag, token in tokens.items():
+        if token is None:
+            token = uuid.uuid4().hex
+            # add() keeps a token another worker created in the meantime
+            if not cache.add(_TAG_PREFIX + tag, token, timeout=0):
+                token = cache.get(_TAG_PREFIX + tag)
+            tokens[tag] = token
+    return tokens
+
+
+def invalidate_tags(*tags, cache=None):
+    """Invalidate every entry depending on any of the tags"""
+    cache = cache or get_cache()
+    if cache is None or not tags:
+        return
+    cache.set_many({_TAG_PREFIX + tag: uuid.uuid4().hex for tag in set(tags)}, timeout=0)
+
+
+def cache_get(cache, key):
+    """Stored value, or None when absent or when any of its tags was invalidated since"""
+    entry = cache.get(key)
+    if not entry:
+        return None
+    tags = list(entry['tags'])
+    current = cache.get_many(*[_TAG_PREFIX + tag for tag in tags])
+    if any(token != entry['tags'][tag] for tag, token in zip(tags, current)):
+        return None
+    return entry['value']
+
+
+def cache_set(cache, key, value, tokens, timeout=None):
+    """Store value with the tag tokens (from tag_tokens) it was computed under"""
+    cache.set(key, {'value': value, 'tags': tokens}, timeout=timeout)
+
+
+# ========================================
+# DECORATORS
+# ========================================
+
+def cached(timeout=None, tags=(), result_tags=None, key_prefix=None, skip_self=False):
+    """
+    Cache a service function's return value (must be picklable plain data)
+
+    Args:
+        timeout: Seconds to keep the entry; None uses CACHE_DEFAULT_TIMEOUT
+        tags: Tags the value depends on, or a callable (*args, **kwargs) -> tags
+        result_tags: Optional callable (result) -> further tags only known from the result,
+                     e.g. the brands a component payload lists
+        key_prefix: Key namespace; defaults to the function's qualified name
+        skip_self: Leave the first argument (self/cls) out of the key
+
+    The wrapper also exposes refresh(*args, **kwargs), which recomputes and stores the entry
+    whether or not it is current, and is_cached(*args, **kwargs); both are used by the
+    background refresher in app.utils.cache_warming.
+    """
+    def decorator(func):
+        prefix = key_prefix or f'{func.__module__}.{func.__qualname__}'
+
+        def key_for(args, kwargs):
+            key_args = args[1:] if skip_self else args
+            return f'{prefix}:{stable_key(key_args, sorted(kwargs.items()))}'
+
+        def compute(cache, key, args, kwargs):
+            call_tags = tags(*args, **kwargs) if callable(tags) else tags
+            try:
+                tokens = tag_tokens(cache, set(call_tags) | {ALL_TAG})
+            except Exception as e:
+                log_cache_error(e)
+                return func(*args, **kwargs)
+            value = func(*args, **kwargs)
+            try:
+                if result_tags is not None:
+                    tokens.update(tag_tokens(cache, result_tags(value)))
+                cache_set(cache, key, value, tokens, timeout)
+            except Exception as e:
+                log_cache_error(e)
+            return value
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            cache = get_cache()
+            if cache is None:
+                return func(*args, **kwargs)
+
+            key = key_for(args, kwargs)
+            try:
+                value = cache_get(cache, key)
+            except Exception as e:
+                log_cache_error(e)
+                return func(*args, **kwargs)
+            if value is not None:
+                return value
+            return compute(cache, key, args, kwargs)
+
+        def refresh(*args, **kwargs):
+            cache = get_cache()
+            if cache is None:
+                return func(*args, **kwargs)
+            return compute(cache, key_for(args, kwargs), args, kwargs)
+
+        def is_cached(*args, **kwargs):
+            cache = get_cache()
+            if cache is None:
+                return False
+            try:
+                return cache_get(cache, key_for(args, kwargs)) is not None
+            except Exception as e:
+                log_cache_error(e)
+                return False
+
+        wrapper.uncached = func
+        wrapper.key_prefix = prefix
+        wrapper.timeout = timeout
+        wrapper.refresh = refresh
+        wrapper.is_cached = is_cached
+        return wrapper
+    return decorator
+
+
+def cached_view(timeout=None, tags=()):
+    """
+    Cache a GET endpoint's successful response by path and query string
+
+    Only 200 responses are stored. For JSON and other payloads that do not depend on the session;
+    pages rendering CSRF tokens or flashed messages must cache their data instead.
+
+    Args:
+        timeout: Seconds to keep the response; None uses CACHE_DEFAULT_TIMEOUT
+        tags: Tags the response depends on, or a callable (**view_args) -> tags
+    """
+    def decorator(view):
+        @functools.wraps(view)
+        def wrapper(*args, **kwargs):
+            cache = get_cache()
+            if cache is None or request.method != 'GET':
+                return view(*args, **kwargs)
+
+            args_key = stable_key(sorted(request.args.items(multi=True)))
+            key = f'view:{request.endpoint}:{request.path}:{args_key}'
+            view_tags = tags(**kwargs) if callable(tags) else tags
+            try:
+                stored = cache_get(cache, key)
+                if stored is None:
+                    tokens = tag_tokens(cache, set(view_tags) | {ALL_TAG})
+            except Exception as e:
+                log_cache_error(e)
+                return view(*args, **kwargs)
+            if stored is not None:
+                body, mimetype = stored
+                response = current_app.response_class(body, mimetype=mimetype)
+                response.headers['X-Cache'] = 'HIT'
+                return response
+
+            response = make_response(view(*args, **kwargs))
+            if response.status_code == 200 and not response.is_streamed:
+                try:
+                    cache_set(cache, key, (response.get_data(), response.mimetype), tokens, timeout)
+                    response.headers['X-Cache'] = 'MISS'
+                except Exception as e:
+                    log_cache_error(e)
+            return response
+        return wrapper
+    return decorator
+
+
+# ========================================
+# SESSION HOOKS
+# ========================================
+
+_PENDING_KEY = 'cache_tags_pending'
+
+# Tables written with Core or bulk Query statements -> tags to drop when their IDs are unknown
+_BULK_TABLE_TAGS = {
+    'component': (ALL_TAG,),
+    'component_variant': (ALL_TAG,),
+    'picture': (ALL_TAG,),
+    'component_brand': (ALL_TAG,),
+    'keyword_component': (ALL_TAG,),
+    'component_category': (ALL_TAG,),
+    'brand': ('brands', ALL_TAG),
+    'subbrand': ('brands',),
+    'supplier': ('suppliers', ALL_TAG),
+    'component_type': ('types', ALL_TAG),
+    'category': ('categories', ALL_TAG),
+    'keyword': ('keywords', ALL_TAG),
+    'color': ('colors', ALL_TAG),
+    'component_type_property': ('types', ALL_TAG),
+    'property': ('properties',),
+    'material': ('materials',),
+}
+
+
+def _values(obj, attribute):
+    """Current and pre-flush values of a column attribute (foreign keys can move)"""
+    state = inspect(obj)
+    history = state.attrs[attribute].history
+    values = {getattr(obj, attribute)} | set(history.deleted or ())
+    return {value for value in values if value is not None}
+
+
+def tags_for(obj):
+    """Tags affected by writing obj"""
+    from app.models import (
+        Component, ComponentVariant, Picture, ComponentBrand, Brand, Subbrand,
+        Supplier, ComponentType, ComponentTypeProperty, Property, Category, Keyword, Color, Material
+    )
+    if isinstance(obj, Component):
+        tags = {'components', entity_tag('component', obj.id)}
+        tags |= {entity_tag('supplier', value) for value in _values(obj, 'supplier_id')}
+        tags |= {entity_tag('type', value) for value in _values(obj, 'component_type_id')}
+        return tags
+    if isinstance(obj, (ComponentVariant, Picture)):
+        component_ids = _values(obj, 'component_id')
+        if not component_ids and isinstance(obj, Picture) and obj.variant is not None:
+            # Variant pictures may get component_id from a database trigger
+            component_ids = {obj.variant.component_id}
+        return {'components'} | {entity_tag('component', value) for value in component_ids}
+    if isinstance(obj, ComponentBrand):
+        return ({'components', 'brands'}
+                | {entity_tag('component', value) for value in _values(obj, 'component_id')}
+                | {entity_tag('brand', value) for value in _values(obj, 'brand_id')})
+    if isinstance(obj, Brand):
+        return {'brands', entity_tag('brand', obj.id)}
+    if isinstance(obj, Subbrand):
+        return {'brands'} | {entity_tag('brand', value) for value in _values(obj, 'brand_id')}
+    if isinstance(obj, Supplier):
+        return {'suppliers', entity_tag('supplier', obj.id)}
+    if isinstance(obj, ComponentType):
+        return {'types', entity_tag('type', obj.id)}
+    if isinstance(obj, ComponentTypeProperty):
+        return {'types'} | {entity_tag('type', value) for value in _values(obj, 'component_type_id')}
+    if isinstance(obj, Property):
+        return {'properties'}
+    if isinstance(obj, Material):
+        return {'materials'}
+    if isinstance(obj, Color):
+        return {'colors', entity_tag('color', obj.id)}
+    if isinstance(obj, Category):
+        return {'categories', entity_tag('category', obj.id)}
+    if isinstance(obj, Keyword):
+        return {'keywords', entity_tag('keyword', obj.id)}
+    return set()
+
+
+@event.listens_for(Session, 'after_flush')
+def _collect_cache_tags(session, flush_context):
+    pending = session.info.setdefault(_PENDING_KEY, set())
+    for obj in session.new:
+        pending |= tags_for(obj)
+    for obj in session.dirty:
+        if session.is_modified(obj):
+            pending |= tags_for(obj)
+    for obj in session.deleted:
+        pending |= tags_for(obj)
+
+
+@event.listens_for(Session, 'do_orm_execute')
+def _collect_bulk_cache_tags(orm_execute_state):
+    if orm_execute_state.is_update or orm_execute_state.is_delete or orm_execute_state.is_insert:
+        table = getattr(orm_execute_state.statement, 'table', None)
+        tags = _BULK_TABLE_TAGS.get(getattr(table, 'name', None))
+        if tags:
+            orm_execute_state.session.info.setdefault(_PENDING_KEY, set()).update(tags)
+
+
+@event.listens_for(Session, 'after_commit')
+def _invalidate_cache_tags(session):
+    pending = session.info.pop(_PENDING_KEY, None)
+    if not pending:
+        return
+    app = getattr(session, 'app', None)
+    cache = _app_cache(app) if app is not None else None
+    if cache is None:
+        return
+    try:
+        invalidate_tags(*pending, cache=cache)
+    except Exception as e:
+        app.logger.warning(f"Could not invalidate cache tags: {str(e)}")
+
+
+@event.listens_for(Session, 'after_rollback')
+def _discard_cache_tags(session):
+    session.info.pop(_PENDING_KEY, None)
@@ -0,0 +1,200 @@
+"""
+Cache warming and background refresh
+warm_cache fills the entries every page needs (filter options, dashboard stats, property
+schemas) and renders the first index pages once, so the first requests after a deploy or
+restart find a warm shared cache. It runs as `flask warm-cache` (docker/app/init.sh calls it
+before starting the server), never inside the application factory. CacheRefresher
+recomputes expensive aggregates from a daemon thread before their entries expire, and soon
+after a write invalidates them, so user requests do not pay for the recomputation.
+Workers share the refresh work through short leases taken with cache.add.
+"""
+from flask import request
+from app.utils.cache import get_cache
+import click
+import os
+import threading
+import time
+
+
+# Marks the warmer's own requests, which must not start the refresher in the master process
+_WARMING_ENVIRON_KEY = 'app.cache_warming'
+
+
+def _filter_options():
+    from app.services.dashboard_service import DashboardService
+    DashboardService.filter_options.refresh()
+
+
+def _dashboard_stats():
+    from app.services.dashboard_service import DashboardService
+    DashboardService.stats.refresh()
+
+
+def _property_schemas():
+    from app import db
+    from app.models import ComponentType
+    from app.services.property_service import PropertyService
+    for component_type_id, in db.session.query(ComponentType.id):
+        PropertyService.get_property_form_config.refresh(component_type_id)
+
+
+def _index_pages(app):
+    # Rendering compiles the templates and fills everything the page reads from the cache
+    client = app.test_client()
+    for page in range(1, app.config.get('CACHE_WARM_INDEX_PAGES', 1) + 1):
+        response = client.get('/', query_string={'page': page}, environ_base={_WARMING_ENVIRON_KEY: True})
+        if response.status_code != 200:
+            raise RuntimeError(f'index page {page} returned {response.status_code}')
+
+# (name, task) in the order they run; the index pages run last and reuse what these stored
+WARM_TASKS = (
+    ('filter_options', _filter_options),
+    ('dashboard_stats', _dashboard_stats),
+    ('property_schemas', _property_schemas),
+)
+
+
+def warm_cache(app):
+    """
+    Fill the cache for the pages hit first after a restart
+
+    Every task runs in its own app context and a failing task is logged and skipped, so an
+    unreachable database never prevents the application from starting.
+
+    Returns:
+        dict: task name -> seconds taken, or the error message for tasks that failed
+    """
+    results = {}
+    tasks = list(WARM_TASKS) + [('index_pages', lambda: _index_pages(app))]
+    for name, task in tasks:
+        started = time.monotonic()
+        with app.app_context():
+            try:
+                task()
+                results[name] = round(time.monotonic() - started, 3)
+            except Exception as e:
+                from app import db
+                db.session.rollback()
+                app.logger.warning(f"Cache warming task {name} failed: {str(e)}")
+                results[name] = str(e)
+    app.logger.info(f"Cache warmed: {results}")
+    return results
+
+
+# ========================================
+# BACKGROUND REFRESH
+# ========================================
+
+class CacheRefresher:
+    """
+    Daemon thread keeping @cached aggregates fresh in the shared cache
+
+    Each job is a @cached function called without arguments. It is recomputed once
+    CACHE_REFRESH_AHEAD of its timeout has passed, and at the next check when its entry is
+    missing or was invalidated by a write. Only the worker holding the job's lease recomputes;
+    the others find the new entry in the shared tier.
+    """
+
+    def __init__(self, app, jobs):
+        self.app = app
+        self.jobs = list(jobs)
+        self.check_seconds = app.config.get('CACHE_REFRESH_CHECK_SECONDS', 5)
+        self.ahead = app.config.get('CACHE_REFRESH_AHEAD', 0.8)
+        self._refreshed_at = {}
+        self._stop = threading.Event()
+        self._thread = None
+        self._pid = None
+        self._lock = threading.Lock()
+
+    def _interval(self, job):
+        timeout = job.timeout if job.timeout is not None else self.app.config.get('CACHE_DEFAULT_TIMEOUT', 300)
+        return max(timeout * self.ahead, self.check_seconds)
+
+    def ensure_running(self):
+        # Started lazily so every forked worker runs its own thread
+        if self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._pid == os.getpid():
+                return
+            self._stop.clear()
+            self._refreshed_at = {}
+            self._thread = threading.Thread(target=self._run, name='cache-refresher', daemon=True)
+            self._thread.start()
+            self._pid = os.getpid()
+
+    def stop(self):
+        self._stop.set()
+
+    def _run(self):
+        while not self._stop.wait(self.check_seconds):
+            self.run_once()
+
+    def run_once(self):
+        """Refresh the jobs that are due or missing; returns the names refreshed by this worker"""
+        refreshed = []
+        with self.app.app_context():
+            cache = get_cache()
+            if cache is None:
+                return refreshed
+            for job in self.jobs:
+                try:
+                    if self._refresh_if_needed(cache, job):
+                        refreshed.append(job.key_prefix)
+                except Exception as e:
+                    from app import db
+                    db.session.rollback()
+                    self.app.logger.warning(f"Cache refresh of {job.key_prefix} failed: {str(e)}")
+        return refreshed
+
+    def _refresh_if_needed(self, cache, job):
+        interval = self._interval(job)
+        last = self._refreshed_at.get(job.key_prefix)
+        if last is None or time.monotonic() - last >= interval:
+            # Due: the first worker to take the lease refreshes, the others wait another interval
+            self._refreshed_at[job.key_prefix] = time.monotonic()
+            lease, lease_timeout = f'refresh:due:{job.key_prefix}', interval
+        elif not job.is_cached():
+            lease, lease_timeout = f'refresh:miss:{job.key_prefix}', self.check_seconds
+        else:
+            return False
+        if not cache.add(lease, os.getpid(), timeout=max(int(lease_timeout), 1)):
+            return False
+        job.refresh()
+        return True
+
+
+def refresh_jobs():
+    """The aggregates kept fresh in the background"""
+    from app.services.dashboard_service import DashboardService
+    return [DashboardService.filter_options, DashboardService.stats]
+
+
+def init_cache_warming(app):
+    """Add the warm-cache command and start the refresher in each worker on its first request"""
+
+    @app.cli.command('warm-cache')
+    def _warm_cache_command():
+        """Fill the cache for the pages hit first after a restart."""
+        with app.app_context():
+            if get_cache() is None:
+                click.echo('Caching is disabled; nothing to warm')
+                return
+        for name, result in warm_cache(app).items():
+            click.echo(f'{name}: {result}')
+
+    if app.testing:
+        return
+    with app.app_context():
+        if get_cache() is None:
+            return
+
+    if not app.config.get('CACHE_REFRESH_ENABLED'):
+        return
+    refresher = CacheRefresher(app, refresh_jobs())
+    app.cache_refresher = refresher
+
+    @app.before_request
+    def _start_cache_refresher():
+        if not request.environ.get(_WARMING_ENVIRON_KEY):
+            refresher.ensure_running()
@@ -0,0 +1,132 @@
+"""
+Response compression
+Text responses (HTML, JSON, CSV, JSON Lines, ...) above COMPRESS_MIN_SIZE are compressed with
+brotli when the package is installed and the client accepts it, otherwise with gzip. Streamed
+responses such as the JSON Lines export are compressed chunk by chunk as the generator yields,
+so large exports are never held in memory.
+
+Responses that already carry a Content-Encoding (the precompressed /assets files), files sent
+with send_file, partial and empty responses, and responses marked Cache-Control: no-transform
+are left alone.
+"""
+from flask import request
+import gzip
+import zlib
+
+try:
+    import brotli
+except ImportError:  # gzip only
+    brotli = None
+
+
+COMPRESSIBLE_MIMETYPES = frozenset((
+    'text/html',
+    'text/plain',
+    'text/css',
+    'text/csv',
+    'text/javascript',
+    'text/xml',
+    'application/javascript',
+    'application/json',
+    'application/x-ndjson',
+    'application/xml',
+    'image/svg+xml',
+))
+
+# zlib window bits for a gzip header and trailer
+_GZIP_WBITS = 16 + zlib.MAX_WBITS
+
+
+def _encodings():
+    # Content-Encoding values this process can produce, in order of preference
+    return ('br', 'gzip') if brotli is not None else ('gzip',)
+
+
+def negotiate_encoding(accept_encodings):
+    """The encoding to use for a request's Accept-Encoding header, or None for identity"""
+    return accept_encodings.best_match(_encodings())
+
+
+def compress(data, encoding, level=6, brotli_quality=4):
+    """Compress a whole body"""
+    if encoding == 'br':
+        return brotli.compress(data, quality=brotli_quality)
+    return gzip.compress(data, compresslevel=level)
+
+
+def compress_stream(chunks, encoding, level=6, brotli_quality=4):
+    """
+    Compress an iterable of body chunks lazily, yielding compressed output as the compressor
+    produces it
+    """
+    if encoding == 'br':
+        compressor = brotli.Compressor(quality=brotli_quality)
+        process, finish = compressor.process, compressor.finish
+    else:
+        compressor = zlib.compressobj(level, zlib.DEFLATED, _GZIP_WBITS)
+        process, finish = compressor.compress, compressor.flush
+
+    for chunk in chunks:
+        if isinstance(chunk, str):
+            chunk = chunk.encode('utf-8')
+        output = process(chunk)
+        if output:
+            yield output
+    yield finish()
+
+
+def _should_compress(response):
+    if response.status_code < 200 or response.status_code >= 300 or response.status_code in (204, 206):
+        return False
+    if response.direct_passthrough or 'Content-Encoding' in response.headers:
+        return False
+    if response.mimetype not in COMPRESSIBLE_MIMETYPES:
+        return False
+    return not response.cache_control.no_transform
+
+
+def compress_response(response, config):
+    """Compress a response in place when the request and the response allow it"""
+    if not _should_compress(response):
+        return response
+
+    level = config.get('COMPRESS_LEVEL', 6)
+    brotli_quality = config.get('COMPRESS_BROTLI_QUALITY', 4)
+
+    if response.is_streamed:
+        response.vary.add('Accept-Encoding')
+        encoding = negotiate_encoding(request.accept_encodings)
+        if encoding is None:
+            return response
+        source = response.response
+        response.response = compress_stream(source, encoding, level, brotli_quality)
+        # Closed with the response even if the client disconnects before the stream starts
+        if hasattr(source, 'close'):
+            response.call_on_close(source.close)
+        response.headers.pop('Content-Length', None)
+    else:
+        data = response.get_data()
+        if len(data) < config.get('COMPRESS_MIN_SIZE', 500):
+            return response
+        response.vary.add('Accept-Encoding')
+        encoding = negotiate_encoding(request.accept_encodings)
+        if encoding is None:
+            return response
+        response.set_data(compress(data, encoding, level, brotli_quality))
+
+    response.headers['Content-Encoding'] = encoding
+    # The compressed body differs byte for byte from the identity one
+    etag, weak = response.get_etag()
+    if etag and not weak:
+        response.set_etag(f'{etag}-{encoding}')
+    return response
+
+
+def init_compression(app):
+    """Compress text responses unless COMPRESS_ENABLED is off"""
+    if not app.config.get('COMPRESS_ENABLED', True):
+        return
+
+    @app.after_request
+    def _compress_response(response):
+        return compress_response(response, app.config)
@@ -49,76 +49,110 @@ def safe_delete(instance) -> bool:
         return False
 
 
-def safe_bulk_insert(model, data_list: List[Dict]) -> tuple:
+BULK_CHUNK_SIZE = 500
+
+
+def _apply_in_savepoints(items: List[Any], apply_chunk, describe_error, errors: List[str]) -> int:
     """
-    Safely bulk insert data.
-    Returns (success_count, error_count, errors) tuple.
+    Apply a chunk inside a SAVEPOINT. If it fails, roll back only the savepoint and
+    retry each half, so failing rows end up isolated without per-row commits.
+    Returns the number of items applied.
     """
-    success_count = 0
-    error_count = 0
+    if not items:
+        return 0
+    try:
+        with db.session.begin_nested():
+            apply_chunk(items)
+        return len(items)
+    except SQLAlchemyError as e:
+        if len(items) == 1:
+            errors.append(describe_error(items[0], e))
+            return 0
+        middle = len(items) // 2
+        return (_apply_in_savepoints(items[:middle], apply_chunk, describe_error, errors) +
+                _apply_in_savepoints(items[middle:], apply_chunk, describe_error, errors))
+
+
+def _run_bulk(items: List[Any], apply_chunk, describe_error, label: str, chunk_size: int) -> tuple:
+    """Run chunked savepoints in one transaction and commit once."""
     errors = []
+    success_count = 0
     
-    for data in data_list:
-        try:
-            instance = model(**data)
-            db.session.add(instance)
-            db.session.commit()
-            success_count += 1
-        except SQLAlchemyError as e:
-            db.session.rollback()
-            error_count += 1
-            errors.append(f"Error inserting {data}: {str(e)}")
-            current_app.logger.error(f"Bulk insert error: {str(e)}")
+    try:
+        for start in range(0, len(items), chunk_size):
+            success_count += _apply_in_savepoints(
+                items[start:start + chunk_size], apply_chunk, describe_error, errors
+            )
+        db.session.commit()
+    except SQLAlchemyError as e:
+        db.session.rollback()
+        current_app.logger.error(f"Bulk {label} commit error: {str(e)}")
+        errors.append(f"Bulk {label} failed, all changes rolled back: {str(e)}")
+        return 0, len(items), errors
     
-    return success_count, error_count, errors
+    for error in errors:
+        current_app.logger.error(f"Bulk {label} error: {error}")
+    
+    return success_count, len(items) - success_count, errors
 
 
-def safe_bulk_update(instances_data: List[tuple]) -> tuple:
+def safe_bulk_insert(model, data_list: List[Dict], chunk_size: int = BULK_CHUNK_SIZE) -> tuple:
+    """
+    Safely bulk insert data.
+    Rows are inserted with executemany in chunks inside one transaction; failing rows
+    are isolated by savepoint splitting and skipped.
+    Returns (success_count, error_count, errors) tuple.
+    """
+    def insert_chunk(chunk):
+        db.session.bulk_insert_mappings(model, chunk)
+        db.session.flush()
+    
+    return _run_bulk(
+        list(data_list), insert_chunk,
+        lambda data, e: f"Error inserting {data}: {str(e)}",
+        'insert', chunk_size
+    )
+
+
+def safe_bulk_update(instances_data: List[tuple], chunk_size: int = BULK_CHUNK_SIZE) -> tuple:
     """
     Safely bulk update instances.
     instances_data: List of (instance, update_data) tuples
+    Changes are flushed in chunks inside one transaction; failing rows are isolated
+    by savepoint splitting and left unchanged.
     Returns (success_count, error_count, errors) tuple.
     """
-    success_count = 0
-    error_count = 0
-    errors = []
-    
-    for instance, update_data in instances_data:
-        try:
+    def update_chunk(chunk):
+        # Re-applied on every attempt: a rolled-back savepoint expires the changes
+        for instance, update_data in chunk:
             for key, value in update_data.items():
                 setattr(instance, key, value)
-            db.session.commit()
-            success_count += 1
-        except SQLAlchemyError as e:
-            db.session.rollback()
-            error_count += 1
-            errors.append(f"Error updating {instance}: {str(e)}")
-            current_app.logger.error(f"Bulk update error: {str(e)}")
+        db.session.flush()
     
-    return success_count, error_count, errors
+    return _run_bulk(
+        list(instances_data), update_chunk,
+        lambda item, e: f"Error updating {item[0]}: {str(e)}",
+        'update', chunk_size
+    )
 
 
-def safe_bulk_delete(instances: List[Any]) -> tuple:
+def safe_bulk_delete(instances: List[Any], chunk_size: int = BULK_CHUNK_SIZE) -> tuple:
     """
     Safely bulk delete instances.
+    Deletes are flushed in chunks inside one transaction; failing rows are isolated
+    by savepoint splitting and kept.
     Returns (success_count, error_count, errors) tuple.
     """
-    success_count = 0
-    error_count = 0
-    errors = []
-    
-    for instance in instances:
-        try:
+    def delete_chunk(chunk):
+        for instance in chunk:
             db.session.delete(instance)
-            db.session.commit()
-            success_count += 1
-        except SQLAlchemyError as e:
-            db.session.rollback()
-            error_count += 1
-            errors.append(f"Error deleting {instance}: {str(e)}")
-            current_app.logger.error(f"Bulk delete error: {str(e)}")
+        db.session.flush()
     
-    return success_count, error_count, errors
+    return _run_bulk(
+        list(instances), delete_chunk,
+        lambda instance, e: f"Error deleting {instance}: {str(e)}",
+        'delete', chunk_size
+    )
 
 
 def paginate_query(query, page: int = 1, per_page: int = 20, error_out: bool = False):
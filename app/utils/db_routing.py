@@ -0,0 +1,128 @@
+"""
+Read-replica routing
+Plain SELECTs from GET-only endpoints and @read_only service methods go to the 'replica' bind
+when one is configured. Flushes, DML, SELECT ... FOR UPDATE and every read after the session
+has written stay on the primary, and a user who just committed a write is pinned to the primary
+for a few seconds so the redirect that follows sees it.
+"""
+from contextlib import contextmanager
+from flask import request, session as flask_session, has_request_context
+from flask_sqlalchemy import SQLAlchemy, SignallingSession, get_state
+from sqlalchemy import event, orm
+from sqlalchemy.sql.dml import UpdateBase
+from sqlalchemy.sql.selectable import Select, CompoundSelect
+import functools
+import time
+
+
+REPLICA_BIND = 'replica'
+READ_METHODS = frozenset(('GET', 'HEAD', 'OPTIONS'))
+
+_ROUTE_KEY = 'db_route_replica'
+_WROTE_KEY = 'db_wrote'
+_PIN_KEY = '_db_primary_until'
+
+
+def replica_configured(app):
+    return REPLICA_BIND in (app.config.get('SQLALCHEMY_BINDS') or {})
+
+
+def _primary_pinned():
+    return has_request_context() and flask_session.get(_PIN_KEY, 0) > time.time()
+
+
+class RoutingSession(SignallingSession):
+    """Session that sends eligible reads to the replica engine"""
+
+    def get_bind(self, mapper=None, clause=None, **kwargs):
+        if self.info.get(_ROUTE_KEY) and self._replica_allowed(clause):
+            return get_state(self.app).db.get_engine(self.app, bind=REPLICA_BIND)
+        if isinstance(clause, UpdateBase):
+            # Core INSERT/UPDATE/DELETE skip the flush; later reads must still see them
+            self.info[_WROTE_KEY] = True
+        return super().get_bind(mapper, clause)
+
+    def _replica_allowed(self, clause):
+        if self._flushing or self.info.get(_WROTE_KEY):
+            return False
+        if isinstance(clause, Select):
+            return clause._for_update_arg is None
+        return isinstance(clause, CompoundSelect)
+
+
+class RoutingSQLAlchemy(SQLAlchemy):
+    """Flask-SQLAlchemy extension using RoutingSession"""
+
+    def create_session(self, options):
+        return orm.sessionmaker(class_=RoutingSession, db=self, **options)
+
+
+@contextmanager
+def replica_reads():
+    """Route reads in this block to the replica (no-op without a replica or after a write)"""
+    from app import db
+    session = db.session()
+    if not replica_configured(session.app) or _primary_pinned():
+        yield
+        return
+    previous = session.info.get(_ROUTE_KEY, False)
+    session.info[_ROUTE_KEY] = True
+    try:
+        yield
+    finally:
+        session.info[_ROUTE_KEY] = previous
+
+
+def read_only(func):
+    """Decorator for service methods that only read and tolerate replica lag"""
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        with replica_reads():
+            return func(*args, **kwargs)
+    return wrapper
+
+
+def use_primary(view):
+    """Keep a GET-only view on the primary (e.g. it needs data newer than replica lag allows)"""
+    view._db_use_primary = True
+    return view
+
+
+def init_read_routing(app):
+    """Route GET-only endpoints to the replica when DATABASE_REPLICA_URL is configured"""
+    if not replica_configured(app):
+        return
+
+    @app.before_request
+    def _route_reads_to_replica():
+        # Endpoints that also accept writes (GET/POST forms) render data about to be edited
+        rule = request.url_rule
+        if request.method not in READ_METHODS or rule is None or not rule.methods <= READ_METHODS:
+            return
+        view = app.view_functions.get(request.endpoint)
+        if getattr(view, '_db_use_primary', False) or _primary_pinned():
+            return
+        from app import db
+        db.session.info[_ROUTE_KEY] = True
+
+
+# ========================================
+# SESSION HOOKS
+# ========================================
+
+@event.listens_for(RoutingSession, 'after_flush')
+def _mark_session_wrote(session, flush_context):
+    session.info[_WROTE_KEY] = True
+
+
+@event.listens_for(RoutingSession, 'do_orm_execute')
+def _mark_bulk_write(orm_execute_state):
+    if orm_execute_state.is_update or orm_execute_state.is_delete or orm_execute_state.is_insert:
+        orm_execute_state.session.info[_WROTE_KEY] = True
+
+
+@event.listens_for(RoutingSession, 'after_commit')
+def _pin_user_to_primary(session):
+    # Read-your-own-writes: the next requests from this user skip the replica until it catches up
+    if session.info.get(_WROTE_KEY) and has_request_context() and replica_configured(session.app):
+        flask_session[_PIN_KEY] = time.time() + session.app.config.get('REPLICA_STICKY_SECONDS', 10)
@@ -0,0 +1,113 @@
+"""
+Template fragment cache
+{% cache 'name', component, ... %}...{% endcache %} stores the rendered block under a key built
+from its arguments; model instances contribute their class, ID and updated_at, so an edited
+component gets a new key even before its old entries are invalidated. Each entry is also tagged
+with the component and the related rows it displays (supplier, type, keywords, brands,
+categories, variant colours), so variant and picture writes, which leave component.updated_at
+alone, drop it through the session hooks in app.utils.cache.
+
+Only cache blocks whose output depends on nothing but the arguments: never blocks rendering
+csrf_token(), flashed messages or other per-user state. Without a configured cache, or with
+FRAGMENT_CACHE_ENABLED off, blocks render every time; a failing cache is rendered through too.
+"""
+from flask import current_app
+from jinja2 import nodes
+from jinja2.ext import Extension
+from markupsafe import Markup
+from sqlalchemy import inspect
+from app.utils.cache import (
+    ALL_TAG, entity_tag, get_cache, stable_key, tag_tokens, cache_get, cache_set, log_cache_error
+)
+
+
+def _key_part(value):
+    if hasattr(value, '_sa_instance_state'):
+        updated_at = getattr(value, 'updated_at', None)
+        return (
+            type(value).__name__,
+            getattr(value, 'id', None),
+            updated_at.isoformat() if updated_at else None,
+            getattr(value, 'version', None),
+        )
+    return value
+
+
+def fragment_key(name, *parts):
+    """Cache key for a fragment; identical in every worker for the same arguments"""
+    return f'fragment:{name}:{stable_key(*[_key_part(part) for part in parts])}'
+
+
+def _loaded(obj, attribute):
+    # Tags come from relationships the page already loaded; never trigger a lazy load here
+    return attribute not in inspect(obj).unloaded
+
+
+def component_fragment_tags(component):
+    """Tags of a component and of the related rows its cards and detail sections display"""
+    tags = {entity_tag('component', component.id)}
+    if component.supplier_id:
+        tags.add(entity_tag('supplier', component.supplier_id))
+    if component.component_type_id:
+        tags.add(entity_tag('type', component.component_type_id))
+    if _loaded(component, 'keywords'):
+        tags |= {entity_tag('keyword', keyword.id) for keyword in component.keywords}
+    if _loaded(component, 'categories'):
+        tags |= {entity_tag('category', category.id) for category in component.categories}
+    if _loaded(component, 'brand_associations'):
+        tags |= {entity_tag('brand', association.brand_id) for association in component.brand_associations}
+    if _loaded(component, 'variants'):
+        tags |= {entity_tag('color', variant.color_id) for variant in component.variants if variant.color_id}
+    # Variant strips on the index are built by the view as dicts
+    for variant in getattr(component, '_cached_variants', None) or ():
+        if variant.get('color_id'):
+            tags.add(entity_tag('color', variant['color_id']))
+    return tags
+
+
+def fragment_tags(parts):
+    """Tags for the model instances among a fragment's key parts"""
+    from app.models import Component
+    tags = set()
+    for part in parts:
+        if isinstance(part, Component):
+            tags |= component_fragment_tags(part)
+    return tags
+
+
+class FragmentCacheExtension(Extension):
+    """Jinja extension adding {% cache 'name', arg, ... %}...{% endcache %}"""
+
+    tags = {'cache'}
+
+    def parse(self, parser):
+        lineno = next(parser.stream).lineno
+        parts = [parser.parse_expression()]
+        while parser.stream.skip_if('comma'):
+            parts.append(parser.parse_expression())
+        body = parser.parse_statements(['name:endcache'], drop_needle=True)
+        call = self.call_method('_render_cached', [nodes.List(parts)])
+        return nodes.CallBlock(call, [], [], body).set_lineno(lineno)
+
+    def _render_cached(self, parts, caller):
+        cache = get_cache()
+        if cache is None or not current_app.config.get('FRAGMENT_CACHE_ENABLED', True):
+            return caller()
+
+        key = fragment_key(*parts)
+        try:
+            html = cache_get(cache, key)
+            if html is not None:
+                return Markup(html)
+            # Tokens are read before rendering, so a write committed meanwhile invalidates the entry
+            tokens = tag_tokens(cache, fragment_tags(parts) | {ALL_TAG})
+        except Exception as e:
+            log_cache_error(e)
+            return caller()
+
+        html = caller()
+        try:
+            cache_set(cache, key, str(html), tokens, current_app.config.get('FRAGMENT_CACHE_TIMEOUT'))
+        except Exception as e:
+            log_cache_error(e)
+        return html
@@ -0,0 +1,187 @@
+"""
+In-memory keyword suggestion index
+Answers prefix and fuzzy keyword lookups without scanning the keyword table.
+Built once per process and kept current from committed keyword inserts, renames and deletes.
+"""
+from bisect import bisect_left
+from collections import Counter
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+import difflib
+import threading
+import time
+
+
+class KeywordIndex:
+    """Sorted name list for prefix lookups plus trigram postings for fuzzy lookups"""
+
+    GRAM_SIZE = 3
+    # Fuzzy candidates are ranked by shared trigrams; only the best ones get a full similarity check
+    MAX_FUZZY_CANDIDATES = 200
+
+    def __init__(self, keywords=()):
+        self._lock = threading.RLock()
+        self._names = {}          # keyword_id -> name
+        self._sorted = []         # sorted (name_lower, keyword_id)
+        self._postings = {}       # trigram -> set of keyword_ids
+        self.built_at = time.monotonic()
+        for keyword_id, name in keywords:
+            self._add(keyword_id, name)
+        self._sorted.sort()
+
+    def __len__(self):
+        return len(self._names)
+
+    @classmethod
+    def _grams(cls, text):
+        padded = f"  {text.lower()} "
+        return {padded[i:i + cls.GRAM_SIZE] for i in range(len(padded) - cls.GRAM_SIZE + 1)}
+
+    def _add(self, keyword_id, name):
+        self._names[keyword_id] = name
+        self._sorted.append((name.lower(), keyword_id))
+        for gram in self._grams(name):
+            self._postings.setdefault(gram, set()).add(keyword_id)
+
+    def _remove(self, keyword_id):
+        name = self._names.pop(keyword_id, None)
+        if name is None:
+            return
+        position = bisect_left(self._sorted, (name.lower(), keyword_id))
+        if position < len(self._sorted) and self._sorted[position] == (name.lower(), keyword_id):
+            del self._sorted[position]
+        for gram in self._grams(name):
+            ids = self._postings.get(gram)
+            if ids is not None:
+                ids.discard(keyword_id)
+                if not ids:
+                    del self._postings[gram]
+
+    def add(self, keyword_id, name):
+        """Insert or rename a keyword"""
+        with self._lock:
+            self._remove(keyword_id)
+            self._names[keyword_id] = name
+            entry = (name.lower(), keyword_id)
+            self._sorted.insert(bisect_left(self._sorted, entry), entry)
+            for gram in self._grams(name):
+                self._postings.setdefault(gram, set()).add(keyword_id)
+
+    def remove(self, keyword_id):
+        """Drop a deleted keyword"""
+        with self._lock:
+            self._remove(keyword_id)
+
+    def prefix(self, query, limit):
+        """Return up to limit (keyword_id, name) pairs whose name starts with query, in name order"""
+        query_lower = query.lower()
+        results = []
+        with self._lock:
+            position = bisect_left(self._sorted, (query_lower,))
+            while position < len(self._sorted) and len(results) < limit:
+                name_lower, keyword_id = self._sorted[position]
+                if not name_lower.startswith(query_lower):
+                    break
+                results.append((keyword_id, self._names[keyword_id]))
+                position += 1
+        return results
+
+    def fuzzy(self, query, threshold, exclude=()):
+        """
+        Return (keyword_id, name, similarity) for keywords at least threshold similar to query,
+        most similar first. Only keywords sharing trigrams with the query are compared.
+        """
+        query_lower = query.lower()
+        with self._lock:
+            shared = Counter()
+            for gram in self._grams(query):
+                for keyword_id in self._postings.get(gram, ()):
+                    shared[keyword_id] += 1
+            candidates = [
+                (keyword_id, self._names[keyword_id])
+                for keyword_id, _ in shared.most_common(self.MAX_FUZZY_CANDIDATES)
+                if keyword_id not in exclude
+            ]
+
+        matches = []
+        for keyword_id, name in candidates:
+            similarity = difflib.SequenceMatcher(None, query_lower, name.lower()).ratio()
+            if similarity > threshold:
+                matches.append((keyword_id, name, similarity))
+        matches.sort(key=lambda m: -m[2])
+        return matches
+
+
+# ========================================
+# PROCESS-WIDE INSTANCE
+# ========================================
+
+# Other workers' inserts reach this process only through a rebuild
+REBUILD_INTERVAL_SECONDS = 600
+
+_index = None
+_index_lock = threading.Lock()
+
+
+def get_keyword_index():
+    """Return this process's keyword index, building it on first use or when it is stale"""
+    global _index
+    index = _index
+    if index is None or time.monotonic() - index.built_at > REBUILD_INTERVAL_SECONDS:
+        with _index_lock:
+            if _index is None or time.monotonic() - _index.built_at > REBUILD_INTERVAL_SECONDS:
+                _index = _build_index()
+            index = _index
+    return index
+
+
+def reset_keyword_index():
+    """Discard the index so the next lookup rebuilds it"""
+    global _index
+    with _index_lock:
+        _index = None
+
+
+def _build_index():
+    from app import db
+    from app.models import Keyword
+    return KeywordIndex(db.session.query(Keyword.id, Keyword.name).all())
+
+
+# ========================================
+# SESSION HOOKS
+# ========================================
+
+_PENDING_KEY = 'keyword_index_pending'
+
+
+@event.listens_for(Session, 'after_flush')
+def _collect_keyword_changes(session, flush_context):
+    from app.models import Keyword
+    pending = session.info.setdefault(_PENDING_KEY, [])
+    for obj in session.new:
+        if isinstance(obj, Keyword):
+            pending.append(('add', obj.id, obj.name))
+    for obj in session.dirty:
+        if isinstance(obj, Keyword) and session.is_modified(obj, include_collections=False):
+            pending.append(('add', obj.id, obj.name))
+    for obj in session.deleted:
+        if isinstance(obj, Keyword):
+            pending.append(('remove', obj.id, None))
+
+
+@event.listens_for(Session, 'after_commit')
+def _apply_keyword_changes(session):
+    pending = session.info.pop(_PENDING_KEY, None)
+    if not pending or _index is None:
+        return
+    for action, keyword_id, name in pending:
+        if action == 'add':
+            _index.add(keyword_id, name)
+        else:
+            _index.remove(keyword_id)
+
+
+@event.listens_for(Session, 'after_rollback')
+def _discard_keyword_changes(session):
+    session.info.pop(_PENDING_KEY, None)
@@ -0,0 +1,83 @@
+"""
+Named eager-loading profiles for Component
+Relationships on Component load lazily by default, so a plain Component.query is already the
+"minimal" profile and suits status updates, duplicate checks and existence lookups. Callers that
+render related data pick the profile matching it instead of repeating loader options: pages over
+many rows take "listing", single-component views, forms and exports load their full graph in a
+fixed number of queries.
+"""
+from sqlalchemy.orm import joinedload, selectinload, lazyload
+from app.models import Component, ComponentVariant, ComponentBrand
+
+
+def _minimal():
+    # Only the component row, even if combined with options that would cascade further
+    return [lazyload('*')]
+
+
+def _listing():
+    # Grid/list items, search results: lookups joined, one selectin query per collection for the page
+    return [
+        joinedload(Component.component_type),
+        joinedload(Component.supplier),
+        selectinload(Component.pictures),
+        selectinload(Component.keywords),
+        selectinload(Component.categories),
+        selectinload(Component.brand_associations).joinedload(ComponentBrand.brand),
+    ]
+
+
+def _detail():
+    return [
+        joinedload(Component.component_type),
+        joinedload(Component.supplier),
+        selectinload(Component.pictures),
+        selectinload(Component.variants).joinedload(ComponentVariant.color),
+        selectinload(Component.variants).selectinload(ComponentVariant.variant_pictures),
+        selectinload(Component.keywords),
+        selectinload(Component.brand_associations).joinedload(ComponentBrand.brand),
+        selectinload(Component.categories),
+    ]
+
+
+def _edit():
+    # Edit, update, duplicate and delete touch every association the component owns
+    return _detail()
+
+
+def _export():
+    # Windows of many components: no per-variant picture loads, everything else selectin-loaded
+    return [
+        joinedload(Component.component_type),
+        joinedload(Component.supplier),
+        selectinload(Component.variants).joinedload(ComponentVariant.color),
+        selectinload(Component.pictures),
+        selectinload(Component.brand_associations).joinedload(ComponentBrand.brand),
+        selectinload(Component.categories),
+        selectinload(Component.keywords),
+    ]
+
+
+COMPONENT_PROFILES = {
+    'minimal': _minimal,
+    'listing': _listing,
+    'detail': _detail,
+    'edit': _edit,
+    'export': _export,
+}
+
+
+def component_profile(name):
+    """
+    Loader options for a named Component profile
+
+    Usage:
+        Component.query.options(*component_profile('detail')).get_or_404(id)
+
+    Raises:
+        ValueError: If the profile is unknown
+    """
+    try:
+        return COMPONENT_PROFILES[name]()
+    except KeyError:
+        raise ValueError(f"Unknown Component loading profile: {name}") from None
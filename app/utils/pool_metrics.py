@@ -0,0 +1,116 @@
+"""
+Connection pool instrumentation
+Times every pool checkout and tracks in-use and overflow connections, so worker counts
+can be sized against PostgreSQL max_connections.
+"""
+from collections import deque
+from sqlalchemy import exc
+from sqlalchemy.pool import QueuePool
+import threading
+import time
+
+
+class PoolMetrics:
+    """Checkout counters and a window of recent checkout latencies"""
+
+    LATENCY_WINDOW = 1000
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._latencies = deque(maxlen=self.LATENCY_WINDOW)
+        self.checkouts = 0
+        self.timeouts = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+        self.peak_in_use = 0
+        self.peak_overflow = 0
+
+    def record_checkout(self, wait_seconds, in_use, overflow):
+        with self._lock:
+            self.checkouts += 1
+            self.total_wait += wait_seconds
+            self.max_wait = max(self.max_wait, wait_seconds)
+            self.peak_in_use = max(self.peak_in_use, in_use)
+            self.peak_overflow = max(self.peak_overflow, overflow)
+            self._latencies.append(wait_seconds)
+
+    def record_timeout(self):
+        with self._lock:
+            self.timeouts += 1
+
+    def snapshot(self):
+        """Counters plus p50/p95/p99 over the recent window, latencies in milliseconds"""
+        with self._lock:
+            latencies = sorted(self._latencies)
+            checkouts, timeouts = self.checkouts, self.timeouts
+            total_wait, max_wait = self.total_wait, self.max_wait
+            peak_in_use, peak_overflow = self.peak_in_use, self.peak_overflow
+
+        def percentile(fraction):
+            if not latencies:
+                return 0.0
+            return round(latencies[min(int(len(latencies) * fraction), len(latencies) - 1)] * 1000, 3)
+
+        return {
+            'checkouts': checkouts,
+            'timeouts': timeouts,
+            'checkout_ms_avg': round(total_wait / checkouts * 1000, 3) if checkouts else 0.0,
+            'checkout_ms_max': round(max_wait * 1000, 3),
+            'checkout_ms_p50': percentile(0.50),
+            'checkout_ms_p95': percentile(0.95),
+            'checkout_ms_p99': percentile(0.99),
+            'peak_in_use': peak_in_use,
+            'peak_overflow': peak_overflow,
+        }
+
+
+class InstrumentedQueuePool(QueuePool):
+    """QueuePool that records how long each checkout waits, including pre-ping and connect time"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.metrics = PoolMetrics()
+
+    def connect(self):
+        started = time.perf_counter()
+        try:
+            connection = super().connect()
+        except exc.TimeoutError:
+            self.metrics.record_timeout()
+            raise
+        self.metrics.record_checkout(time.perf_counter() - started, self.checkedout(), max(self.overflow(), 0))
+        return connection
+
+    def recreate(self):
+        # Keep counting across pool recreation (e.g. after a disconnect)
+        pool = super().recreate()
+        pool.metrics = self.metrics
+        return pool
+
+
+def pool_status(engine):
+    """
+    Current pool state for one engine
+
+    Returns:
+        dict: configured size/overflow/timeout, live in-use/idle/overflow counts and,
+              for instrumented pools, checkout latency metrics
+    """
+    pool = engine.pool
+    status = {
+        'pool_class': type(pool).__name__,
+        'url': engine.url.render_as_string(hide_password=True),
+    }
+    if isinstance(pool, QueuePool):
+        status.update({
+            'pool_size': pool.size(),
+            'max_overflow': pool._max_overflow,
+            'timeout_seconds': pool.timeout(),
+            'in_use': pool.checkedout(),
+            'idle': pool.checkedin(),
+            'overflow': max(pool.overflow(), 0),
+            'max_connections': pool.size() + max(pool._max_overflow, 0),
+        })
+    if isinstance(pool, InstrumentedQueuePool):
+        status.update(pool.metrics.snapshot())
+    return status
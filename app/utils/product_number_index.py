@@ -0,0 +1,198 @@
+"""
+In-memory product-number index
+Answers "is this product number taken for this supplier?" for live form validation without a
+database round-trip. Misses are final; hits are confirmed against the database, so a stale entry
+can only cost a query, never a wrong "taken". Built once per process and kept current from
+committed component inserts, renames and deletes.
+"""
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session
+import threading
+import time
+
+
+class ProductNumberIndex:
+    """(supplier_id, product_number) -> IDs of the components holding that pair, plus known supplier IDs"""
+
+    def __init__(self, components=(), supplier_ids=()):
+        self._lock = threading.Lock()
+        self._holders = {}
+        self._supplier_ids = set(supplier_ids)
+        self.built_at = time.monotonic()
+        for component_id, supplier_id, product_number in components:
+            self._holders.setdefault((supplier_id, product_number), set()).add(component_id)
+
+    def __len__(self):
+        return len(self._holders)
+
+    def holders(self, supplier_id, product_number, exclude_id=None):
+        """IDs of components indexed under the pair, minus exclude_id"""
+        with self._lock:
+            ids = self._holders.get((supplier_id, product_number), ())
+            return {component_id for component_id in ids if component_id != exclude_id}
+
+    def has_supplier(self, supplier_id):
+        with self._lock:
+            return supplier_id in self._supplier_ids
+
+    def add(self, component_id, supplier_id, product_number):
+        with self._lock:
+            self._holders.setdefault((supplier_id, product_number), set()).add(component_id)
+
+    def remove(self, component_id, supplier_id, product_number):
+        with self._lock:
+            ids = self._holders.get((supplier_id, product_number))
+            if ids is not None:
+                ids.discard(component_id)
+                if not ids:
+                    del self._holders[(supplier_id, product_number)]
+
+    def add_supplier(self, supplier_id):
+        with self._lock:
+            self._supplier_ids.add(supplier_id)
+
+    def remove_supplier(self, supplier_id):
+        with self._lock:
+            self._supplier_ids.discard(supplier_id)
+
+
+# ========================================
+# PROCESS-WIDE INSTANCE
+# ========================================
+
+# Other workers' inserts reach this process only through a rebuild; until then a taken number
+# can be reported available, and the save itself still rejects the duplicate
+REBUILD_INTERVAL_SECONDS = 300
+
+_index = None
+_index_lock = threading.Lock()
+
+
+def get_product_number_index():
+    """Return this process's product-number index, building it on first use or when it is stale"""
+    global _index
+    index = _index
+    if index is None or time.monotonic() - index.built_at > REBUILD_INTERVAL_SECONDS:
+        with _index_lock:
+            if _index is None or time.monotonic() - _index.built_at > REBUILD_INTERVAL_SECONDS:
+                _index = _build_index()
+            index = _index
+    return index
+
+
+def reset_product_number_index():
+    """Discard the index so the next lookup rebuilds it"""
+    global _index
+    with _index_lock:
+        _index = None
+
+
+def _build_index():
+    from app import db
+    from app.models import Component, Supplier
+    return ProductNumberIndex(
+        db.session.query(Component.id, Component.supplier_id, Component.product_number).all(),
+        [supplier_id for supplier_id, in db.session.query(Supplier.id)]
+    )
+
+
+def find_duplicate(product_number, supplier_id, exclude_id=None):
+    """
+    Component already using product_number for supplier_id (None means no supplier), or None.
+    Only pairs the index reports as taken reach the database.
+    """
+    if not get_product_number_index().holders(supplier_id, product_number, exclude_id):
+        return None
+
+    from app.models import Component
+    query = Component.query.filter(
+        Component.product_number == product_number,
+        Component.supplier_id == supplier_id if supplier_id else Component.supplier_id.is_(None)
+    )
+    if exclude_id:
+        query = query.filter(Component.id != exclude_id)
+    return query.first()
+
+
+def supplier_exists(supplier_id):
+    """Known suppliers are answered from the index; unknown IDs are checked in the database"""
+    index = get_product_number_index()
+    if index.has_supplier(supplier_id):
+        return True
+
+    from app.models import Supplier
+    if Supplier.query.get(supplier_id) is None:
+        return False
+    index.add_supplier(supplier_id)
+    return True
+
+
+# ========================================
+# SESSION HOOKS
+# ========================================
+
+_PENDING_KEY = 'product_number_index_pending'
+_REBUILD_KEY = 'product_number_index_rebuild'
+
+
+def _previous(state, key):
+    history = state.attrs[key].history
+    return history.deleted[0] if history.deleted else state.attrs[key].value
+
+
+@event.listens_for(Session, 'after_flush')
+def _collect_component_changes(session, flush_context):
+    from app.models import Component, Supplier
+    pending = session.info.setdefault(_PENDING_KEY, [])
+    for obj in session.new:
+        if isinstance(obj, Component):
+            pending.append(('add', obj.id, obj.supplier_id, obj.product_number))
+        elif isinstance(obj, Supplier):
+            pending.append(('add_supplier', obj.id, None, None))
+    for obj in session.dirty:
+        if isinstance(obj, Component):
+            state = inspect(obj)
+            if state.attrs.product_number.history.has_changes() or state.attrs.supplier_id.history.has_changes():
+                pending.append(('remove', obj.id, _previous(state, 'supplier_id'), _previous(state, 'product_number')))
+                pending.append(('add', obj.id, obj.supplier_id, obj.product_number))
+    for obj in session.deleted:
+        if isinstance(obj, Component):
+            state = inspect(obj)
+            pending.append(('remove', obj.id, _previous(state, 'supplier_id'), _previous(state, 'product_number')))
+        elif isinstance(obj, Supplier):
+            pending.append(('remove_supplier', obj.id, None, None))
+
+
+@event.listens_for(Session, 'do_orm_execute')
+def _collect_bulk_component_changes(orm_execute_state):
+    # Query.update()/delete() and Core DML on these tables bypass the flush; rebuild after commit
+    if orm_execute_state.is_update or orm_execute_state.is_delete or orm_execute_state.is_insert:
+        table = getattr(orm_execute_state.statement, 'table', None)
+        if getattr(table, 'name', None) in ('component', 'supplier'):
+            orm_execute_state.session.info[_REBUILD_KEY] = True
+
+
+@event.listens_for(Session, 'after_commit')
+def _apply_component_changes(session):
+    pending = session.info.pop(_PENDING_KEY, None)
+    if session.info.pop(_REBUILD_KEY, False):
+        reset_product_number_index()
+        return
+    index = _index
+    if not pending or index is None:
+        return
+    for action, entity_id, supplier_id, product_number in pending:
+        if action == 'add':
+            index.add(entity_id, supplier_id, product_number)
+        elif action == 'remove':
+            index.remove(entity_id, supplier_id, product_number)
+        elif action == 'add_supplier':
+            index.add_supplier(entity_id)
+        else:
+            index.remove_supplier(entity_id)
+
+
+@event.listens_for(Session, 'after_rollback')
+def _discard_component_changes(session):
+    session.info.pop(_PENDING_KEY, None)
+    session.info.pop(_REBUILD_KEY, None)
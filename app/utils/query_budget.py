@@ -0,0 +1,138 @@
+"""
+Per-request query budget and N+1 detection for development and test
+Counts SQL statements per request, groups them by statement shape and warns (or raises, in
+tests) when an endpoint exceeds its declared budget or repeats one shape often enough to
+look like a query in a loop.
+"""
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from flask import g, request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+import re
+
+
+_active_trackers = ContextVar('query_trackers', default=())
+
+_PLACEHOLDER_LIST = re.compile(r'(?:%\(\w+\)s|\?)(?:\s*,\s*(?:%\(\w+\)s|\?))+')
+_PLACEHOLDER = re.compile(r'%\(\w+\)s')
+_NUMBER = re.compile(r'\b\d+\b')
+_WHITESPACE = re.compile(r'\s+')
+
+
+class QueryBudgetExceeded(Exception):
+    """Raised when QUERY_BUDGET_RAISE is set and an endpoint breaks its budget"""
+
+
+def statement_shape(statement):
+    """Normalize a statement so repeats differing only in parameters or IN-list length match"""
+    shape = _PLACEHOLDER_LIST.sub('?', statement)
+    shape = _PLACEHOLDER.sub('?', shape)
+    shape = _NUMBER.sub('N', shape)
+    return _WHITESPACE.sub(' ', shape).strip()
+
+
+class QueryTracker:
+    """Statements seen while the tracker was active"""
+
+    def __init__(self):
+        self.count = 0
+        self.shapes = Counter()
+
+    def record(self, statement):
+        self.count += 1
+        self.shapes[statement_shape(statement)] += 1
+
+    def repeated(self, threshold):
+        """(shape, count) pairs executed at least threshold times, most frequent first"""
+        return [(shape, count) for shape, count in self.shapes.most_common() if count >= threshold]
+
+
+def _record_statement(conn, cursor, statement, parameters, context, executemany):
+    for tracker in _active_trackers.get():
+        tracker.record(statement)
+
+
+def _ensure_listener():
+    if not event.contains(Engine, 'before_cursor_execute', _record_statement):
+        event.listen(Engine, 'before_cursor_execute', _record_statement)
+
+
+def _start_tracker():
+    _ensure_listener()
+    tracker = QueryTracker()
+    _active_trackers.set(_active_trackers.get() + (tracker,))
+    return tracker
+
+
+def _stop_tracker(tracker):
+    _active_trackers.set(tuple(t for t in _active_trackers.get() if t is not tracker))
+
+
+@contextmanager
+def count_queries():
+    """
+    Count statements executed in a block
+
+    Usage:
+        with count_queries() as queries:
+            ...
+        assert queries.count <= 3
+    """
+    tracker = _start_tracker()
+    try:
+        yield tracker
+    finally:
+        _stop_tracker(tracker)
+
+
+def query_budget(max_queries):
+    """Declare the most statements a view may execute per request"""
+    def decorator(view):
+        view._query_budget = max_queries
+        return view
+    return decorator
+
+
+def check_budget(tracker, budget, repeat_threshold):
+    """Human-readable budget violations for one tracker (empty when within budget)"""
+    problems = []
+    if tracker.count > budget:
+        problems.append(f'{tracker.count} queries (budget {budget})')
+    for shape, count in tracker.repeated(repeat_threshold):
+        problems.append(f'{count}x {shape[:200]}')
+    return problems
+
+
+def init_query_budget(app):
+    """Track statements per request when QUERY_BUDGET_ENABLED is set (development and test only)"""
+    if not app.config.get('QUERY_BUDGET_ENABLED'):
+        return
+
+    @app.before_request
+    def _start_request_tracker():
+        g._query_tracker = _start_tracker()
+
+    @app.after_request
+    def _check_request_budget(response):
+        tracker = g.get('_query_tracker')
+        if tracker is None:
+            return response
+        response.headers['X-Query-Count'] = str(tracker.count)
+
+        view = app.view_functions.get(request.endpoint)
+        budget = getattr(view, '_query_budget', app.config.get('QUERY_BUDGET_DEFAULT', 50))
+        problems = check_budget(tracker, budget, app.config.get('QUERY_REPEAT_THRESHOLD', 10))
+        if problems:
+            message = f"Query budget exceeded on {request.endpoint}: " + '; '.join(problems)
+            if app.config.get('QUERY_BUDGET_RAISE'):
+                raise QueryBudgetExceeded(message)
+            app.logger.warning(message)
+        return response
+
+    @app.teardown_request
+    def _stop_request_tracker(exc):
+        tracker = g.pop('_query_tracker', None)
+        if tracker is not None:
+            _stop_tracker(tracker)
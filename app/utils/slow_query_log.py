@@ -0,0 +1,243 @@
+"""
+Slow-query log
+Records statements slower than SLOW_QUERY_THRESHOLD_MS with their normalized shape, redacted
+parameters, duration and calling endpoint, plus an EXPLAIN plan above SLOW_QUERY_EXPLAIN_MS.
+Entries live in a bounded in-process ring buffer and, with SLOW_QUERY_PERSIST, in the
+slow_query_log table so offenders can be ranked across workers and restarts.
+"""
+from collections import deque
+from datetime import datetime
+from flask import has_request_context, request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from app.utils.query_budget import statement_shape
+import json
+import threading
+import time
+
+
+MAX_STATEMENT_LENGTH = 4000
+
+
+def redact_parameters(parameters):
+    """Keep numbers, booleans and NULLs (IDs, limits, flags); replace anything else with its type"""
+    if isinstance(parameters, dict):
+        return {key: redact_parameters(value) for key, value in parameters.items()}
+    if isinstance(parameters, (list, tuple)):
+        return [redact_parameters(value) for value in parameters]
+    if parameters is None or isinstance(parameters, (bool, int, float)):
+        return parameters
+    if isinstance(parameters, (str, bytes)):
+        return f'<{type(parameters).__name__}:{len(parameters)}>'
+    return f'<{type(parameters).__name__}>'
+
+
+class SlowQueryRecorder:
+    """Ring buffer of slow statements plus entries waiting to be written to the table"""
+
+    def __init__(self, threshold_ms=200, explain_ms=1000, buffer_size=500, persist=False):
+        self._lock = threading.Lock()
+        self._pending = []
+        self.configure(threshold_ms, explain_ms, buffer_size, persist)
+
+    def configure(self, threshold_ms, explain_ms, buffer_size, persist):
+        with self._lock:
+            self.threshold_ms = threshold_ms
+            self.explain_ms = explain_ms
+            self.persist = persist
+            self._entries = deque(getattr(self, '_entries', ()), maxlen=buffer_size)
+
+    def record(self, statement, parameters, duration_ms, plan=None):
+        entry = {
+            'recorded_at': datetime.utcnow(),
+            'duration_ms': round(duration_ms, 3),
+            'shape': statement_shape(statement),
+            'statement': statement[:MAX_STATEMENT_LENGTH],
+            'parameters': redact_parameters(parameters),
+            'endpoint': request.endpoint if has_request_context() else None,
+            'plan': plan,
+        }
+        with self._lock:
+            self._entries.append(entry)
+            if self.persist:
+                self._pending.append(entry)
+        return entry
+
+    def entries(self):
+        with self._lock:
+            return list(self._entries)
+
+    def take_pending(self):
+        with self._lock:
+            pending, self._pending = self._pending, []
+        return pending
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._pending = []
+
+    def top_offenders(self, limit=20):
+        """Shapes ranked by total time across the buffer"""
+        return rank_offenders(self.entries(), limit)
+
+
+def rank_offenders(entries, limit=20):
+    """Group entries by shape; each group keeps its slowest entry as the example (with plan, if any)"""
+    groups = {}
+    for entry in entries:
+        group = groups.setdefault(entry['shape'], {
+            'shape': entry['shape'], 'count': 0, 'total_ms': 0.0, 'max_ms': 0.0,
+            'endpoints': set(), 'example': entry
+        })
+        group['count'] += 1
+        group['total_ms'] += entry['duration_ms']
+        if entry['duration_ms'] >= group['max_ms']:
+            group['max_ms'] = entry['duration_ms']
+            group['example'] = entry
+        if entry['endpoint']:
+            group['endpoints'].add(entry['endpoint'])
+
+    ranked = sorted(groups.values(), key=lambda g: g['total_ms'], reverse=True)[:limit]
+    for group in ranked:
+        group['total_ms'] = round(group['total_ms'], 3)
+        group['avg_ms'] = round(group['total_ms'] / group['count'], 3)
+        group['endpoints'] = sorted(group['endpoints'])
+    return ranked
+
+
+slow_query_recorder = SlowQueryRecorder()
+
+
+def _explain(conn, statement, parameters):
+    """EXPLAIN (no ANALYZE) on a separate cursor, inside a savepoint so a failure cannot abort the caller"""
+    cursor = conn.connection.cursor()
+    try:
+        cursor.execute('SAVEPOINT slow_query_explain')
+        try:
+            cursor.execute(f'EXPLAIN (FORMAT JSON) {statement}', parameters)
+            plan = cursor.fetchone()[0]
+            cursor.execute('RELEASE SAVEPOINT slow_query_explain')
+        except Exception:
+            cursor.execute('ROLLBACK TO SAVEPOINT slow_query_explain')
+            return None
+        plan = json.loads(plan) if isinstance(plan, str) else plan
+        return plan[0]['Plan'] if plan else None
+    except Exception:
+        return None
+    finally:
+        cursor.close()
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if context is not None:
+        context._slow_query_started = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = getattr(context, '_slow_query_started', None)
+    if started is None:
+        return
+    duration_ms = (time.perf_counter() - started) * 1000
+    recorder = slow_query_recorder
+    if duration_ms < recorder.threshold_ms or 'slow_query_log' in statement:
+        return
+
+    plan = None
+    if (duration_ms >= recorder.explain_ms and not executemany
+            and conn.dialect.name == 'postgresql'
+            and statement.lstrip()[:6].upper() in ('SELECT', 'WITH')):
+        plan = _explain(conn, statement, parameters)
+    recorder.record(statement, parameters, duration_ms, plan)
+
+
+def _ensure_listeners():
+    if not event.contains(Engine, 'before_cursor_execute', _before_cursor_execute):
+        event.listen(Engine, 'before_cursor_execute', _before_cursor_execute)
+        event.listen(Engine, 'after_cursor_execute', _after_cursor_execute)
+
+
+def flush_pending(engine):
+    """Write buffered entries to slow_query_log on a connection of its own"""
+    pending = slow_query_recorder.take_pending()
+    if not pending:
+        return 0
+    from app.models import SlowQueryLog
+    with engine.begin() as connection:
+        connection.execute(SlowQueryLog.__table__.insert(), pending)
+    return len(pending)
+
+
+def persisted_offenders(hours=24, limit=20):
+    """Top shapes by total time from slow_query_log, in the same format as rank_offenders"""
+    from app import db
+    from app.models import SlowQueryLog
+    from sqlalchemy import func, distinct
+    from datetime import timedelta
+
+    since = datetime.utcnow() - timedelta(hours=hours)
+    total_ms = func.sum(SlowQueryLog.duration_ms)
+    totals = db.session.query(
+        SlowQueryLog.shape,
+        func.count(SlowQueryLog.id),
+        total_ms,
+        func.max(SlowQueryLog.duration_ms),
+        func.array_agg(distinct(SlowQueryLog.endpoint))
+    ).filter(
+        SlowQueryLog.recorded_at >= since
+    ).group_by(SlowQueryLog.shape).order_by(total_ms.desc()).limit(limit).all()
+    if not totals:
+        return []
+
+    # Slowest entry per shape, in one DISTINCT ON query
+    examples = {
+        row.shape: row for row in SlowQueryLog.query.filter(
+            SlowQueryLog.shape.in_([shape for shape, *_ in totals]),
+            SlowQueryLog.recorded_at >= since
+        ).distinct(SlowQueryLog.shape).order_by(SlowQueryLog.shape, SlowQueryLog.duration_ms.desc())
+    }
+
+    offenders = []
+    for shape, count, total, max_ms, endpoints in totals:
+        example = examples.get(shape)
+        offenders.append({
+            'shape': shape,
+            'count': count,
+            'total_ms': round(total, 3),
+            'avg_ms': round(total / count, 3),
+            'max_ms': round(max_ms, 3),
+            'endpoints': sorted(endpoint for endpoint in (endpoints or []) if endpoint),
+            'example': {
+                'recorded_at': example.recorded_at,
+                'duration_ms': example.duration_ms,
+                'shape': shape,
+                'statement': example.statement,
+                'parameters': example.parameters,
+                'endpoint': example.endpoint,
+                'plan': example.plan,
+            } if example else None
+        })
+    return offenders
+
+
+def init_slow_query_log(app):
+    """Record slow statements for every engine when SLOW_QUERY_ENABLED is set"""
+    if not app.config.get('SLOW_QUERY_ENABLED'):
+        return
+
+    slow_query_recorder.configure(
+        threshold_ms=app.config.get('SLOW_QUERY_THRESHOLD_MS', 200),
+        explain_ms=app.config.get('SLOW_QUERY_EXPLAIN_MS', 1000),
+        buffer_size=app.config.get('SLOW_QUERY_BUFFER_SIZE', 500),
+        persist=app.config.get('SLOW_QUERY_PERSIST', False)
+    )
+    _ensure_listeners()
+
+    if app.config.get('SLOW_QUERY_PERSIST'):
+        @app.teardown_request
+        def _flush_slow_queries(exc):
+            from app import db
+            try:
+                flush_pending(db.engine)
+            except Exception as e:
+                app.logger.warning(f"Could not persist slow queries: {str(e)}")
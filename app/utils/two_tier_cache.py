@@ -0,0 +1,439 @@
+"""
+Two-tier cache
+An in-process LRU in front of the shared backend (Redis in production): hits are served from
+worker memory without a network hop, misses fall through to the shared tier and are copied
+locally. Every write is broadcast so the other workers drop their local copy of the key within
+milliseconds; local copies also expire after CACHE_LOCAL_TIMEOUT seconds, which bounds
+staleness if a broadcast is missed. While the invalidation channel is down the local tier is
+bypassed entirely and the subscription is retried with backoff; it is cleared once the channel
+is back, since broadcasts may have been missed meanwhile.
+
+Selected through CACHE_CONFIG with CACHE_TYPE set to one of the factories at the bottom of
+this module. MemoryBackend and MemoryBroadcaster stand in for Redis in tests and single-process
+development.
+"""
+from collections import OrderedDict
+import json
+import logging
+import os
+import pickle
+import threading
+import time
+import uuid
+
+
+logger = logging.getLogger(__name__)
+
+
+class LocalLRU:
+    """Bounded in-process store of pickled values; least recently used entries go first"""
+
+    def __init__(self, max_entries=5000, max_bytes=64 * 1024 * 1024, timeout=30):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.timeout = timeout
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()  # key -> (expires_at, payload)
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key):
+        """(True, value) on a live hit, (False, None) otherwise"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] <= time.monotonic():
+                if entry is not None:
+                    self._discard(key)
+                self.misses += 1
+                return False, None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            payload = entry[1]
+        # Unpickled per hit, so callers can never mutate the stored copy
+        return True, pickle.loads(payload)
+
+    def set(self, key, value, timeout=None):
+        """Store a copy; timeout (0 = no shared expiry) is capped at the local timeout"""
+        payload = pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+        if len(payload) > self.max_bytes // 10:
+            # One oversized value would evict a large part of the cache; keep it shared-only
+            self.delete(key)
+            return
+        lifetime = min(timeout, self.timeout) if timeout else self.timeout
+        with self._lock:
+            self._discard(key)
+            self._entries[key] = (time.monotonic() + lifetime, payload)
+            self._bytes += len(payload)
+            while self._entries and (len(self._entries) > self.max_entries or self._bytes > self.max_bytes):
+                oldest = next(iter(self._entries))
+                self._discard(oldest)
+                self.evictions += 1
+
+    def delete(self, *keys):
+        with self._lock:
+            for key in keys:
+                self._discard(key)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def _discard(self, key):
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._bytes -= len(entry[1])
+
+    def stats(self):
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'bytes': self._bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+            }
+
+
+class TwoTierCache:
+    """Flask-Caching backend combining a LocalLRU with a shared backend and an invalidation broadcaster"""
+
+    def __init__(self, shared, local=None, broadcaster=None, default_timeout=300):
+        self.shared = shared
+        self.local = local or LocalLRU()
+        self.broadcaster = broadcaster
+        self.default_timeout = default_timeout
+        self._invalidations = 0
+        if broadcaster is not None:
+            broadcaster.subscribe(self._on_invalidate)
+
+    def _timeout(self, timeout):
+        return self.default_timeout if timeout is None else timeout
+
+    def _on_invalidate(self, keys):
+        # Another worker wrote these keys (None: cleared everything)
+        self._invalidations += 1
+        if keys is None:
+            self.local.clear()
+        else:
+            self.local.delete(*keys)
+
+    def _publish(self, keys):
+        if self.broadcaster is not None:
+            self.broadcaster.publish(keys)
+
+    def _listen(self):
+        # Local copies are only safe to serve while invalidations from other workers arrive
+        return self.broadcaster is None or self.broadcaster.ensure_listening()
+
+    # Reads
+
+    def get(self, key):
+        if not self._listen():
+            return self.shared.get(key)
+        found, value = self.local.get(key)
+        if found:
+            return value
+        invalidations = self._invalidations
+        value = self.shared.get(key)
+        # An invalidation received during the fetch may concern this value; keep it shared-only
+        if value is not None and invalidations == self._invalidations:
+            self.local.set(key, value)
+        return value
+
+    def get_many(self, *keys):
+        if not self._listen():
+            return self.shared.get_many(*keys)
+        values = {}
+        missing = []
+        for key in keys:
+            found, value = self.local.get(key)
+            if found:
+                values[key] = value
+            else:
+                missing.append(key)
+        if missing:
+            invalidations = self._invalidations
+            fetched = self.shared.get_many(*missing)
+            copy_locally = invalidations == self._invalidations
+            for key, value in zip(missing, fetched):
+                values[key] = value
+                if value is not None and copy_locally:
+                    self.local.set(key, value)
+        return [values[key] for key in keys]
+
+    def get_dict(self, *keys):
+        return dict(zip(keys, self.get_many(*keys)))
+
+    def has(self, key):
+        if self._listen() and self.local.get(key)[0]:
+            return True
+        return self.shared.has(key)
+
+    # Writes: shared tier first, then the local copy, then tell the other workers
+
+    def set(self, key, value, timeout=None):
+        timeout = self._timeout(timeout)
+        result = self.shared.set(key, value, timeout=timeout)
+        self.local.set(key, value, timeout)
+        self._publish([key])
+        return result
+
+    def add(self, key, value, timeout=None):
+        timeout = self._timeout(timeout)
+        added = self.shared.add(key, value, timeout=timeout)
+        if added:
+            self.local.set(key, value, timeout)
+            self._publish([key])
+        else:
+            self.local.delete(key)
+        return added
+
+    def set_many(self, mapping, timeout=None):
+        timeout = self._timeout(timeout)
+        result = self.shared.set_many(mapping, timeout=timeout)
+        for key, value in mapping.items():
+            self.local.set(key, value, timeout)
+        self._publish(list(mapping))
+        return result
+
+    def delete(self, key):
+        result = self.shared.delete(key)
+        self.local.delete(key)
+        self._publish([key])
+        return result
+
+    def delete_many(self, *keys):
+        result = self.shared.delete_many(*keys)
+        self.local.delete(*keys)
+        self._publish(list(keys))
+        return result
+
+    def clear(self):
+        result = self.shared.clear()
+        self.local.clear()
+        self._publish(None)
+        return result
+
+    def stats(self):
+        """Local tier counters (the shared tier reports its own)"""
+        return self.local.stats()
+
+
+# ========================================
+# IN-MEMORY STAND-INS
+# ========================================
+
+class MemoryBackend:
+    """Shared-tier stand-in: a thread-safe dictionary with expiry (timeout 0 = never)"""
+
+    def __init__(self, default_timeout=300):
+        self.default_timeout = default_timeout
+        self._lock = threading.Lock()
+        self._data = {}  # key -> (expires_at or None, value)
+
+    def _live(self, key):
+        entry = self._data.get(key)
+        if entry is None:
+            return None
+        if entry[0] is not None and entry[0] <= time.monotonic():
+            del self._data[key]
+            return None
+        return entry
+
+    def _expiry(self, timeout):
+        timeout = self.default_timeout if timeout is None else timeout
+        return time.monotonic() + timeout if timeout else None
+
+    def get(self, key):
+        with self._lock:
+            entry = self._live(key)
+            return entry[1] if entry else None
+
+    def get_many(self, *keys):
+        return [self.get(key) for key in keys]
+
+    def get_dict(self, *keys):
+        return dict(zip(keys, self.get_many(*keys)))
+
+    def has(self, key):
+        with self._lock:
+            return self._live(key) is not None
+
+    def set(self, key, value, timeout=None):
+        with self._lock:
+            self._data[key] = (self._expiry(timeout), value)
+        return True
+
+    def add(self, key, value, timeout=None):
+        with self._lock:
+            if self._live(key) is not None:
+                return False
+            self._data[key] = (self._expiry(timeout), value)
+        return True
+
+    def set_many(self, mapping, timeout=None):
+        for key, value in mapping.items():
+            self.set(key, value, timeout)
+        return list(mapping)
+
+    def delete(self, key):
+        with self._lock:
+            return self._data.pop(key, None) is not None
+
+    def delete_many(self, *keys):
+        return [key for key in keys if self.delete(key)]
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+        return True
+
+
+class MemoryBroadcaster:
+    """
+    In-process invalidation channel. Broadcasters created with the same hub list reach each other,
+    so several TwoTierCaches sharing one MemoryBackend behave like separate workers.
+    """
+
+    def __init__(self, hub=None):
+        self._hub = hub if hub is not None else []
+        self._hub.append(self)
+        self._callbacks = []
+
+    def subscribe(self, callback):
+        self._callbacks.append(callback)
+
+    def ensure_listening(self):
+        return True
+
+    def publish(self, keys):
+        # Like Redis pub/sub with origin filtering: everyone but the writer hears about it
+        for broadcaster in self._hub:
+            if broadcaster is not self:
+                for callback in broadcaster._callbacks:
+                    callback(keys)
+
+
+class RedisBroadcaster:
+    """
+    Redis pub/sub invalidation channel; messages from this process are ignored.
+    A failed subscribe is retried after retry_min seconds, doubling up to retry_max.
+    """
+
+    def __init__(self, client, channel, retry_min=1, retry_max=30):
+        self.client = client
+        self.channel = channel
+        self.retry_min = retry_min
+        self.retry_max = retry_max
+        self._token = uuid.uuid4().hex
+        self._callbacks = []
+        self._listener = None
+        self._listener_pid = None
+        self._retry_at = 0
+        self._retry_delay = retry_min
+        self._lock = threading.Lock()
+
+    def _origin(self):
+        # Workers forked from one master share _token; the PID tells them apart
+        return f'{self._token}:{os.getpid()}'
+
+    def subscribe(self, callback):
+        self._callbacks.append(callback)
+
+    def publish(self, keys):
+        self.ensure_listening()
+        self.client.publish(self.channel, json.dumps({'origin': self._origin(), 'keys': keys}))
+
+    def _listening(self):
+        return self._listener_pid == os.getpid() and self._listener.is_alive()
+
+    def ensure_listening(self):
+        """
+        Whether invalidations from other workers are arriving. Started lazily so every forked
+        worker gets its own listener thread; never raises, so a Redis outage only costs the
+        local tier until a retry succeeds.
+        """
+        if self._listening():
+            return True
+        if time.monotonic() < self._retry_at:
+            return False
+        with self._lock:
+            if self._listening():
+                return True
+            if time.monotonic() < self._retry_at:
+                return False
+            if self._listener is not None and self._listener_pid == os.getpid():
+                # The listener thread died with its connection; release the old subscription
+                try:
+                    self._listener.stop()
+                except Exception:
+                    pass
+            try:
+                pubsub = self.client.pubsub(ignore_subscribe_messages=True)
+                pubsub.subscribe(**{self.channel: self._on_message})
+                self._listener = pubsub.run_in_thread(sleep_time=0.01, daemon=True)
+            except Exception as e:
+                logger.warning(f"Cache invalidation channel unavailable, retrying in {self._retry_delay}s: {str(e)}")
+                self._retry_at = time.monotonic() + self._retry_delay
+                self._retry_delay = min(self._retry_delay * 2, self.retry_max)
+                return False
+            self._listener_pid = os.getpid()
+            self._retry_at = 0
+            self._retry_delay = self.retry_min
+        # Broadcasts sent before this subscription never reached the local tier
+        for callback in self._callbacks:
+            callback(None)
+        return True
+
+    def _on_message(self, message):
+        data = json.loads(message['data'])
+        if data.get('origin') == self._origin():
+            return
+        for callback in self._callbacks:
+            callback(data.get('keys'))
+
+
+# ========================================
+# FLASK-CACHING FACTORIES (CACHE_TYPE)
+# ========================================
+
+def _local_tier(config):
+    return LocalLRU(
+        max_entries=config.get('CACHE_LOCAL_MAX_ENTRIES', 5000),
+        max_bytes=config.get('CACHE_LOCAL_MAX_BYTES', 64 * 1024 * 1024),
+        timeout=config.get('CACHE_LOCAL_TIMEOUT', 30)
+    )
+
+
+def two_tier_redis(app, config, args, kwargs):
+    """CACHE_TYPE 'app.utils.two_tier_cache.two_tier_redis': local LRU over Redis with pub/sub invalidation"""
+    from flask_caching.backends.rediscache import RedisCache
+    import redis
+
+    shared = RedisCache.factory(app, config, args, kwargs)
+    if config.get('CACHE_REDIS_URL'):
+        client = redis.from_url(config['CACHE_REDIS_URL'])
+    else:
+        client = redis.Redis(
+            host=config.get('CACHE_REDIS_HOST', 'localhost'),
+            port=config.get('CACHE_REDIS_PORT', 6379),
+            db=config.get('CACHE_REDIS_DB', 0),
+            password=config.get('CACHE_REDIS_PASSWORD')
+        )
+    channel = config.get('CACHE_INVALIDATION_CHANNEL') or f"{config.get('CACHE_KEY_PREFIX', '')}invalidate"
+    return TwoTierCache(
+        shared, _local_tier(config), RedisBroadcaster(client, channel),
+        default_timeout=kwargs.get('default_timeout', 300)
+    )
+
+
+def two_tier_memory(app, config, args, kwargs):
+    """CACHE_TYPE 'app.utils.two_tier_cache.two_tier_memory': both tiers in process (one worker only)"""
+    default_timeout = kwargs.get('default_timeout', 300)
+    return TwoTierCache(MemoryBackend(default_timeout), _local_tier(config), default_timeout=default_timeout)
@@ -1,7 +1,11 @@
 """Admin utility routes for WebDAV management and system status."""
 
-from flask import Blueprint, jsonify, render_template_string, current_app
+from flask import Blueprint, jsonify, render_template_string, current_app, request, Response
+from app import db
 from app.utils.webdav_utils import get_webdav_status, log_webdav_status
+from app.utils.pool_metrics import pool_status
+from app.utils.slow_query_log import slow_query_recorder, persisted_offenders
+from sqlalchemy import text
 import os
 
 admin_web = Blueprint('admin_web', __name__, url_prefix='/admin')
@@ -172,4 +176,148 @@ def system_info():
     except:
         pass
     
-    return jsonify(info)
\ No newline at end of file
+    info['database_pool'] = _database_pool_info()
+    
+    return jsonify(info)
+
+
+def _database_pool_info():
+    """Pool state per engine plus the server's connection limit, for sizing workers"""
+    engines = {'default': db.engine}
+    for bind in current_app.config.get('SQLALCHEMY_BINDS') or {}:
+        engines[bind] = db.get_engine(bind=bind)
+    
+    pools = {name: pool_status(engine) for name, engine in engines.items()}
+    
+    try:
+        server_max_connections = int(db.session.execute(text('SHOW max_connections')).scalar())
+    except Exception as e:
+        current_app.logger.warning(f"Could not read max_connections: {str(e)}")
+        server_max_connections = None
+    
+    per_worker = sum(pool.get('max_connections', 0) for pool in pools.values())
+    return {
+        'pools': pools,
+        'server_max_connections': server_max_connections,
+        'connections_per_worker': per_worker,
+        'max_workers': server_max_connections // per_worker if server_max_connections and per_worker else None
+    }
+
+
+@admin_web.route('/metrics')
+def metrics():
+    """Connection pool and local cache tier metrics as JSON, or Prometheus text with ?format=prometheus."""
+    info = _database_pool_info()
+    info['cache_local'] = _local_cache_stats()
+    
+    if request.args.get('format') != 'prometheus':
+        return jsonify(info)
+    
+    lines = []
+    for bind, status in info['pools'].items():
+        for key, value in status.items():
+            if isinstance(value, (int, float)) and not isinstance(value, bool):
+                lines.append(f'db_pool_{key}{{bind="{bind}"}} {value}')
+    if info['server_max_connections'] is not None:
+        lines.append(f"db_server_max_connections {info['server_max_connections']}")
+    for key, value in (info['cache_local'] or {}).items():
+        lines.append(f'cache_local_{key} {value}')
+    return Response('\n'.join(lines) + '\n', mimetype='text/plain; version=0.0.4')
+
+
+def _local_cache_stats():
+    """This worker's in-process cache tier counters, when the two-tier backend is configured"""
+    cache = getattr(current_app, 'cache', None)
+    backend = getattr(cache, 'cache', None) if cache is not None else None
+    return backend.stats() if hasattr(backend, 'stats') else None
+
+
+def _slow_query_offenders():
+    """Top offenders from this worker's buffer, or from slow_query_log with ?source=table"""
+    limit = max(min(request.args.get('limit', 20, type=int), 100), 1)
+    if request.args.get('source') == 'table':
+        return 'table', persisted_offenders(request.args.get('hours', 24, type=int), limit)
+    return 'memory', slow_query_recorder.top_offenders(limit)
+
+
+@admin_web.route('/slow-queries')
+def slow_queries():
+    """Slowest statement shapes ranked by total time."""
+    source, offenders = _slow_query_offenders()
+    
+    html_template = """
+    <!DOCTYPE html>
+    <html>
+    <head>
+        <title>Slow Queries - Component Management</title>
+        <style>
+            body { font-family: Arial, sans-serif; margin: 2rem; }
+            table { border-collapse: collapse; width: 100%; }
+            th, td { border: 1px solid #dee2e6; padding: 0.5rem; text-align: left; vertical-align: top; }
+            th { background: #f8f9fa; }
+            .num { text-align: right; white-space: nowrap; }
+            .code { background: #f8f9fa; padding: 0.5rem; font-family: monospace; border-radius: 4px; white-space: pre-wrap; }
+            .info { padding: 1rem; margin: 1rem 0; border-radius: 4px; background: #d1ecf1; border: 1px solid #bee5eb; color: #0c5460; }
+            h1 { color: #333; }
+        </style>
+    </head>
+    <body>
+        <h1>Slow Queries</h1>
+        <div class="info">
+            Source: <strong>{{ source }}</strong>
+            {% if source == 'memory' %}(this worker's last {{ buffer_size }} slow statements; <a href="?source=table">all workers</a>)
+            {% else %}(slow_query_log; <a href="?">this worker only</a>){% endif %}
+            &middot; threshold {{ threshold_ms }} ms, plans captured above {{ explain_ms }} ms
+        </div>
+
+        {% if offenders %}
+        <table>
+            <tr>
+                <th>Statement shape</th><th class="num">Count</th><th class="num">Total ms</th>
+                <th class="num">Avg ms</th><th class="num">Max ms</th><th>Endpoints</th>
+            </tr>
+            {% for offender in offenders %}
+            <tr>
+                <td>
+                    <div class="code">{{ offender.shape }}</div>
+                    {% if offender.example %}
+                    <details>
+                        <summary>Slowest example ({{ offender.example.duration_ms }} ms)</summary>
+                        <div class="code">{{ offender.example.statement }}</div>
+                        <div class="code">Parameters: {{ offender.example.parameters | tojson }}</div>
+                        {% if offender.example.plan %}
+                        <div class="code">{{ offender.example.plan | tojson(indent=2) }}</div>
+                        {% endif %}
+                    </details>
+                    {% endif %}
+                </td>
+                <td class="num">{{ offender.count }}</td>
+                <td class="num">{{ offender.total_ms }}</td>
+                <td class="num">{{ offender.avg_ms }}</td>
+                <td class="num">{{ offender.max_ms }}</td>
+                <td>{{ offender.endpoints | join(', ') }}</td>
+            </tr>
+            {% endfor %}
+        </table>
+        {% else %}
+        <p>No slow queries recorded.</p>
+        {% endif %}
+    </body>
+    </html>
+    """
+    
+    return render_template_string(
+        html_template,
+        source=source,
+        offenders=offenders,
+        buffer_size=current_app.config.get('SLOW_QUERY_BUFFER_SIZE'),
+        threshold_ms=current_app.config.get('SLOW_QUERY_THRESHOLD_MS'),
+        explain_ms=current_app.config.get('SLOW_QUERY_EXPLAIN_MS')
+    )
+
+
+@admin_web.route('/slow-queries.json')
+def slow_queries_json():
+    """Slowest statement shapes as JSON."""
+    source, offenders = _slow_query_offenders()
+    return jsonify({'source': source, 'offenders': offenders})
@@ -1,6 +1,7 @@
 from flask import Blueprint, render_template, request, flash, redirect, url_for, current_app
 from app import db
 from app.models import Brand, Subbrand, Component
+from app.services.brand_service import BrandService
 from sqlalchemy import or_, func
 from datetime import datetime
 
@@ -15,61 +16,17 @@ def brands_list():
         sort_by = request.args.get('sort_by', 'name')
         sort_order = request.args.get('sort_order', 'asc')
 
-        # Base query
-        query = Brand.query
-
-        # Apply search filter
-        if search:
-            query = query.filter(Brand.name.ilike(f'%{search}%'))
-
-        # Apply sorting
-        if sort_by == 'name':
-            if sort_order == 'desc':
-                query = query.order_by(Brand.name.desc())
-            else:
-                query = query.order_by(Brand.name.asc())
-        elif sort_by == 'created_at':
-            if sort_order == 'desc':
-                query = query.order_by(Brand.created_at.desc())
-            else:
-                query = query.order_by(Brand.created_at.asc())
-        elif sort_by == 'components_count':
-            # Sort by number of components
-            query = query.outerjoin(Component.brands).group_by(Brand.id)
-            if sort_order == 'desc':
-                query = query.order_by(func.count(Component.id).desc())
-            else:
-                query = query.order_by(func.count(Component.id).asc())
-
-        # Get paginated results
+        # Get paginated results with counts from grouped queries (sortable in SQL)
         page = request.args.get('page', 1, type=int)
         per_page = request.args.get('per_page', 20, type=int)
-        brands = query.paginate(
+        brands = BrandService.get_brands_page(
+            search=search,
+            sort_by=sort_by,
+            sort_order=sort_order,
             page=page,
-            per_page=min(per_page, 100),
-            error_out=False
+            per_page=min(per_page, 100)
         )
-
-        # Prepare brands data with statistics
-        brands_data = []
-        for brand in brands.items:
-            brand_dict = {
-                'id': brand.id,
-                'name': brand.name,
-                'created_at': brand.created_at.isoformat() if brand.created_at else None,
-                'updated_at': brand.updated_at.isoformat() if brand.updated_at else None,
-                'subbrands_count': len(brand.subbrands),
-                'components_count': brand.get_components_count(),
-                'subbrands': [
-                    {
-                        'id': sb.id,
-                        'name': sb.name,
-                        'full_name': sb.get_full_name(),
-                        'created_at': sb.created_at.isoformat() if sb.created_at else None
-                    } for sb in brand.subbrands
-                ]
-            }
-            brands_data.append(brand_dict)
+        brands_data = brands['brands']
 
         return render_template('brands/brands_list.html',
                              brands=brands,
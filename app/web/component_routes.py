@@ -3,8 +3,13 @@ from werkzeug.utils import secure_filename
 from app import db, csrf
 from app.models import Component, ComponentType, Supplier, Category, Brand, ComponentBrand, Picture, ComponentVariant, Keyword, keyword_component, ComponentTypeProperty, Color
 from app.utils.file_handling import save_uploaded_file, allowed_file, delete_file, generate_picture_name
+from app.services.property_service import PropertyService
+from app.services.dashboard_service import DashboardService
+from app.utils.query_budget import query_budget
+from app.utils.loading_profiles import component_profile
+from app.utils.product_number_index import find_duplicate, supplier_exists
 from sqlalchemy import or_, and_, func, desc, asc
-from sqlalchemy.orm import joinedload, selectinload
+from sqlalchemy.orm import selectinload
 import os
 import uuid
 import time
@@ -540,6 +545,7 @@ def _get_form_context_data():
 
 @component_web.route('/')
 @component_web.route('/components')
+@query_budget(15)
 def index():
     """
     Main components listing with advanced pagination and filtering
@@ -579,11 +585,7 @@ def index():
         sort_order = request.args.get('sort_order', 'desc', type=str)
         
         # Build base query with optimized loading
-        query = Component.query.options(
-            joinedload(Component.component_type),
-            joinedload(Component.supplier),
-            selectinload(Component.keywords)
-        )
+        query = Component.query.options(*component_profile('listing'))
         
         # Apply filters
         filters = []
@@ -647,6 +649,13 @@ def index():
             date_threshold = datetime.now() - timedelta(days=recent)
             filters.append(Component.created_at >= date_threshold)
         
+        # Property filters (?prop.material=polyester) use JSONB containment
+        property_filters = PropertyService.parse_property_filters(request.args)
+        filters.extend(
+            PropertyService.component_property_filter(name, values)
+            for name, values in property_filters.items()
+        )
+        
         if filters:
             query = query.filter(and_(*filters))
         
@@ -727,16 +736,24 @@ def index():
                 ComponentVariant.id
             ).all()
 
+            # Variants without a primary picture fall back to their first picture, fetched in one query
+            fallback_urls = {}
+            missing_picture_ids = [row.id for row in variants_query if not row.picture_url]
+            if missing_picture_ids:
+                fallback_urls = dict(
+                    db.session.query(Picture.variant_id, Picture.url)
+                    .filter(Picture.variant_id.in_(missing_picture_ids))
+                    .distinct(Picture.variant_id)
+                    .order_by(Picture.variant_id, Picture.picture_order)
+                    .all()
+                )
+
             component_variants = {}
             for row in variants_query:
                 if row.component_id not in component_variants:
                     component_variants[row.component_id] = []
 
-                # If no primary picture, try to get any picture for this variant
-                picture_url = row.picture_url
-                if not picture_url:
-                    any_pic = Picture.query.filter_by(variant_id=row.id).first()
-                    picture_url = any_pic.url if any_pic else None
+                picture_url = row.picture_url or fallback_urls.get(row.id)
 
                 component_variants[row.component_id].append({
                     'id': row.id,
@@ -749,14 +766,9 @@ def index():
             for component in component_items:
                 component._cached_variants = component_variants.get(component.id, [])
 
-        # Get filter options
-        component_types = ComponentType.query.order_by(ComponentType.name).all()
-        suppliers = Supplier.query.order_by(Supplier.supplier_code).all()
-        brands = Brand.query.order_by(Brand.name).all()
-        categories = Category.query.order_by(Category.name).all()
-        
-        # Get brands count
-        brands_count = Brand.query.count()
+        # Get filter options and catalogue totals (cached until a related write commits)
+        filter_options = DashboardService.filter_options()
+        dashboard_stats = DashboardService.stats()
         
         # Prepare pagination info for template
         if pagination:
@@ -788,17 +800,19 @@ def index():
             'brand_ids': brand_ids,
             'status': status,
             'recent': recent,
+            'properties': property_filters,
             'sort_by': sort_by,
             'sort_order': sort_order
         }
         
         return render_template('index.html',
                              components=pagination,  # Always pass pagination object
-                             component_types=component_types,
-                             categories=categories,
-                             suppliers=suppliers,
-                             brands=brands,
-                             brands_count=brands_count,
+                             component_types=filter_options['component_types'],
+                             categories=filter_options['categories'],
+                             suppliers=filter_options['suppliers'],
+                             brands=filter_options['brands'],
+                             brands_count=dashboard_stats['total_brands'],
+                             dashboard_stats=dashboard_stats,
                              search=search,
                              pagination_info=pagination_info,
                              current_filters=current_filters)
@@ -821,12 +835,14 @@ def index():
                                  'brand_ids': [],
                                  'status': '',
                                  'recent': '',
+                                 'properties': {},
                                  'sort_by': 'created_at',
                                  'sort_order': 'desc'
                              })
 
 
 @component_web.route('/component/<int:id>')
+@query_budget(15)
 def component_detail(id):
     """
     Display detailed view of a single component
@@ -837,22 +853,7 @@ def component_detail(id):
         
         # Force fresh query to avoid any session caching issues
         # Using selectinload for better performance with multiple collections
-        component = Component.query.options(
-            joinedload(Component.component_type),
-            joinedload(Component.supplier),
-            selectinload(Component.pictures),
-            selectinload(Component.variants).joinedload(ComponentVariant.color),
-            selectinload(Component.variants).selectinload(ComponentVariant.variant_pictures),
-            selectinload(Component.keywords),
-            selectinload(Component.brand_associations).joinedload(ComponentBrand.brand),
-            selectinload(Component.categories)
-        ).get_or_404(id)
-        
-        # Explicitly refresh variant pictures to ensure they're loaded
-        for variant in component.variants:
-            db.session.refresh(variant)
-            for picture in variant.variant_pictures:
-                db.session.refresh(picture)
+        component = Component.query.options(*component_profile('detail')).get_or_404(id)
         
         # Get component type properties
         type_properties = []
@@ -1037,8 +1038,8 @@ def edit_component(id):
     """
     Edit an existing component
     """
-    # Simple component lookup for page rendering (data will be loaded via API)
-    component = Component.query.get_or_404(id)
+    # The POST path diffs and rewrites every association, so load the full graph up front
+    component = Component.query.options(*component_profile('edit')).get_or_404(id)
     
     if request.method == 'POST':
         try:
@@ -1319,34 +1320,20 @@ def validate_product_number():
         if len(product_number) < 2:
             return jsonify({'available': False, 'message': 'Product number must be at least 2 characters'})
         
-        # Build query to check for existing components
-        query = Component.query.filter_by(product_number=product_number)
-        
-        # If supplier is selected, check uniqueness within that supplier
-        if supplier_id:
-            # Validate supplier exists before using it in query
-            supplier = Supplier.query.get(supplier_id)
-            if not supplier:
-                return jsonify({'available': False, 'message': f'Supplier {supplier_id} not found'})
-            
-            query = query.filter_by(supplier_id=supplier_id)
-            supplier_name = supplier.supplier_code
-        else:
-            # If no supplier, check global uniqueness (supplier_id is NULL)
-            query = query.filter(Component.supplier_id.is_(None))
-            supplier_name = "components without supplier"
-        
-        # Exclude current component in edit mode
-        if component_id:
-            query = query.filter(Component.id != component_id)
+        # Runs on every keystroke: the in-memory index answers most calls without a query
+        if supplier_id and not supplier_exists(supplier_id):
+            return jsonify({'available': False, 'message': f'Supplier {supplier_id} not found'})
         
-        existing = query.first()
+        # Without a supplier, uniqueness is among components whose supplier_id is NULL;
+        # the current component is excluded in edit mode
+        existing = find_duplicate(product_number, supplier_id or None, exclude_id=component_id or None)
         
         if existing:
             if supplier_id:
+                supplier_name = existing.supplier.supplier_code
                 message = f'Product number "{product_number}" already exists for supplier "{supplier_name}"'
             else:
-                message = f'Product number "{product_number}" already exists for {supplier_name}'
+                message = f'Product number "{product_number}" already exists for components without supplier'
             
             return jsonify({'available': False, 'message': message})
         
@@ -6,6 +6,7 @@ from app.models import Supplier, Component
 from app.utils.response import WebResponse
 from app.utils.validators import validate_data, supplier_code_validator, description_validator
 from app.utils.database import safe_commit, safe_delete
+from app.services.supplier_service import SupplierService
 from flask import current_app
 
 supplier_bp = Blueprint('supplier', __name__, url_prefix='/supplier')
@@ -20,33 +21,21 @@ def suppliers():
         # Get sorting parameter
         sort_by = request.args.get('sort', 'code')
         
-        # Build query with sorting
-        query = Supplier.query
-        
-        if sort_by == 'name':
-            query = query.order_by(Supplier.supplier_code)
-        elif sort_by == 'components':
-            # Sort by component count (requires a subquery)
-            query = query.outerjoin(Component).group_by(Supplier.id).order_by(
-                db.func.count(Component.id).desc()
-            )
-        elif sort_by == 'created':
-            query = query.order_by(Supplier.created_at.desc())
-        else:  # default to code
-            query = query.order_by(Supplier.supplier_code)
-        
-        suppliers = query.all()
+        # Supplier aggregates in one grouped query; components are fetched on demand
+        suppliers = SupplierService.get_overview(sort_by)
         
         # Prepare suppliers data for JavaScript
         suppliers_data = []
         for supplier in suppliers:
             supplier_dict = {
-                'id': supplier.id,
-                'supplier_code': supplier.supplier_code,
-                'address': supplier.address,
-                'created_at': supplier.created_at.isoformat() if supplier.created_at else None,
-                'updated_at': supplier.updated_at.isoformat() if supplier.updated_at else None,
-                'components': [{'id': c.id, 'product_number': c.product_number} for c in supplier.components]
+                'id': supplier['id'],
+                'supplier_code': supplier['supplier_code'],
+                'address': supplier['address'],
+                'created_at': supplier['created_at'].isoformat() if supplier['created_at'] else None,
+                'updated_at': supplier['updated_at'].isoformat() if supplier['updated_at'] else None,
+                'component_count': supplier['component_count'],
+                'status_breakdown': supplier['status_breakdown'],
+                'last_activity': supplier['last_activity'].isoformat() if supplier['last_activity'] else None
             }
             suppliers_data.append(supplier_dict)
         
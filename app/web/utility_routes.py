@@ -1,12 +1,14 @@
-from flask import Blueprint, render_template, request, flash, redirect, url_for, current_app, send_file
+from flask import Blueprint, render_template, request, flash, redirect, url_for, current_app, send_file, jsonify
 from werkzeug.utils import secure_filename
 from werkzeug.exceptions import RequestEntityTooLarge
 from app import db
 from app.models import Component, ComponentType, Supplier, Category, Color, Brand, Picture
 from app.utils_legacy import process_csv_file
+from app.services.csv_service import CSVProcessingService
 import os
 import io
 import csv
+import tempfile
 from datetime import datetime
 
 utility_web = Blueprint('utility_web', __name__)
@@ -80,6 +82,35 @@ def upload():
     return render_template('upload.html')
 
 
+@utility_web.route('/upload/preview', methods=['POST'])
+def upload_preview():
+    """
+    Dry-run a CSV import and return what it would create, update or delete
+    """
+    file = request.files.get('file')
+    if not file or file.filename == '':
+        return jsonify({'success': False, 'error': 'No file selected'}), 400
+
+    if not allowed_file(file.filename) or not file.filename.lower().endswith('.csv'):
+        return jsonify({'success': False, 'error': 'Dry run supports CSV files only'}), 400
+
+    sample_size = min(request.args.get('sample_size', 10, type=int), 100)
+    temp_file = tempfile.NamedTemporaryFile(delete=False, suffix='.csv')
+    try:
+        file.save(temp_file.name)
+        temp_file.close()
+        preview = CSVProcessingService.preview_csv_import(temp_file.name, sample_size=sample_size)
+        return jsonify({'success': not preview['errors'], **preview})
+    except Exception as e:
+        current_app.logger.error(f"CSV dry run error: {str(e)}")
+        return jsonify({'success': False, 'error': f'Error previewing file: {str(e)}'}), 500
+    finally:
+        try:
+            os.unlink(temp_file.name)
+        except OSError:
+            pass
+
+
 @utility_web.route('/download/csv-template')
 def download_csv_template():
     """
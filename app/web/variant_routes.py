@@ -2,6 +2,7 @@ from flask import Blueprint, render_template, request, flash, redirect, url_for,
 from app import db
 from app.models import Component, ComponentVariant, Color, Picture
 from app.utils.file_handling import save_uploaded_file, allowed_file
+from app.utils.loading_profiles import component_profile
 from sqlalchemy import func
 import os
 import uuid
@@ -21,7 +22,7 @@ def new_variant(id):
     """
     Create a new variant for a component
     """
-    component = Component.query.get_or_404(id)
+    component = Component.query.options(*component_profile('edit')).get_or_404(id)
     
     if request.method == 'POST':
         try:
@@ -106,7 +107,7 @@ def edit_variant(component_id, variant_id):
     """
     Edit an existing variant
     """
-    component = Component.query.get_or_404(component_id)
+    component = Component.query.options(*component_profile('edit')).get_or_404(component_id)
     variant = ComponentVariant.query.filter_by(
         id=variant_id,
         component_id=component_id
@@ -7,6 +7,66 @@ class Config:
     SQLALCHEMY_SCHEMA = 'component_app'  # Specify the schema to use
     SQLALCHEMY_TRACK_MODIFICATIONS = False
     
+    # Optional read replica: GET-only endpoints and read-only service methods read from it
+    DATABASE_REPLICA_URL = os.environ.get('DATABASE_REPLICA_URL')
+    SQLALCHEMY_BINDS = {'replica': DATABASE_REPLICA_URL} if DATABASE_REPLICA_URL else {}
+    REPLICA_STICKY_SECONDS = int(os.environ.get('REPLICA_STICKY_SECONDS', 10))  # Primary-only window after a user's write
+    
+    # Connection pool, per worker process: size workers so that
+    # workers * (DB_POOL_SIZE + DB_MAX_OVERFLOW) stays below PostgreSQL max_connections
+    DB_POOL_SIZE = int(os.environ.get('DB_POOL_SIZE', 10))
+    DB_MAX_OVERFLOW = int(os.environ.get('DB_MAX_OVERFLOW', 10))
+    DB_POOL_TIMEOUT = int(os.environ.get('DB_POOL_TIMEOUT', 30))  # Seconds to wait for a free connection
+    DB_POOL_RECYCLE = int(os.environ.get('DB_POOL_RECYCLE', 1800))  # Seconds before a connection is replaced
+    DB_POOL_PRE_PING = os.environ.get('DB_POOL_PRE_PING', 'true').lower() == 'true'
+    DB_STATEMENT_TIMEOUT_MS = int(os.environ.get('DB_STATEMENT_TIMEOUT_MS', 30000))  # 0 disables
+    DB_POOL_METRICS = os.environ.get('DB_POOL_METRICS', 'true').lower() == 'true'
+    
+    SQLALCHEMY_ENGINE_OPTIONS = {
+        'pool_size': DB_POOL_SIZE,
+        'max_overflow': DB_MAX_OVERFLOW,
+        'pool_timeout': DB_POOL_TIMEOUT,
+        'pool_recycle': DB_POOL_RECYCLE,
+        'pool_pre_ping': DB_POOL_PRE_PING,
+        'connect_args': {'options': f'-c statement_timeout={DB_STATEMENT_TIMEOUT_MS}'}
+                        if DB_STATEMENT_TIMEOUT_MS else {},
+    }
+    
+    # Development/test instrumentation: per-request query budget and N+1 detection
+    QUERY_BUDGET_ENABLED = os.environ.get('QUERY_BUDGET_ENABLED', 'false').lower() == 'true'
+    QUERY_BUDGET_DEFAULT = int(os.environ.get('QUERY_BUDGET_DEFAULT', 50))  # For views without @query_budget
+    QUERY_REPEAT_THRESHOLD = int(os.environ.get('QUERY_REPEAT_THRESHOLD', 10))  # Same statement shape this often = N+1
+    QUERY_BUDGET_RAISE = False  # Log a warning; tests raise instead
+    
+    # Slow-query log: statements over the threshold are kept in memory (and optionally in slow_query_log)
+    SLOW_QUERY_ENABLED = os.environ.get('SLOW_QUERY_ENABLED', 'true').lower() == 'true'
+    SLOW_QUERY_THRESHOLD_MS = int(os.environ.get('SLOW_QUERY_THRESHOLD_MS', 200))
+    SLOW_QUERY_EXPLAIN_MS = int(os.environ.get('SLOW_QUERY_EXPLAIN_MS', 1000))  # Also capture an EXPLAIN plan
+    SLOW_QUERY_BUFFER_SIZE = int(os.environ.get('SLOW_QUERY_BUFFER_SIZE', 500))
+    SLOW_QUERY_PERSIST = os.environ.get('SLOW_QUERY_PERSIST', 'false').lower() == 'true'
+    
+    # `flask warm-cache` (run by docker/app/init.sh unless CACHE_WARM_ON_STARTUP=false) and
+    # background refresh of dashboard aggregates (not for test apps)
+    CACHE_WARM_INDEX_PAGES = int(os.environ.get('CACHE_WARM_INDEX_PAGES', 1))  # First index pages rendered once
+    CACHE_REFRESH_ENABLED = os.environ.get('CACHE_REFRESH_ENABLED', 'true').lower() == 'true'
+    CACHE_REFRESH_CHECK_SECONDS = int(os.environ.get('CACHE_REFRESH_CHECK_SECONDS', 5))
+    CACHE_REFRESH_AHEAD = float(os.environ.get('CACHE_REFRESH_AHEAD', 0.8))  # Refresh at this fraction of the timeout
+    
+    # {% cache %} template fragments (component cards, detail sections); invalidated by tag on writes
+    FRAGMENT_CACHE_ENABLED = os.environ.get('FRAGMENT_CACHE_ENABLED', 'true').lower() == 'true'
+    FRAGMENT_CACHE_TIMEOUT = int(os.environ.get('FRAGMENT_CACHE_TIMEOUT', 3600))
+    
+    # Content-hashed JS/CSS served with immutable cache headers (plain files with ?v=mtime in development)
+    ASSETS_FINGERPRINT = os.environ.get('ASSETS_FINGERPRINT', str(os.environ.get('FLASK_ENV') != 'development')).lower() == 'true'
+    ASSETS_OUTPUT_FOLDER = os.path.join(os.path.dirname(__file__), 'app/static/dist')
+    ASSETS_URL_PREFIX = '/assets'
+    
+    # gzip/brotli compression of text responses (streamed exports are compressed on the fly)
+    COMPRESS_ENABLED = os.environ.get('COMPRESS_ENABLED', 'true').lower() == 'true'
+    COMPRESS_MIN_SIZE = int(os.environ.get('COMPRESS_MIN_SIZE', 500))  # Smaller bodies are sent as they are
+    COMPRESS_LEVEL = int(os.environ.get('COMPRESS_LEVEL', 6))  # gzip 1-9
+    COMPRESS_BROTLI_QUALITY = int(os.environ.get('COMPRESS_BROTLI_QUALITY', 4))  # brotli 0-11
+    
     # WebDAV configuration - no local file system mounting needed
     WEBDAV_BASE_URL = 'http://31.182.67.115/webdav/components'  # Direct WebDAV URL
     MAX_CONTENT_LENGTH = 16 * 1024 * 1024  # 16MB max upload size
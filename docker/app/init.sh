@@ -14,6 +14,12 @@ export FLASK_APP=run.py
 # Do not run migrations automatically to avoid permission issues
 # Instead, we'll need to run them manually as a superuser
 
+# Fill the shared cache before the first requests; a failure must not block startup
+if [ "${CACHE_WARM_ON_STARTUP:-true}" = "true" ]; then
+  echo "Warming cache..."
+  flask warm-cache || echo "Cache warming failed, starting anyway"
+fi
+
 # Start the application
 echo "Starting Flask application..."
 exec "$@"
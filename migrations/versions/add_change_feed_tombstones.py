@@ -0,0 +1,118 @@
+"""Add change feed support: picture.updated_at, tombstones and changed-since indexes
+
+Revision ID: add_change_feed_001
+Revises: category_many_to_many
+Create Date: 2025-07-20 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'add_change_feed_001'
+down_revision = 'category_many_to_many'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    """
+    Track changes so downstream systems can sync incrementally.
+    Updates are found through updated_at, deletes through the change_tombstone table.
+    """
+
+    # Step 1: Pictures had no updated_at; backfill it from created_at
+    op.add_column('picture', sa.Column('updated_at', sa.DateTime(), nullable=True), schema='component_app')
+    op.execute("UPDATE component_app.picture SET updated_at = created_at;")
+    op.execute("UPDATE component_app.component SET updated_at = created_at WHERE updated_at IS NULL;")
+    op.execute("UPDATE component_app.component_variant SET updated_at = created_at WHERE updated_at IS NULL;")
+
+    # Step 2: Picture names are rewritten by triggers, so stamp updated_at in the database too
+    op.execute("""
+        CREATE OR REPLACE FUNCTION component_app.touch_picture_updated_at() RETURNS TRIGGER AS $trigger$
+        BEGIN
+            NEW.updated_at := (now() AT TIME ZONE 'utc');
+            RETURN NEW;
+        END;
+        $trigger$ LANGUAGE plpgsql;
+    """)
+    op.execute("""
+        CREATE TRIGGER trigger_touch_picture_updated_at
+            BEFORE UPDATE ON component_app.picture
+            FOR EACH ROW
+            EXECUTE FUNCTION component_app.touch_picture_updated_at();
+    """)
+
+    # Step 3: Tombstone table for deletes
+    op.create_table('change_tombstone',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('entity_type', sa.String(length=20), nullable=False),
+        sa.Column('entity_id', sa.Integer(), nullable=False),
+        sa.Column('component_id', sa.Integer(), nullable=True),
+        sa.Column('deleted_at', sa.DateTime(), nullable=False,
+                  server_default=sa.text("(now() AT TIME ZONE 'utc')")),
+        sa.PrimaryKeyConstraint('id'),
+        schema='component_app'
+    )
+    op.create_index('ix_change_tombstone_deleted_at_id', 'change_tombstone',
+                    ['deleted_at', 'id'], schema='component_app')
+
+    # Step 4: Record a tombstone for every deleted row, including cascaded deletes
+    op.execute("""
+        CREATE OR REPLACE FUNCTION component_app.record_change_tombstone() RETURNS TRIGGER AS $trigger$
+        BEGIN
+            IF TG_ARGV[0] = 'component' THEN
+                INSERT INTO component_app.change_tombstone (entity_type, entity_id, component_id)
+                VALUES ('component', OLD.id, OLD.id);
+            ELSE
+                INSERT INTO component_app.change_tombstone (entity_type, entity_id, component_id)
+                VALUES (TG_ARGV[0], OLD.id, OLD.component_id);
+            END IF;
+            RETURN OLD;
+        END;
+        $trigger$ LANGUAGE plpgsql;
+    """)
+    op.execute("""
+        CREATE TRIGGER trigger_tombstone_component
+            AFTER DELETE ON component_app.component
+            FOR EACH ROW
+            EXECUTE FUNCTION component_app.record_change_tombstone('component');
+    """)
+    op.execute("""
+        CREATE TRIGGER trigger_tombstone_component_variant
+            AFTER DELETE ON component_app.component_variant
+            FOR EACH ROW
+            EXECUTE FUNCTION component_app.record_change_tombstone('variant');
+    """)
+    op.execute("""
+        CREATE TRIGGER trigger_tombstone_picture
+            AFTER DELETE ON component_app.picture
+            FOR EACH ROW
+            EXECUTE FUNCTION component_app.record_change_tombstone('picture');
+    """)
+
+    # Step 5: Keyset indexes so "changed since" scans only touch changed rows
+    op.create_index('ix_component_updated_at_id', 'component', ['updated_at', 'id'], schema='component_app')
+    op.create_index('ix_component_variant_updated_at_id', 'component_variant', ['updated_at', 'id'], schema='component_app')
+    op.create_index('ix_picture_updated_at_id', 'picture', ['updated_at', 'id'], schema='component_app')
+
+
+def downgrade():
+    """Remove change feed support"""
+
+    op.drop_index('ix_picture_updated_at_id', table_name='picture', schema='component_app')
+    op.drop_index('ix_component_variant_updated_at_id', table_name='component_variant', schema='component_app')
+    op.drop_index('ix_component_updated_at_id', table_name='component', schema='component_app')
+
+    op.execute("DROP TRIGGER IF EXISTS trigger_tombstone_picture ON component_app.picture;")
+    op.execute("DROP TRIGGER IF EXISTS trigger_tombstone_component_variant ON component_app.component_variant;")
+    op.execute("DROP TRIGGER IF EXISTS trigger_tombstone_component ON component_app.component;")
+    op.execute("DROP FUNCTION IF EXISTS component_app.record_change_tombstone();")
+
+    op.drop_index('ix_change_tombstone_deleted_at_id', table_name='change_tombstone', schema='component_app')
+    op.drop_table('change_tombstone', schema='component_app')
+
+    op.execute("DROP TRIGGER IF EXISTS trigger_touch_picture_updated_at ON component_app.picture;")
+    op.execute("DROP FUNCTION IF EXISTS component_app.touch_picture_updated_at();")
+    op.drop_column('picture', 'updated_at', schema='component_app')
@@ -0,0 +1,84 @@
+"""Add secondary indexes for listing, detail, delete and export hot paths
+
+Revision ID: add_hot_path_indexes_001
+Revises: add_keyword_usage_count_001
+Create Date: 2025-07-22 09:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'add_hot_path_indexes_001'
+down_revision = 'add_keyword_usage_count_001'
+branch_labels = None
+depends_on = None
+
+
+APPROVED = "proto_status = 'ok' AND sms_status = 'ok' AND pps_status = 'ok'"
+PENDING = "proto_status = 'pending' OR sms_status = 'pending' OR pps_status = 'pending'"
+REJECTED = "proto_status = 'not_ok' OR sms_status = 'not_ok' OR pps_status = 'not_ok'"
+
+
+def upgrade():
+    """
+    Index the foreign keys and sort columns the application filters on.
+    Unique constraints already lead with component_variant.component_id, picture.variant_id,
+    keyword_component.component_id and component_brand.component_id, so only the reverse
+    directions of the link tables need new indexes.
+    """
+
+    # Step 1: Component listing - default sort, supplier/type filters and the supplier components page
+    op.create_index('ix_component_created_at_id', 'component',
+                    [sa.text('created_at DESC'), sa.text('id DESC')], schema='component_app')
+    op.create_index('ix_component_supplier_id_created_at', 'component',
+                    ['supplier_id', sa.text('created_at DESC')], schema='component_app')
+    op.create_index('ix_component_component_type_id', 'component',
+                    ['component_type_id'], schema='component_app')
+
+    # Step 2: Status filters match these predicates exactly, so the partial indexes stay small
+    op.create_index('ix_component_approved_created_at', 'component', [sa.text('created_at DESC')],
+                    schema='component_app', postgresql_where=sa.text(APPROVED))
+    op.create_index('ix_component_pending_created_at', 'component', [sa.text('created_at DESC')],
+                    schema='component_app', postgresql_where=sa.text(PENDING))
+    op.create_index('ix_component_rejected_created_at', 'component', [sa.text('created_at DESC')],
+                    schema='component_app', postgresql_where=sa.text(REJECTED))
+
+    # Step 3: Detail, delete and export read pictures and variants per component
+    op.create_index('ix_picture_component_id_order', 'picture',
+                    ['component_id', 'picture_order'], schema='component_app')
+    op.create_index('ix_picture_variant_id_primary', 'picture', ['variant_id'],
+                    schema='component_app', postgresql_where=sa.text('is_primary'))
+    op.create_index('ix_component_variant_active_component_id', 'component_variant',
+                    ['component_id', 'id'], schema='component_app', postgresql_where=sa.text('is_active'))
+
+    # Step 4: Reverse lookups on link tables (brand, keyword and category filters and counts)
+    op.create_index('ix_keyword_component_keyword_id', 'keyword_component',
+                    ['keyword_id', 'component_id'], schema='component_app')
+    op.create_index('ix_component_brand_brand_id', 'component_brand',
+                    ['brand_id', 'component_id'], schema='component_app')
+    op.create_index('ix_component_category_category_id', 'component_category',
+                    ['category_id', 'component_id'], schema='component_app')
+    op.create_index('ix_subbrand_brand_id', 'subbrand', ['brand_id'], schema='component_app')
+
+
+def downgrade():
+    """Remove hot path indexes"""
+
+    for table_name, index_name in (
+        ('subbrand', 'ix_subbrand_brand_id'),
+        ('component_category', 'ix_component_category_category_id'),
+        ('component_brand', 'ix_component_brand_brand_id'),
+        ('keyword_component', 'ix_keyword_component_keyword_id'),
+        ('component_variant', 'ix_component_variant_active_component_id'),
+        ('picture', 'ix_picture_variant_id_primary'),
+        ('picture', 'ix_picture_component_id_order'),
+        ('component', 'ix_component_rejected_created_at'),
+        ('component', 'ix_component_pending_created_at'),
+        ('component', 'ix_component_approved_created_at'),
+        ('component', 'ix_component_component_type_id'),
+        ('component', 'ix_component_supplier_id_created_at'),
+        ('component', 'ix_component_created_at_id'),
+    ):
+        op.drop_index(index_name, table_name=table_name, schema='component_app')
@@ -0,0 +1,78 @@
+"""Add trigger-maintained keyword usage counter
+
+Revision ID: add_keyword_usage_count_001
+Revises: add_change_feed_001
+Create Date: 2025-07-21 09:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'add_keyword_usage_count_001'
+down_revision = 'add_change_feed_001'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    """
+    Denormalize keyword usage into keyword.usage_count.
+    A trigger on keyword_component keeps it current for every write path
+    (ORM collections, CSV import and raw inserts/deletes alike).
+    """
+
+    # Step 1: Add and backfill the counter
+    op.add_column('keyword', sa.Column('usage_count', sa.Integer(), nullable=False, server_default='0'),
+                  schema='component_app')
+    op.execute("""
+        UPDATE component_app.keyword k
+        SET usage_count = counts.usage_count
+        FROM (
+            SELECT keyword_id, COUNT(*) AS usage_count
+            FROM component_app.keyword_component
+            GROUP BY keyword_id
+        ) counts
+        WHERE counts.keyword_id = k.id;
+    """)
+
+    # Step 2: Popular keyword listings read this index in order
+    op.execute("""
+        CREATE INDEX ix_keyword_usage_count_name
+        ON component_app.keyword (usage_count DESC, name);
+    """)
+
+    # Step 3: Keep the counter in step with keyword_component
+    op.execute("""
+        CREATE OR REPLACE FUNCTION component_app.update_keyword_usage_count() RETURNS TRIGGER AS $trigger$
+        BEGIN
+            IF TG_OP = 'INSERT' THEN
+                UPDATE component_app.keyword SET usage_count = usage_count + 1 WHERE id = NEW.keyword_id;
+                RETURN NEW;
+            ELSIF TG_OP = 'DELETE' THEN
+                UPDATE component_app.keyword SET usage_count = GREATEST(usage_count - 1, 0) WHERE id = OLD.keyword_id;
+                RETURN OLD;
+            ELSIF TG_OP = 'UPDATE' AND NEW.keyword_id IS DISTINCT FROM OLD.keyword_id THEN
+                UPDATE component_app.keyword SET usage_count = GREATEST(usage_count - 1, 0) WHERE id = OLD.keyword_id;
+                UPDATE component_app.keyword SET usage_count = usage_count + 1 WHERE id = NEW.keyword_id;
+            END IF;
+            RETURN NEW;
+        END;
+        $trigger$ LANGUAGE plpgsql;
+    """)
+    op.execute("""
+        CREATE TRIGGER trigger_keyword_usage_count
+            AFTER INSERT OR UPDATE OF keyword_id OR DELETE ON component_app.keyword_component
+            FOR EACH ROW
+            EXECUTE FUNCTION component_app.update_keyword_usage_count();
+    """)
+
+
+def downgrade():
+    """Remove keyword usage counter"""
+
+    op.execute("DROP TRIGGER IF EXISTS trigger_keyword_usage_count ON component_app.keyword_component;")
+    op.execute("DROP FUNCTION IF EXISTS component_app.update_keyword_usage_count();")
+    op.execute("DROP INDEX IF EXISTS component_app.ix_keyword_usage_count_name;")
+    op.drop_column('keyword', 'usage_count', schema='component_app')
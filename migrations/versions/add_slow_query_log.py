@@ -0,0 +1,48 @@
+"""Add slow_query_log table
+
+Revision ID: add_slow_query_log_001
+Revises: component_properties_jsonb_001
+Create Date: 2025-07-23 09:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = 'add_slow_query_log_001'
+down_revision = 'component_properties_jsonb_001'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    """
+    Persist slow statements recorded by the application (SLOW_QUERY_PERSIST)
+    so offenders can be ranked across workers and restarts.
+    """
+
+    # Step 1: Create the log table
+    op.create_table('slow_query_log',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('recorded_at', sa.DateTime(), nullable=False, server_default=sa.text('now()')),
+        sa.Column('duration_ms', sa.Float(), nullable=False),
+        sa.Column('shape', sa.Text(), nullable=False),
+        sa.Column('statement', sa.Text(), nullable=False),
+        sa.Column('parameters', postgresql.JSONB(), nullable=True),
+        sa.Column('endpoint', sa.String(length=200), nullable=True),
+        sa.Column('plan', postgresql.JSONB(), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+        schema='component_app'
+    )
+
+    # Step 2: The admin page aggregates over a recent time window
+    op.create_index('ix_slow_query_log_recorded_at', 'slow_query_log', ['recorded_at'], schema='component_app')
+
+
+def downgrade():
+    """Remove slow_query_log table"""
+
+    op.drop_index('ix_slow_query_log_recorded_at', table_name='slow_query_log', schema='component_app')
+    op.drop_table('slow_query_log', schema='component_app')
@@ -0,0 +1,153 @@
+"""Stamp change feed timestamps with one database clock
+
+Revision ID: change_feed_clock_001
+Revises: touch_component_on_link_001
+Create Date: 2025-07-26 09:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'change_feed_clock_001'
+down_revision = 'touch_component_on_link_001'
+branch_labels = None
+depends_on = None
+
+
+# Wall-clock time of the statement, as naive UTC like every stored timestamp
+CLOCK = "(clock_timestamp() AT TIME ZONE 'utc')"
+
+# Tables stamped by component_app.stamp_updated_at()
+STAMPED_TABLES = ('component', 'picture')
+
+
+def upgrade():
+    """
+    The change feed orders rows by updated_at / deleted_at and only reads up to the start of the
+    oldest open write transaction. That bound holds only if every stamp comes from the database
+    clock at write time: Python's utcnow() at flush and now() (transaction start) both skew
+    against it. Components and pictures are stamped by one trigger, variants by the existing
+    SKU trigger, link tables and tombstones by their own triggers, all with clock_timestamp().
+    """
+
+    # Step 1: One stamping function for rows without a trigger of their own
+    op.execute(f"""
+        CREATE OR REPLACE FUNCTION component_app.stamp_updated_at() RETURNS TRIGGER AS $trigger$
+        BEGIN
+            NEW.updated_at := {CLOCK};
+            RETURN NEW;
+        END;
+        $trigger$ LANGUAGE plpgsql;
+    """)
+
+    # Step 2: Pictures were stamped on update only; replace that trigger to cover inserts too
+    op.execute("DROP TRIGGER IF EXISTS trigger_touch_picture_updated_at ON component_app.picture;")
+    op.execute("DROP FUNCTION IF EXISTS component_app.touch_picture_updated_at();")
+    for table in STAMPED_TABLES:
+        op.execute(f"""
+            CREATE TRIGGER trigger_stamp_{table}_updated_at
+                BEFORE INSERT OR UPDATE ON component_app.{table}
+                FOR EACH ROW
+                EXECUTE FUNCTION component_app.stamp_updated_at();
+        """)
+
+    # Step 3: The variant SKU trigger already fires on every insert and update
+    op.execute(f"""
+        CREATE OR REPLACE FUNCTION component_app.update_variant_sku() RETURNS TRIGGER AS $trigger$
+        BEGIN
+            -- Update the variant_sku when insert or update occurs
+            IF TG_OP = 'INSERT' OR TG_OP = 'UPDATE' THEN
+                NEW.variant_sku := component_app.generate_variant_sku(NEW.component_id, NEW.color_id);
+                NEW.updated_at := {CLOCK};
+                RETURN NEW;
+            END IF;
+
+            RETURN NULL;
+        END;
+        $trigger$ LANGUAGE plpgsql;
+    """)
+
+    # Step 4: Link table writes touch the component (whose own trigger then stamps it)
+    op.execute(f"""
+        CREATE OR REPLACE FUNCTION component_app.touch_component_on_link_change() RETURNS TRIGGER AS $trigger$
+        BEGIN
+            IF TG_OP IN ('INSERT', 'UPDATE') THEN
+                UPDATE component_app.component
+                SET updated_at = {CLOCK}
+                WHERE id = NEW.component_id;
+            END IF;
+            IF TG_OP IN ('DELETE', 'UPDATE') THEN
+                -- No row is left to touch when the component itself is being deleted
+                UPDATE component_app.component
+                SET updated_at = {CLOCK}
+                WHERE id = OLD.component_id;
+            END IF;
+            RETURN NULL;
+        END;
+        $trigger$ LANGUAGE plpgsql;
+    """)
+
+    # Step 5: Tombstones
+    op.alter_column('change_tombstone', 'deleted_at', schema='component_app',
+                    server_default=sa.text(CLOCK))
+
+
+def downgrade():
+    """Restore transaction-start stamps and the update-only picture trigger"""
+
+    op.alter_column('change_tombstone', 'deleted_at', schema='component_app',
+                    server_default=sa.text("(now() AT TIME ZONE 'utc')"))
+
+    op.execute("""
+        CREATE OR REPLACE FUNCTION component_app.touch_component_on_link_change() RETURNS TRIGGER AS $trigger$
+        BEGIN
+            IF TG_OP IN ('INSERT', 'UPDATE') THEN
+                UPDATE component_app.component
+                SET updated_at = (now() AT TIME ZONE 'utc')
+                WHERE id = NEW.component_id;
+            END IF;
+            IF TG_OP IN ('DELETE', 'UPDATE') THEN
+                UPDATE component_app.component
+                SET updated_at = (now() AT TIME ZONE 'utc')
+                WHERE id = OLD.component_id;
+            END IF;
+            RETURN NULL;
+        END;
+        $trigger$ LANGUAGE plpgsql;
+    """)
+
+    op.execute("""
+        CREATE OR REPLACE FUNCTION component_app.update_variant_sku() RETURNS TRIGGER AS $trigger$
+        BEGIN
+            -- Update the variant_sku when insert or update occurs
+            IF TG_OP = 'INSERT' OR TG_OP = 'UPDATE' THEN
+                NEW.variant_sku := component_app.generate_variant_sku(NEW.component_id, NEW.color_id);
+                NEW.updated_at := CURRENT_TIMESTAMP;
+                RETURN NEW;
+            END IF;
+
+            RETURN NULL;
+        END;
+        $trigger$ LANGUAGE plpgsql;
+    """)
+
+    for table in STAMPED_TABLES:
+        op.execute(f"DROP TRIGGER IF EXISTS trigger_stamp_{table}_updated_at ON component_app.{table};")
+    op.execute("DROP FUNCTION IF EXISTS component_app.stamp_updated_at();")
+
+    op.execute("""
+        CREATE OR REPLACE FUNCTION component_app.touch_picture_updated_at() RETURNS TRIGGER AS $trigger$
+        BEGIN
+            NEW.updated_at := (now() AT TIME ZONE 'utc');
+            RETURN NEW;
+        END;
+        $trigger$ LANGUAGE plpgsql;
+    """)
+    op.execute("""
+        CREATE TRIGGER trigger_touch_picture_updated_at
+            BEFORE UPDATE ON component_app.picture
+            FOR EACH ROW
+            EXECUTE FUNCTION component_app.touch_picture_updated_at();
+    """)
@@ -0,0 +1,48 @@
+"""Convert component.properties to JSONB with a GIN index
+
+Revision ID: component_properties_jsonb_001
+Revises: add_hot_path_indexes_001
+Create Date: 2025-07-22 14:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = 'component_properties_jsonb_001'
+down_revision = 'add_hot_path_indexes_001'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    """
+    Store component properties as JSONB so property filters can use containment (@>)
+    backed by a GIN index instead of scanning every row.
+    """
+
+    # Step 1: Convert the column in place
+    op.alter_column('component', 'properties',
+                    type_=postgresql.JSONB(),
+                    existing_type=sa.JSON(),
+                    postgresql_using='properties::jsonb',
+                    schema='component_app')
+
+    # Step 2: jsonb_path_ops only supports @>, which is all the filters use, and is much smaller
+    op.create_index('ix_component_properties', 'component', ['properties'],
+                    schema='component_app',
+                    postgresql_using='gin',
+                    postgresql_ops={'properties': 'jsonb_path_ops'})
+
+
+def downgrade():
+    """Revert component.properties to JSON"""
+
+    op.drop_index('ix_component_properties', table_name='component', schema='component_app')
+    op.alter_column('component', 'properties',
+                    type_=sa.JSON(),
+                    existing_type=postgresql.JSONB(),
+                    postgresql_using='properties::json',
+                    schema='component_app')
@@ -0,0 +1,64 @@
+"""Bump component.updated_at when its keywords, categories or brands change
+
+Revision ID: touch_component_on_link_001
+Revises: add_slow_query_log_001
+Create Date: 2025-07-24 09:00:00.000000
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'touch_component_on_link_001'
+down_revision = 'add_slow_query_log_001'
+branch_labels = None
+depends_on = None
+
+
+# Link tables whose rows belong to a component
+LINK_TABLES = ('keyword_component', 'component_category', 'component_brand')
+
+
+def upgrade():
+    """
+    The change feed finds updated components through updated_at, but association writes
+    (API endpoints, CSV import, bulk operations, raw SQL) only touch the link tables.
+    Stamp the owning component from the database so every path is covered.
+    """
+
+    # Step 1: Touch the component on either side of the link row
+    op.execute("""
+        CREATE OR REPLACE FUNCTION component_app.touch_component_on_link_change() RETURNS TRIGGER AS $trigger$
+        BEGIN
+            IF TG_OP IN ('INSERT', 'UPDATE') THEN
+                UPDATE component_app.component
+                SET updated_at = (now() AT TIME ZONE 'utc')
+                WHERE id = NEW.component_id;
+            END IF;
+            IF TG_OP IN ('DELETE', 'UPDATE') THEN
+                -- No row is left to touch when the component itself is being deleted
+                UPDATE component_app.component
+                SET updated_at = (now() AT TIME ZONE 'utc')
+                WHERE id = OLD.component_id;
+            END IF;
+            RETURN NULL;
+        END;
+        $trigger$ LANGUAGE plpgsql;
+    """)
+
+    # Step 2: One trigger per link table
+    for table in LINK_TABLES:
+        op.execute(f"""
+            CREATE TRIGGER trigger_touch_component_on_{table}_change
+                AFTER INSERT OR UPDATE OR DELETE ON component_app.{table}
+                FOR EACH ROW
+                EXECUTE FUNCTION component_app.touch_component_on_link_change();
+        """)
+
+
+def downgrade():
+    """Remove the link table triggers"""
+
+    for table in LINK_TABLES:
+        op.execute(f"DROP TRIGGER IF EXISTS trigger_touch_component_on_{table}_change ON component_app.{table};")
+    op.execute("DROP FUNCTION IF EXISTS component_app.touch_component_on_link_change();")
@@ -16,6 +16,9 @@ class TestConfig(Config):
     """Test configuration that uses PostgreSQL database from config.py"""
     TESTING = True
     WTF_CSRF_ENABLED = False
+    # Endpoints that exceed their query budget or repeat a statement in a loop fail the test
+    QUERY_BUDGET_ENABLED = True
+    QUERY_BUDGET_RAISE = True
     # Use the same PostgreSQL database - schema component_app already exists
 
 @pytest.fixture(scope='session')
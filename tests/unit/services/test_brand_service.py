@@ -0,0 +1,107 @@
+"""
+BrandService Unit Tests
+Covers the grouped statistics query shape, caching of brand pages and bulk delete outcomes
+"""
+import pytest
+import sys
+import os
+from types import SimpleNamespace
+from unittest.mock import patch
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../../..'))
+
+from sqlalchemy.dialects import postgresql
+from app.services.brand_service import BrandService
+from app.utils.cache import invalidate_tags
+from app.utils.two_tier_cache import MemoryBackend
+
+
+def _compile(query):
+    return str(query.statement.compile(dialect=postgresql.dialect()))
+
+
+# ========================================
+# QUERY TESTS
+# ========================================
+
+def test_should_count_with_grouped_subqueries_when_building_stats_query(app):
+    """
+    Test: Counts come from grouped subqueries, not per-brand loads
+    Given: The brand statistics query
+    When: Compiling it for PostgreSQL
+    Then: Subbrand and component counts are grouped once and outer-joined to brands
+    """
+    sql = _compile(BrandService.brand_stats_query())
+
+    assert sql.count('GROUP BY') == 2
+    assert sql.count('LEFT OUTER JOIN') == 2
+
+
+def test_should_sort_in_sql_when_sorting_by_components_count(app):
+    """
+    Test: Count columns are sortable in SQL
+    Given: sort_by=components_count and sort_order=desc
+    When: Compiling the statistics query
+    Then: The ORDER BY uses the aggregated count with brand ID as tie-breaker
+    """
+    sql = _compile(BrandService.brand_stats_query(sort_by='components_count', sort_order='desc'))
+
+    assert 'ORDER BY components_count DESC, component_app.brand.id' in sql
+
+
+# ========================================
+# CACHE TESTS
+# ========================================
+
+@patch.object(BrandService, 'brand_stats_query')
+def test_should_serve_page_from_shared_cache_until_brands_tag_invalidated(mock_stats_query, app):
+    """
+    Test: Brands page cache
+    Given: The shared tag cache configured on the app
+    When: Reading the same page twice, then again after the 'brands' tag is invalidated
+    Then: The second read is a hit and the read after invalidation queries again
+    """
+    mock_stats_query.return_value.paginate.return_value = SimpleNamespace(
+        items=[], page=1, per_page=20, total=0, pages=0
+    )
+    app.cache = MemoryBackend()
+    app.config['CACHE_TYPE'] = 'simple'
+
+    with app.app_context():
+        first = BrandService.get_brands_page()
+        assert BrandService.get_brands_page() == first
+        assert mock_stats_query.call_count == 1
+
+        invalidate_tags('brands')
+        BrandService.get_brands_page()
+
+    assert mock_stats_query.call_count == 2
+
+
+# ========================================
+# BULK DELETE TESTS
+# ========================================
+
+@patch('app.services.brand_service.db.session')
+@patch.object(BrandService, 'brand_stats_query')
+def test_should_report_per_id_outcomes_when_bulk_deleting(mock_stats_query, mock_session, app):
+    """
+    Test: Bulk delete outcomes
+    Given: One free brand, one brand with components and one unknown ID
+    When: Bulk deleting all three
+    Then: Only the free brand is deleted in one statement and every ID gets an outcome
+    """
+    mock_stats_query.return_value = [
+        (SimpleNamespace(id=1, name='Free'), 0, 0),
+        (SimpleNamespace(id=2, name='Used'), 0, 3),
+    ]
+    mock_session.execute.return_value.scalars.return_value = [1]
+
+    outcome = BrandService.bulk_delete([1, 2, 99])
+
+    assert outcome['deleted_count'] == 1
+    assert [(r['id'], r['status']) for r in outcome['results']] == [
+        (1, 'deleted'), (2, 'blocked'), (99, 'not_found')
+    ]
+    assert mock_session.execute.call_count == 1
+    mock_session.commit.assert_called_once()
@@ -0,0 +1,165 @@
+"""
+ChangeFeedService Unit Tests
+Covers cursor handling, page merging, the visibility bound and the single database clock,
+none of which need the database
+"""
+import pytest
+import sys
+import os
+import importlib.util
+from datetime import datetime
+from unittest.mock import MagicMock, patch
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../../..'))
+
+from sqlalchemy.dialects import postgresql
+from app.models import Component
+from app.services.change_feed_service import ChangeFeedService
+
+
+CLOCK_MIGRATION_PATH = os.path.join(
+    os.path.dirname(__file__), '../../../migrations/versions/change_feed_clock.py'
+)
+
+
+def _migration_sql():
+    """Every statement the clock migration executes, with alembic's op mocked"""
+    spec = importlib.util.spec_from_file_location('change_feed_clock', CLOCK_MIGRATION_PATH)
+    migration = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(migration)
+    op = MagicMock()
+    migration.op = op
+    migration.upgrade()
+    return op, [' '.join(call.args[0].split()) for call in op.execute.call_args_list]
+
+
+# ========================================
+# CURSOR TESTS
+# ========================================
+
+def test_should_roundtrip_position_when_cursor_encoded_and_decoded():
+    """
+    Test: Cursor encoding is lossless
+    Given: A position with microsecond timestamp
+    When: Encoding and decoding the cursor
+    Then: The same position is returned
+    """
+    position = (datetime(2025, 7, 20, 10, 15, 30, 123456), 2, 987)
+
+    cursor = ChangeFeedService.encode_cursor(position)
+
+    assert ChangeFeedService.decode_cursor(cursor) == position
+
+
+def test_should_raise_value_error_when_cursor_is_malformed():
+    """
+    Test: Malformed cursors are rejected
+    Given: A cursor string that was not produced by encode_cursor
+    When: Decoding it
+    Then: ValueError is raised
+    """
+    with pytest.raises(ValueError):
+        ChangeFeedService.decode_cursor('not-a-cursor')
+
+
+def test_should_convert_to_naive_utc_when_since_has_timezone():
+    """
+    Test: Since timestamps are normalized to stored naive UTC
+    Given: An ISO timestamp with a +02:00 offset
+    When: Building a starting position
+    Then: The timestamp is shifted to UTC and precedes every source rank
+    """
+    position = ChangeFeedService.position_from_since('2025-07-20T12:00:00+02:00')
+
+    assert position == (datetime(2025, 7, 20, 10, 0, 0), -1, 0)
+
+
+# ========================================
+# MERGE TESTS
+# ========================================
+
+def test_should_order_by_timestamp_then_rank_when_merging_sources():
+    """
+    Test: Records from all sources are interleaved in cursor order
+    Given: Component, picture and delete records sharing timestamps
+    When: Merging with a limit smaller than the total
+    Then: The page follows (timestamp, rank, id) order and reports more records
+    """
+    t1 = datetime(2025, 7, 20, 10, 0, 0)
+    t2 = datetime(2025, 7, 20, 11, 0, 0)
+    components = [((t1, 0, 5), 'component-5'), ((t2, 0, 1), 'component-1')]
+    pictures = [((t1, 2, 3), 'picture-3')]
+    deletes = [((t1, 3, 1), 'delete-1'), ((t2, 3, 2), 'delete-2')]
+
+    page, has_more = ChangeFeedService._merge_sources([components, pictures, deletes], limit=4)
+
+    assert [record for _, record in page] == ['component-5', 'picture-3', 'delete-1', 'component-1']
+    assert has_more is True
+
+
+def test_should_report_no_more_when_sources_fit_in_page():
+    """
+    Test: has_more is false on the last page
+    Given: Fewer records than the limit
+    When: Merging sources
+    Then: All records are returned and has_more is False
+    """
+    t1 = datetime(2025, 7, 20, 10, 0, 0)
+
+    page, has_more = ChangeFeedService._merge_sources([[((t1, 1, 7), 'variant-7')], []], limit=10)
+
+    assert len(page) == 1
+    assert has_more is False
+
+
+# ========================================
+# VISIBILITY BOUND TESTS
+# ========================================
+
+def test_should_bound_pages_by_oldest_open_write_transaction_when_fetching_changes(app):
+    """
+    Test: Commit-visibility upper bound
+    Given: The bound reported by the database
+    When: Fetching a page and compiling the keyset filter
+    Then: Every source is read strictly below it, and the bound comes from the writers'
+          xact_start in pg_stat_activity rather than a fixed delay
+    """
+    until = datetime(2025, 7, 20, 10, 0, 0)
+    sources = ('_component_changes', '_variant_changes', '_picture_changes', '_tombstone_changes')
+    with patch.object(ChangeFeedService, 'visible_until', return_value=until), \
+         patch.multiple(ChangeFeedService, **{name: MagicMock(return_value=[]) for name in sources}):
+        ChangeFeedService.get_changes((datetime(2025, 7, 20, 9, 0, 0), -1, 0))
+        calls = [getattr(ChangeFeedService, name).call_args for name in sources]
+
+    assert all(call.args[1] == until for call in calls)
+
+    query = ChangeFeedService._keyset_query(
+        Component.query, Component.updated_at, Component.id, 'component', (until, -1, 0), until, 10
+    )
+    sql = str(query.statement.compile(dialect=postgresql.dialect()))
+    assert 'component_app.component.updated_at < %(updated_at_2)s' in sql
+
+    bound_sql = ' '.join(ChangeFeedService.VISIBLE_UNTIL_SQL.text.split())
+    assert 'min(xact_start)' in bound_sql
+    assert 'FROM pg_stat_activity' in bound_sql
+    assert 'backend_xid IS NOT NULL' in bound_sql
+
+
+def test_should_stamp_every_feed_source_with_clock_timestamp_when_migration_runs():
+    """
+    Test: One database clock
+    Given: The change feed clock migration
+    When: Running its upgrade with alembic mocked
+    Then: Components and pictures get a stamping trigger on insert and update, and the variant,
+          link table and tombstone stamps use clock_timestamp() instead of now()
+    """
+    op, statements = _migration_sql()
+    sql = '\n'.join(statements)
+
+    assert 'now()' not in sql and 'CURRENT_TIMESTAMP' not in sql
+    assert "NEW.updated_at := (clock_timestamp() AT TIME ZONE 'utc')" in sql
+    for table in ('component', 'picture'):
+        assert f'BEFORE INSERT OR UPDATE ON component_app.{table}' in sql
+    assert 'FUNCTION component_app.update_variant_sku()' in sql
+    assert 'FUNCTION component_app.touch_component_on_link_change()' in sql
+    assert str(op.alter_column.call_args.kwargs['server_default']) == "(clock_timestamp() AT TIME ZONE 'utc')"
@@ -0,0 +1,183 @@
+"""
+CSVProcessingService Unit Tests
+Covers the dry-run import diff, which works on DataFrames without touching the database
+"""
+import pytest
+import pandas as pd
+import sys
+import os
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../../..'))
+
+from app.services.csv_service import CSVProcessingService
+
+
+# ========================================
+# FIXTURES
+# ========================================
+
+@pytest.fixture
+def import_frame():
+    """Normalized import file with one update, one unchanged row and one new component"""
+    raw = pd.DataFrame([
+        {'product_number': 'F-001', 'description': 'New description', 'supplier_code': 'SUPP001',
+         'component_type': 'Fabrics', 'category_name': 'polyester', 'keywords': 'Shiny, polyester'},
+        {'product_number': 'F-002', 'description': 'Same', 'supplier_code': 'SUPP001',
+         'component_type': 'Fabrics', 'category_name': 'polyester', 'keywords': ''},
+        {'product_number': 'F-003', 'description': 'Brand new', 'supplier_code': 'SUPP001',
+         'component_type': 'Fabrics', 'category_name': 'cotton', 'keywords': 'soft'},
+    ])
+    return CSVProcessingService._normalize_import_frame(raw)
+
+
+@pytest.fixture
+def snapshot_frame():
+    """Catalogue snapshot with a component the file no longer lists"""
+    return pd.DataFrame([
+        {'component_id': 1, 'supplier_code': 'SUPP001', 'product_number': 'F-001',
+         'description': 'Old description', 'component_type': 'Fabrics',
+         'category_name': 'polyester', 'keywords': 'polyester,shiny', 'properties': '', 'pictures': ''},
+        {'component_id': 2, 'supplier_code': 'SUPP001', 'product_number': 'F-002',
+         'description': 'Same', 'component_type': 'Fabrics',
+         'category_name': 'polyester', 'keywords': 'kept', 'properties': '', 'pictures': ''},
+        {'component_id': 9, 'supplier_code': 'SUPP001', 'product_number': 'F-OLD',
+         'description': '', 'component_type': 'Fabrics',
+         'category_name': '', 'keywords': '', 'properties': '', 'pictures': ''},
+    ])
+
+
+# ========================================
+# DRY-RUN DIFF TESTS
+# ========================================
+
+def test_should_classify_rows_when_file_is_diffed_against_snapshot(import_frame, snapshot_frame):
+    """
+    Test: Dry-run classification
+    Given: A file with changed, unchanged and new components and a snapshot with a missing one
+    When: _diff_import_frames is called
+    Then: Creates, updates, unchanged rows and deletions are counted correctly
+    """
+    result = CSVProcessingService._diff_import_frames(import_frame, snapshot_frame)
+
+    assert result['dry_run'] is True
+    assert result['summary'] == {
+        'rows': 3, 'create': 1, 'update': 1, 'unchanged': 1, 'delete': 1, 'duplicates': 0
+    }
+    assert result['samples']['create'][0]['product_number'] == 'F-003'
+    assert result['samples']['delete'][0]['component_id'] == 9
+
+
+def test_should_count_field_changes_when_matched_rows_differ(import_frame, snapshot_frame):
+    """
+    Test: Per-field change counts
+    Given: A matched row whose description changed and whose keywords only differ in case/order
+    When: _diff_import_frames is called
+    Then: Only the description change is counted and sampled
+    """
+    result = CSVProcessingService._diff_import_frames(import_frame, snapshot_frame)
+
+    assert result['field_changes'] == {
+        'description': 1, 'component_type': 0, 'category_name': 0, 'keywords': 0,
+        'properties': 0, 'pictures': 0
+    }
+    update = result['samples']['update'][0]
+    assert update['component_id'] == 1
+    assert update['row_number'] == 2
+    assert update['changes'] == {
+        'description': {'old': 'Old description', 'new': 'New description'}
+    }
+
+
+def test_should_report_duplicates_when_file_repeats_a_key(snapshot_frame):
+    """
+    Test: Duplicate keys in the import file
+    Given: A file listing the same supplier/product pair twice
+    When: _diff_import_frames is called
+    Then: The earlier row is reported as a duplicate and the later one is diffed
+    """
+    raw = pd.DataFrame([
+        {'product_number': 'F-002', 'description': 'First', 'supplier_code': 'SUPP001',
+         'component_type': 'Fabrics', 'category_name': 'polyester'},
+        {'product_number': 'F-002', 'description': 'Same', 'supplier_code': 'SUPP001',
+         'component_type': 'Fabrics', 'category_name': 'polyester'},
+    ])
+    file_frame = CSVProcessingService._normalize_import_frame(raw)
+
+    result = CSVProcessingService._diff_import_frames(file_frame, snapshot_frame)
+
+    assert result['summary']['duplicates'] == 1
+    assert result['summary']['unchanged'] == 1
+    assert result['samples']['duplicates'][0]['row_number'] == 2
+
+
+def test_should_count_property_and_picture_changes_when_import_replaces_them(snapshot_frame):
+    """
+    Test: Properties and pictures in the diff
+    Given: Rows whose properties or pictures differ from the snapshot, and one matching it
+    When: _diff_import_frames is called
+    Then: Only the rows the import would actually change are updates, per field
+    """
+    base = {'supplier_code': 'SUPP001', 'component_type': 'Fabrics', 'category_name': 'polyester',
+            'keywords': '', 'color': '', 'gender': '', 'picture_1_name': '', 'picture_1_url': ''}
+    raw = pd.DataFrame([
+        dict(base, product_number='F-001', description='Old description', color=' red ',
+             gender='ladies, unisex'),
+        dict(base, product_number='F-002', description='Same', picture_1_name='front.jpg',
+             picture_1_url='http://example.com/front.jpg'),
+        dict(base, product_number='F-OLD', description='', category_name='', color='blue',
+             picture_1_name='old.jpg', picture_1_url='http://example.com/old.jpg'),
+    ])
+    snapshot = snapshot_frame.copy()
+    snapshot.loc[snapshot['product_number'] == 'F-OLD', 'properties'] = \
+        CSVProcessingService._properties_key({'color': 'blue'})
+    snapshot.loc[snapshot['product_number'] == 'F-OLD', 'pictures'] = \
+        CSVProcessingService._pictures_key([['old.jpg', 'http://example.com/old.jpg']])
+
+    result = CSVProcessingService._diff_import_frames(
+        CSVProcessingService._normalize_import_frame(raw), snapshot
+    )
+
+    assert result['summary']['update'] == 2
+    assert result['summary']['unchanged'] == 1
+    assert result['field_changes']['properties'] == 1
+    assert result['field_changes']['pictures'] == 1
+    changes = {sample['product_number']: sample['changes'] for sample in result['samples']['update']}
+    assert changes['F-001']['properties']['new'] == \
+        '{"color": "red", "gender": ["ladies", "unisex"]}'
+    assert set(changes['F-002']) == {'pictures'}
+
+
+def test_should_keep_keys_as_written_when_normalizing_like_the_import(snapshot_frame):
+    """
+    Test: Key normalization
+    Given: A row whose product number carries surrounding spaces
+    When: _diff_import_frames is called
+    Then: It is a create, as the import would look it up verbatim and not find it
+    """
+    raw = pd.DataFrame([
+        {'product_number': ' F-002 ', 'description': 'Same', 'supplier_code': 'SUPP001',
+         'component_type': 'Fabrics', 'category_name': 'polyester'},
+    ])
+
+    result = CSVProcessingService._diff_import_frames(
+        CSVProcessingService._normalize_import_frame(raw), snapshot_frame
+    )
+
+    assert result['summary']['create'] == 1
+    assert result['summary']['update'] == 0
+
+
+def test_should_report_missing_columns_when_file_lacks_required_headers(tmp_path):
+    """
+    Test: Dry run with an incomplete header
+    Given: A CSV file without the component_type and category_name columns
+    When: process_csv_file is called with dry_run=True
+    Then: The preview reports the missing columns without querying the database
+    """
+    csv_file = tmp_path / 'import.csv'
+    csv_file.write_text('product_number;description;supplier_code\nF-001;x;SUPP001\n', encoding='utf-8')
+
+    result = CSVProcessingService.process_csv_file(str(csv_file), dry_run=True)
+
+    assert result['summary']['rows'] == 0
+    assert 'component_type' in result['errors'][0]
@@ -0,0 +1,78 @@
+"""
+CatalogueExportService Unit Tests
+Covers serialization of an already-loaded component graph
+"""
+import pytest
+import sys
+import os
+from types import SimpleNamespace
+from datetime import datetime
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../../..'))
+
+from app.services.export_service import CatalogueExportService
+
+
+# ========================================
+# FIXTURES
+# ========================================
+
+def _picture(id, order, variant_id=None):
+    return SimpleNamespace(id=id, picture_name=f'pic_{id}', url=f'http://x/pic_{id}.jpg',
+                           picture_order=order, alt_text=None, is_primary=order == 1,
+                           variant_id=variant_id)
+
+
+@pytest.fixture
+def component():
+    """Component with one variant, main and variant pictures, brand, category and keywords"""
+    red = SimpleNamespace(id=3, name='Red')
+    return SimpleNamespace(
+        id=10, product_number='F-001', description='Fabric',
+        component_type=SimpleNamespace(id=1, name='Fabrics'),
+        supplier=None,
+        proto_status='ok', sms_status='pending', pps_status='pending',
+        properties={'material': {'value': 'polyester'}},
+        brand_associations=[SimpleNamespace(brand_id=2, brand=SimpleNamespace(id=2, name='Acme'))],
+        categories=[SimpleNamespace(id=5, name='polyester')],
+        keywords=[SimpleNamespace(name='shiny'), SimpleNamespace(name='basic')],
+        pictures=[_picture(21, 1, variant_id=7), _picture(12, 2), _picture(11, 1)],
+        variants=[SimpleNamespace(id=7, variant_sku='F-001_red', variant_name='Red',
+                                  color=red, is_active=True)],
+        created_at=datetime(2025, 1, 1), updated_at=None
+    )
+
+
+# ========================================
+# SERIALIZATION TESTS
+# ========================================
+
+def test_should_nest_pictures_under_owner_when_serializing_component(component):
+    """
+    Test: Main and variant pictures are split by owner
+    Given: A component whose pictures include one variant picture
+    When: Serializing the component
+    Then: Main pictures stay on the component in order, variant pictures move under the variant
+    """
+    record = CatalogueExportService.serialize_component(component)
+
+    assert [p['id'] for p in record['pictures']] == [11, 12]
+    assert [p['id'] for p in record['variants'][0]['pictures']] == [21]
+    assert record['variants'][0]['sku'] == 'F-001_red'
+
+
+def test_should_include_associations_when_serializing_component(component):
+    """
+    Test: The full graph is exported
+    Given: A component with brand, category, keywords, properties and no supplier
+    When: Serializing the component
+    Then: Associations are present and missing relations become None
+    """
+    record = CatalogueExportService.serialize_component(component)
+
+    assert record['brands'] == [{'id': 2, 'name': 'Acme'}]
+    assert record['categories'] == [{'id': 5, 'name': 'polyester'}]
+    assert record['keywords'] == ['basic', 'shiny']
+    assert record['properties'] == {'material': {'value': 'polyester'}}
+    assert record['supplier'] is None
+    assert record['updated_at'] is None
@@ -0,0 +1,64 @@
+"""
+PropertyService Unit Tests
+Covers parsing and compiling of JSONB property filters
+"""
+import pytest
+import sys
+import os
+from sqlalchemy.dialects import postgresql
+from werkzeug.datastructures import MultiDict
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../../..'))
+
+from app.services.property_service import PropertyService
+
+
+# ========================================
+# PARSING TESTS
+# ========================================
+
+def test_should_group_property_values_by_name_when_parsing_query_args():
+    """
+    Test: Filter parsing
+    Given: Query args with repeated, blank and unrelated parameters
+    When: Parsing property filters
+    Then: Only non-empty prop.* values are returned, grouped by property name
+    """
+    args = MultiDict([
+        ('prop.material', 'polyester'),
+        ('prop.gender', 'ladies'),
+        ('prop.gender', ' men '),
+        ('prop.style', ''),
+        ('search', 'shirt'),
+    ])
+
+    assert PropertyService.parse_property_filters(args) == {
+        'material': ['polyester'],
+        'gender': ['ladies', 'men'],
+    }
+
+
+# ========================================
+# SQL TESTS
+# ========================================
+
+def test_should_match_every_stored_shape_with_containment_when_filtering(app):
+    """
+    Test: Filter SQL
+    Given: A material filter
+    When: Compiling it for PostgreSQL
+    Then: Bare, list and {'value': ...} shapes are all matched with the @> operator
+    """
+    with app.app_context():
+        clause = PropertyService.component_property_filter('material', ['polyester'])
+        sql = str(clause.compile(dialect=postgresql.dialect()))
+        params = clause.compile(dialect=postgresql.dialect()).params
+
+    assert sql.count('@>') == 4
+    assert ' OR ' in sql
+    assert sorted(params.values(), key=str) == sorted([
+        {'material': 'polyester'},
+        {'material': ['polyester']},
+        {'material': {'value': 'polyester'}},
+        {'material': {'value': ['polyester']}},
+    ], key=str)
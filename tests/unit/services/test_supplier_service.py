@@ -0,0 +1,47 @@
+"""
+SupplierService Unit Tests
+Covers the shape of the grouped supplier overview query
+"""
+import pytest
+import sys
+import os
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../../..'))
+
+from sqlalchemy.dialects import postgresql
+from app.services.supplier_service import SupplierService
+
+
+def _compile(query):
+    return str(query.statement.compile(dialect=postgresql.dialect()))
+
+
+# ========================================
+# OVERVIEW QUERY TESTS
+# ========================================
+
+def test_should_aggregate_components_in_one_grouped_subquery(app):
+    """
+    Test: Supplier aggregates come from one grouped query
+    Given: The supplier overview query
+    When: Compiling it for PostgreSQL
+    Then: Components are grouped once by supplier and outer-joined, with status counts and types
+    """
+    sql = _compile(SupplierService.overview_query())
+
+    assert sql.count('GROUP BY component_app.component.supplier_id') == 1
+    assert 'LEFT OUTER JOIN' in sql
+    assert 'array_agg(DISTINCT component_app.component_type.name)' in sql
+    assert sql.count('CASE WHEN') == 2
+
+
+def test_should_sort_by_component_count_in_sql_when_requested(app):
+    """
+    Test: Component count sorting happens in SQL
+    Given: sort_by=components
+    When: Compiling the overview query
+    Then: Suppliers are ordered by the aggregated count, then code
+    """
+    sql = _compile(SupplierService.overview_query('components'))
+
+    assert 'ORDER BY coalesce(anon_1.component_count, %(coalesce_1)s) DESC, component_app.supplier.supplier_code' in sql
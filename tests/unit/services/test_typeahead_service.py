@@ -0,0 +1,115 @@
+"""
+TypeaheadService Unit Tests
+Covers ranking of the in-memory typeahead index and the change stamps that trigger rebuilds
+"""
+import pytest
+import sys
+import os
+from unittest.mock import patch
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../../..'))
+
+from sqlalchemy import select
+from sqlalchemy.dialects import postgresql
+from app.services.typeahead_service import TypeaheadIndex, TypeaheadService
+
+
+def _stamp_sql(entity_type):
+    """SQL of the stamp query for an entity type, captured instead of executed"""
+    with patch('app.db.session') as mock_session:
+        TypeaheadService._db_stamp(entity_type)
+    columns = mock_session.query.call_args.args
+    return str(select(*columns).compile(dialect=postgresql.dialect()))
+
+
+# ========================================
+# FIXTURES
+# ========================================
+
+@pytest.fixture
+def index():
+    """Brand-like labels with one secondary (address) text"""
+    return TypeaheadIndex([
+        (1, 'Nike', None),
+        (2, 'Nikes Outlet', None),
+        (3, 'Air Nike Store', None),
+        (4, 'Bionik', None),
+        (5, 'Adidas', 'Nikelstrasse 5'),
+        (6, 'Puma', None),
+    ])
+
+
+# ========================================
+# RANKING TESTS
+# ========================================
+
+def test_should_rank_exact_prefix_word_and_infix_matches_in_order(index):
+    """
+    Test: Match ranking
+    Given: Labels matching "nik" exactly, as prefix, at a word start, inside a word and in secondary text
+    When: Searching "nike" and "Nik"
+    Then: Results follow exact > prefix > word prefix > infix > secondary
+    """
+    results = index.search('nike')
+
+    assert [(entity_id, match_type) for entity_id, _, match_type in results] == [
+        (1, 'exact'), (2, 'prefix'), (3, 'word_prefix'), (5, 'secondary')
+    ]
+    assert [entity_id for entity_id, _, _ in index.search('Nik')] == [1, 2, 3, 4, 5]
+
+
+def test_should_return_each_entity_once_with_best_rank_when_term_repeats():
+    """
+    Test: Deduplication
+    Given: A label containing the query several times
+    When: Searching
+    Then: The entity appears once with its best match type
+    """
+    index = TypeaheadIndex([(1, 'Tex Textiles', None)])
+
+    assert index.search('tex') == [(1, 'Tex Textiles', 'prefix')]
+
+
+def test_should_respect_limit_and_ignore_blank_queries(index):
+    """
+    Test: Limits and blank input
+    Given: A populated index
+    When: Searching with a limit and with a blank query
+    Then: The limit is applied and blank queries return nothing
+    """
+    assert len(index.search('a', limit=2)) == 2
+    assert index.search('   ') == []
+    assert index.search('zzz') == []
+
+
+# ========================================
+# STAMP TESTS
+# ========================================
+
+@pytest.mark.parametrize('entity_type', ['category', 'color'])
+def test_should_hash_labels_in_stamp_when_entity_has_no_updated_at(app, entity_type):
+    """
+    Test: Rename detection without updated_at
+    Given: Categories and colours, which have no updated_at column
+    When: Building their change stamp
+    Then: It includes an md5 of every id:name pair in ID order, so a rename in another
+          worker changes the stamp
+    """
+    sql = _stamp_sql(entity_type)
+
+    assert f'md5(string_agg(concat(component_app.{entity_type}.id' in sql
+    assert f'component_app.{entity_type}.name' in sql
+    assert f'ORDER BY component_app.{entity_type}.id' in sql
+
+
+def test_should_stamp_with_latest_update_when_entity_has_updated_at(app):
+    """
+    Test: Stamp for timestamped entities
+    Given: Brands, which have updated_at
+    When: Building their change stamp
+    Then: It uses max(updated_at) and does not hash the labels
+    """
+    sql = _stamp_sql('brand')
+
+    assert 'max(component_app.brand.updated_at)' in sql
+    assert 'md5' not in sql
@@ -0,0 +1,185 @@
+"""
+Keyword API Unit Tests
+Covers ordering by the denormalized Keyword.usage_count and the trigger that maintains it
+"""
+import pytest
+import sys
+import os
+import importlib.util
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../..'))
+
+from sqlalchemy.dialects import postgresql
+from app.api import keyword_api
+from app.models import Keyword
+
+
+MIGRATION_PATH = os.path.join(
+    os.path.dirname(__file__), '../../migrations/versions/add_keyword_usage_count.py'
+)
+
+
+def _compile_statement(statement):
+    return str(statement.compile(dialect=postgresql.dialect()))
+
+
+def _compile(query):
+    return _compile_statement(query.statement)
+
+
+def _migration_sql():
+    """Every statement the usage_count migration executes, with alembic's op mocked"""
+    spec = importlib.util.spec_from_file_location('add_keyword_usage_count', MIGRATION_PATH)
+    migration = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(migration)
+    op = MagicMock()
+    migration.op = op
+    migration.upgrade()
+    return [' '.join(call.args[0].split()) for call in op.execute.call_args_list]
+
+
+# ========================================
+# ORDERING TESTS
+# ========================================
+
+def test_should_order_by_usage_count_without_counting_links_when_listing_popular(app):
+    """
+    Test: Popular keyword ordering
+    Given: The popular keywords query
+    When: Compiling it for PostgreSQL
+    Then: It orders by usage_count then name and never joins or counts keyword_component
+    """
+    sql = _compile(keyword_api.popular_keywords_query(20))
+
+    assert 'ORDER BY component_app.keyword.usage_count DESC, component_app.keyword.name' in sql
+    assert 'keyword_component' not in sql
+    assert 'count(' not in sql.lower()
+
+
+def test_should_return_popular_keywords_in_query_order_when_search_is_empty(app, client):
+    """
+    Test: Empty search
+    Given: Popular keywords returned by the usage_count query
+    When: Searching without a query string
+    Then: They are returned in that order with their stored usage counts
+    """
+    rows = [
+        SimpleNamespace(id=3, name='waterproof', usage_count=40),
+        SimpleNamespace(id=1, name='cotton', usage_count=12),
+    ]
+    with patch.object(keyword_api, 'popular_keywords_query') as mock_query:
+        mock_query.return_value.all.return_value = rows
+        response = client.get('/api/keyword/search?limit=2')
+
+    mock_query.assert_called_once_with(2)
+    assert [(k['name'], k['usage_count'], k['match_type']) for k in response.get_json()['keywords']] == [
+        ('waterproof', 40, 'popular'), ('cotton', 12, 'popular')
+    ]
+
+
+def test_should_rank_fuzzy_matches_by_similarity_then_usage_when_searching(app, client):
+    """
+    Test: Fuzzy ranking uses the counter
+    Given: Two fuzzy matches with equal similarity and different usage counts
+    When: Searching
+    Then: The more used keyword comes first; counts come from one counter lookup
+    """
+    index = MagicMock()
+    index.prefix.return_value = []
+    index.fuzzy.return_value = [(7, 'polyster', 0.7), (8, 'polyestre', 0.7)]
+    with patch.object(keyword_api, 'get_keyword_index', return_value=index), \
+         patch.object(keyword_api, '_usage_counts', return_value={7: 2, 8: 15}) as mock_counts:
+        response = client.get('/api/keyword/search?q=polyester')
+
+    mock_counts.assert_called_once_with([7, 8])
+    assert [k['name'] for k in response.get_json()['keywords']] == ['polyestre', 'polyster']
+
+
+# ========================================
+# COUNTER LOOKUP TESTS
+# ========================================
+
+@patch('app.api.keyword_api.db.session')
+def test_should_read_usage_count_column_when_looking_up_counts(mock_session, app):
+    """
+    Test: Counter lookup
+    Given: Keyword IDs, and an empty list
+    When: Looking up usage counts
+    Then: The stored counter is read in one query; an empty list queries nothing
+    """
+    mock_session.query.return_value.filter.return_value.all.return_value = [(1, 4), (2, 0)]
+
+    assert keyword_api._usage_counts([1, 2]) == {1: 4, 2: 0}
+    mock_session.query.assert_called_once_with(Keyword.id, Keyword.usage_count)
+
+    mock_session.query.reset_mock()
+    assert keyword_api._usage_counts([]) == {}
+    mock_session.query.assert_not_called()
+
+
+def test_should_return_stored_count_when_creating_existing_keyword(app, client):
+    """
+    Test: Create with an existing name
+    Given: A keyword that already exists with a usage count
+    When: Creating it again under a different case
+    Then: The existing keyword is returned with its counter and nothing is written
+    """
+    existing = SimpleNamespace(id=5, name='Cotton', usage_count=9)
+    with patch.object(Keyword, 'query') as mock_query, \
+         patch('app.api.keyword_api.db.session') as mock_session:
+        mock_query.filter.return_value.first.return_value = existing
+        response = client.post('/api/keyword/create', json={'name': 'cotton'})
+
+    assert response.get_json()['keyword'] == {
+        'id': 5, 'name': 'Cotton', 'usage_count': 9, 'created': False, 'message': 'Keyword already exists'
+    }
+    mock_session.commit.assert_not_called()
+
+
+def test_should_leave_counter_to_trigger_when_associating_keywords(app, client):
+    """
+    Test: Association writes
+    Given: A component and two existing keywords
+    When: Replacing its keywords through /associate
+    Then: Only keyword_component rows are deleted and inserted; usage_count is never written
+    """
+    keywords = {'cotton': SimpleNamespace(id=1, name='cotton'), 'soft': SimpleNamespace(id=2, name='soft')}
+    with patch('app.api.keyword_api.Component') as mock_component, \
+         patch.object(Keyword, 'query') as mock_query, \
+         patch('app.api.keyword_api.db.session') as mock_session:
+        mock_component.query.get_or_404.return_value = SimpleNamespace(id=10)
+        mock_query.filter.return_value.first.side_effect = [keywords['cotton'], keywords['soft']]
+        response = client.post('/api/keyword/associate', json={'component_id': 10, 'keywords': ['cotton', 'soft']})
+
+    assert response.get_json()['success'] is True
+    statements = [_compile_statement(call.args[0]) for call in mock_session.execute.call_args_list]
+    assert statements[0].startswith('DELETE FROM component_app.keyword_component')
+    assert all(sql.startswith('INSERT INTO component_app.keyword_component') for sql in statements[1:])
+    assert len(statements) == 3
+    assert not any('usage_count' in sql for sql in statements)
+    mock_session.commit.assert_called_once()
+
+
+# ========================================
+# TRIGGER TESTS
+# ========================================
+
+def test_should_maintain_counter_for_every_link_write_when_migration_runs():
+    """
+    Test: Trigger-maintained counter
+    Given: The usage_count migration
+    When: Running its upgrade with alembic mocked
+    Then: The counter is backfilled and a row trigger on keyword_component covers
+          inserts, keyword_id updates and deletes without going below zero
+    """
+    statements = _migration_sql()
+    sql = '\n'.join(statements)
+
+    assert 'GROUP BY keyword_id' in sql
+    assert 'ON component_app.keyword (usage_count DESC, name)' in sql
+    assert 'AFTER INSERT OR UPDATE OF keyword_id OR DELETE ON component_app.keyword_component' in sql
+    assert 'FOR EACH ROW' in sql
+    assert 'usage_count = usage_count + 1 WHERE id = NEW.keyword_id' in sql
+    assert 'usage_count = GREATEST(usage_count - 1, 0) WHERE id = OLD.keyword_id' in sql
@@ -0,0 +1,104 @@
+"""
+Query Plan Audit Unit Tests
+Covers how the audit tool sends hot queries to EXPLAIN and reports failing ones, without a database
+"""
+import pytest
+import sys
+import os
+import importlib.util
+from unittest.mock import MagicMock, patch
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../..'))
+
+from sqlalchemy.dialects.postgresql import psycopg2 as pg_psycopg2
+
+
+AUDIT_PATH = os.path.join(os.path.dirname(__file__), '../../tools/maintenance/query_plan_audit.py')
+
+PLAN = [{'Plan': {'Node Type': 'Limit', 'Plans': []}, 'Execution Time': 0.5}]
+
+SAMPLE_IDS = {
+    'component_id': 1, 'supplier_id': 1, 'component_type_id': 1, 'variant_id': 1,
+    'brand_id': 1, 'keyword_id': 1, 'category_id': 1,
+}
+
+
+@pytest.fixture
+def audit_tool():
+    spec = importlib.util.spec_from_file_location('query_plan_audit', AUDIT_PATH)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def _hot_query(audit_tool, name):
+    return dict(audit_tool.hot_queries(SAMPLE_IDS))[name]
+
+
+# ========================================
+# EXPLAIN TESTS
+# ========================================
+
+def test_should_process_jsonb_binds_when_explaining_property_query(app, audit_tool):
+    """
+    Test: EXPLAIN keeps bind types
+    Given: The component_list_property query, whose @> parameters are dicts
+    When: Running explain() against a mocked connection
+    Then: An EXPLAIN construct is executed through connection.execute(), and every dict
+          parameter compiles as a JSONB bind that psycopg2 receives as a JSON string
+    """
+    query = _hot_query(audit_tool, 'component_list_property')
+    connection = MagicMock()
+    connection.execute.return_value.scalar.return_value = PLAN
+    with patch.object(audit_tool, 'db') as mock_db:
+        mock_db.engine.connect.return_value = connection
+        explained = audit_tool.explain(query)
+
+    assert explained == PLAN[0]
+    connection.exec_driver_sql.assert_not_called()
+    connection.begin.return_value.rollback.assert_called_once()
+
+    construct = connection.execute.call_args.args[0]
+    dialect = pg_psycopg2.dialect()
+    compiled = construct.compile(dialect=dialect)
+    assert str(compiled).startswith('EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) SELECT')
+
+    json_binds = [bind for bind in compiled.binds.values() if isinstance(bind.value, dict)]
+    assert len({repr(bind.value) for bind in json_binds}) == 4
+    for bind in json_binds:
+        processor = bind.type.bind_processor(dialect)
+        assert isinstance(processor(bind.value), str)
+
+
+# ========================================
+# AUDIT TESTS
+# ========================================
+
+def test_should_record_error_and_continue_when_one_query_fails(app, audit_tool, capsys):
+    """
+    Test: Per-query failures
+    Given: Three catalogued queries, the second of which fails to explain
+    When: Auditing them and printing the report
+    Then: The failure is recorded on that query's result, the others are still audited,
+          and the report lists the error
+    """
+    queries = [('first', MagicMock()), ('broken', MagicMock()), ('last', MagicMock())]
+
+    def fake_explain(query):
+        if query is queries[1][1]:
+            raise RuntimeError("can't adapt type 'dict'")
+        return PLAN[0]
+
+    with patch.object(audit_tool, 'sample_ids', return_value=SAMPLE_IDS), \
+         patch.object(audit_tool, 'hot_queries', return_value=queries), \
+         patch.object(audit_tool, 'explain', side_effect=fake_explain):
+        results = audit_tool.audit()
+
+    assert [result['name'] for result in results] == ['first', 'broken', 'last']
+    assert results[1] == {'name': 'broken', 'error': "can't adapt type 'dict'"}
+    assert results[2]['seq_scans'] == []
+
+    audit_tool.print_report(results)
+    report = capsys.readouterr().out
+    assert "can't adapt type 'dict'" in report
+    assert '3 queries audited, 0 with sequential scans, 1 failed' in report
@@ -0,0 +1,213 @@
+"""
+Static Asset Fingerprinting Unit Tests
+Covers manifest building, CSS reference rewriting, bundles and precompressed variants,
+static_url()/bundle_urls() and the immutable asset route
+"""
+import pytest
+import sys
+import os
+import gzip
+from flask import Flask, render_template_string
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../../..'))
+
+from app.utils import assets
+from app.utils.assets import build_manifest, load_manifest, init_assets
+
+
+def write(folder, name, content):
+    path = folder / name
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(content)
+
+
+# ========================================
+# FIXTURES
+# ========================================
+
+@pytest.fixture
+def static_folder(tmp_path, monkeypatch):
+    static = tmp_path / 'static'
+    write(static, 'css/base/variables.css', ':root { --accent: #2563eb; }')
+    write(static, 'css/main.css', "@import url('./base/variables.css');\nbody { background: url(data:image/png;base64,AA==); }")
+    write(static, 'js/main.js', 'console.log("main");')
+    write(static, 'js/pages/page.js', '/* page */\n' + '    window.page = "' + 'p' * 600 + '"\n')
+    write(static, 'uploads/photo.css', 'ignored')
+    monkeypatch.setattr(assets, 'BUNDLES', {
+        'site.css': ['css/main.css'],
+        'site.js': ['js/main.js', 'js/pages/page.js'],
+        'missing.js': ['js/absent.js'],
+    })
+    return static
+
+
+@pytest.fixture
+def app(static_folder, tmp_path):
+    app = Flask(__name__, static_folder=str(static_folder))
+    app.config.update(TESTING=True, ASSETS_FINGERPRINT=True, ASSETS_OUTPUT_FOLDER=str(static_folder / 'dist'))
+    init_assets(app)
+    return app
+
+
+# ========================================
+# MANIFEST TESTS
+# ========================================
+
+def test_should_fingerprint_assets_and_rewrite_css_imports_when_building(static_folder, tmp_path):
+    """
+    Test: Manifest build
+    Given: A stylesheet importing another, a script and an uploads folder
+    When: Building the manifest
+    Then: Every asset gets a hashed name, imports point at hashed names and uploads are skipped
+    """
+    output = tmp_path / 'dist'
+    manifest = build_manifest(static_folder, output)
+
+    assert sorted(manifest) == [
+        'bundles/site.css', 'bundles/site.js', 'css/base/variables.css', 'css/main.css', 'js/main.js', 'js/pages/page.js'
+    ]
+    assert manifest['js/main.js'].startswith('js/main.') and manifest['js/main.js'].endswith('.js')
+    main_css = (output / manifest['css/main.css']).read_text()
+    assert f"@import url('{manifest['css/base/variables.css'][len('css/'):]}')" in main_css
+    assert 'data:image/png' in main_css
+    assert load_manifest(output) == manifest
+
+
+def test_should_change_importing_stylesheet_name_when_imported_file_changes(static_folder, tmp_path):
+    """
+    Test: Transitive cache busting
+    Given: A built manifest
+    When: Only the imported stylesheet changes
+    Then: Both the imported and the importing stylesheet get new names; the script keeps its name
+    """
+    before = build_manifest(static_folder, tmp_path / 'dist')
+    write(static_folder, 'css/base/variables.css', ':root { --accent: #dc2626; }')
+    after = build_manifest(static_folder, tmp_path / 'dist')
+
+    assert after['css/base/variables.css'] != before['css/base/variables.css']
+    assert after['css/main.css'] != before['css/main.css']
+    assert after['js/main.js'] == before['js/main.js']
+
+
+# ========================================
+# FLASK INTEGRATION TESTS
+# ========================================
+
+def test_should_serve_fingerprinted_asset_with_immutable_headers_when_requested(app):
+    """
+    Test: Asset route
+    Given: An app with fingerprinting enabled
+    When: Rendering static_url() for a script and requesting that URL
+    Then: The file is served with a one-year public immutable Cache-Control
+    """
+    with app.test_request_context():
+        url = render_template_string("{{ static_url('js/main.js') }}")
+    assert url.startswith('/assets/js/main.')
+
+    response = app.test_client().get(url)
+    assert response.status_code == 200
+    assert response.get_data(as_text=True) == 'console.log("main");'
+    assert response.cache_control.max_age == 365 * 24 * 60 * 60
+    assert response.cache_control.immutable
+    assert response.cache_control.public
+    response.close()
+
+
+def test_should_fall_back_to_static_route_with_mtime_when_fingerprinting_is_off(static_folder, tmp_path):
+    """
+    Test: Development fallback
+    Given: An app with ASSETS_FINGERPRINT off
+    When: Rendering static_url() for a known and an unknown file
+    Then: Both use the plain static route, the known file versioned by its modification time
+    """
+    app = Flask(__name__, static_folder=str(static_folder))
+    app.config.update(TESTING=True, ASSETS_FINGERPRINT=False, ASSETS_OUTPUT_FOLDER=str(tmp_path / 'dist'))
+    init_assets(app)
+
+    with app.test_request_context():
+        mtime = int(os.path.getmtime(static_folder / 'js/main.js'))
+        assert render_template_string("{{ static_url('js/main.js') }}") == f'/static/js/main.js?v={mtime}'
+        assert render_template_string("{{ static_url('js/missing.js') }}") == '/static/js/missing.js'
+    assert not (tmp_path / 'dist').exists()
+
+
+# ========================================
+# BUNDLE TESTS
+# ========================================
+
+def test_should_inline_imports_and_concatenate_scripts_when_building_bundles(static_folder, tmp_path):
+    """
+    Test: Bundles
+    Given: A CSS bundle whose source imports another file and a two-file JS bundle
+    When: Building the manifest
+    Then: The CSS bundle contains the imported rules without @import, the JS bundle both
+          scripts in order, and bundles with missing sources are skipped
+    """
+    output = tmp_path / 'dist'
+    manifest = build_manifest(static_folder, output)
+
+    css = (output / manifest['bundles/site.css']).read_text()
+    assert '@import' not in css
+    assert css.index('--accent') < css.index('data:image/png')
+
+    js = (output / manifest['bundles/site.js']).read_text()
+    assert js.index('console.log("main")') < js.index('window.page')
+    assert 'bundles/missing.js' not in manifest
+
+
+def test_should_write_gzip_variant_only_when_file_is_large_enough(static_folder, tmp_path):
+    """
+    Test: Precompression
+    Given: A large script and a tiny one
+    When: Building the manifest
+    Then: The large one gets a .gz variant with identical content, the tiny one none
+    """
+    output = tmp_path / 'dist'
+    manifest = build_manifest(static_folder, output)
+
+    page = output / manifest['js/pages/page.js']
+    assert gzip.decompress((output / (manifest['js/pages/page.js'] + '.gz')).read_bytes()) == page.read_bytes()
+    assert not (output / (manifest['js/main.js'] + '.gz')).exists()
+
+
+def test_should_serve_gzip_variant_when_client_accepts_it(app):
+    """
+    Test: Content negotiation
+    Given: A fingerprinted script with a .gz variant
+    When: Requesting it with and without Accept-Encoding: gzip
+    Then: The compressed bytes are sent with Content-Encoding only to the accepting client,
+          both with the JavaScript content type and Vary: Accept-Encoding
+    """
+    with app.test_request_context():
+        url = render_template_string("{{ static_url('js/pages/page.js') }}")
+    client = app.test_client()
+
+    compressed = client.get(url, headers={'Accept-Encoding': 'gzip, deflate'})
+    plain = client.get(url)
+
+    assert compressed.headers['Content-Encoding'] == 'gzip'
+    assert gzip.decompress(compressed.get_data()) == plain.get_data()
+    assert 'Content-Encoding' not in plain.headers
+    for response in (compressed, plain):
+        assert response.mimetype in ('application/javascript', 'text/javascript')
+        assert 'Accept-Encoding' in response.headers['Vary']
+        response.close()
+
+
+def test_should_list_bundle_sources_when_bundles_are_not_built(static_folder, tmp_path):
+    """
+    Test: Development bundles
+    Given: Fingerprinting on in one app and off in another
+    When: Rendering bundle_urls('site.js')
+    Then: The first loads the single bundle, the second each source file in order
+    """
+    urls = {}
+    for enabled in (True, False):
+        app = Flask(__name__, static_folder=str(static_folder))
+        app.config.update(TESTING=True, ASSETS_FINGERPRINT=enabled, ASSETS_OUTPUT_FOLDER=str(tmp_path / 'dist'))
+        init_assets(app)
+        with app.test_request_context():
+            urls[enabled] = render_template_string("{{ bundle_urls('site.js') | join(' ') }}").split()
+
+    assert len(urls[True]) == 1 and urls[True][0].startswith('/assets/bundles/site.')
+    assert [url.split('?')[0] for url in urls[False]] == ['/static/js/main.js', '/static/js/pages/page.js']
@@ -0,0 +1,253 @@
+"""
+Cache Helper Unit Tests
+Covers the service and endpoint decorators and tag-based invalidation
+"""
+import pytest
+import sys
+import os
+from types import SimpleNamespace
+from flask import Flask, jsonify
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../../..'))
+
+from app.utils.cache import cached, cached_view, entity_tag, invalidate_tags, _invalidate_cache_tags
+
+
+class DictCache:
+    """Dictionary with the get/set/add/get_many/set_many subset of the Flask-Caching API"""
+
+    def __init__(self):
+        self.data = {}
+
+    def get(self, key):
+        return self.data.get(key)
+
+    def set(self, key, value, timeout=None):
+        self.data[key] = value
+        return True
+
+    def add(self, key, value, timeout=None):
+        if key in self.data:
+            return False
+        self.data[key] = value
+        return True
+
+    def get_many(self, *keys):
+        return [self.data.get(key) for key in keys]
+
+    def set_many(self, mapping, timeout=None):
+        self.data.update(mapping)
+        return list(mapping)
+
+
+class BrokenCache:
+    """Backend whose every call fails, like Redis during an outage"""
+
+    def __getattr__(self, name):
+        def fail(*args, **kwargs):
+            raise ConnectionError('Connection refused')
+        return fail
+
+
+# ========================================
+# FIXTURES
+# ========================================
+
+@pytest.fixture
+def app():
+    app = Flask(__name__)
+    app.config.update(TESTING=True, CACHE_TYPE='simple')
+    app.cache = DictCache()
+    with app.app_context():
+        yield app
+
+
+# ========================================
+# SERVICE DECORATOR TESTS
+# ========================================
+
+def test_should_return_stored_value_until_tag_is_invalidated(app):
+    """
+    Test: Service caching
+    Given: A function cached under a per-component tag
+    When: Calling it twice, invalidating the tag, then calling again
+    Then: The second call is a hit and the third recomputes
+    """
+    calls = []
+
+    @cached(tags=lambda component_id: [entity_tag('component', component_id)])
+    def payload(component_id):
+        calls.append(component_id)
+        return {'id': component_id, 'version': len(calls)}
+
+    assert payload(7) == {'id': 7, 'version': 1}
+    assert payload(7) == {'id': 7, 'version': 1}
+
+    invalidate_tags('component:8')
+    assert payload(7)['version'] == 1
+
+    invalidate_tags('component:7')
+    assert payload(7)['version'] == 2
+
+
+def test_should_invalidate_by_result_tags_when_related_entity_changes(app):
+    """
+    Test: Result tags
+    Given: A cached payload listing brand 3
+    When: Brand 3 is invalidated
+    Then: The payload is recomputed
+    """
+    calls = []
+
+    @cached(result_tags=lambda data: [entity_tag('brand', brand_id) for brand_id in data['brands']])
+    def payload():
+        calls.append(1)
+        return {'brands': [3]}
+
+    payload()
+    payload()
+    invalidate_tags('brand:3')
+    payload()
+
+    assert len(calls) == 2
+
+
+def test_should_share_entries_between_instances_when_skipping_self(app):
+    """
+    Test: Method keys
+    Given: A cached method with skip_self
+    When: Calling it on two instances with the same argument
+    Then: The second instance gets the first one's entry
+    """
+    class Service:
+        calls = 0
+
+        @cached(skip_self=True)
+        def load(self, item_id):
+            Service.calls += 1
+            return {'id': item_id}
+
+    Service().load(1)
+    Service().load(1)
+
+    assert Service.calls == 1
+
+
+def test_should_call_through_when_cache_is_disabled(app):
+    """
+    Test: Disabled cache
+    Given: A null cache type
+    When: Calling a cached function twice
+    Then: It runs both times
+    """
+    app.config['CACHE_TYPE'] = 'null'
+    calls = []
+
+    @cached()
+    def value():
+        calls.append(1)
+        return 1
+
+    value()
+    value()
+
+    assert len(calls) == 2
+
+
+def test_should_call_through_when_cache_backend_fails(app):
+    """
+    Test: Cache outage
+    Given: A cache backend that raises on every call
+    When: Calling a cached function and checking is_cached
+    Then: The function runs and returns normally and nothing raises
+    """
+    app.cache = BrokenCache()
+    calls = []
+
+    @cached(tags=['components'])
+    def value():
+        calls.append(1)
+        return {'ok': True}
+
+    assert value() == {'ok': True}
+    assert value.refresh() == {'ok': True}
+    assert value.is_cached() is False
+    assert len(calls) == 2
+
+
+# ========================================
+# ENDPOINT DECORATOR TESTS
+# ========================================
+
+def test_should_serve_successful_responses_from_cache_when_requested_again(app):
+    """
+    Test: View caching
+    Given: A cached GET endpoint that fails for one ID
+    When: Requesting each URL twice
+    Then: Successful responses are hits the second time, failures are never stored
+    """
+    calls = []
+
+    @app.route('/items/<int:item_id>')
+    @cached_view(tags=lambda item_id: [entity_tag('item', item_id)])
+    def item(item_id):
+        calls.append(item_id)
+        if item_id == 404:
+            return jsonify({'error': 'missing'}), 404
+        return jsonify({'id': item_id})
+
+    client = app.test_client()
+    first, second = client.get('/items/1'), client.get('/items/1')
+    client.get('/items/404')
+    client.get('/items/404')
+
+    assert first.headers['X-Cache'] == 'MISS'
+    assert second.headers['X-Cache'] == 'HIT'
+    assert second.get_json() == {'id': 1}
+    assert calls == [1, 404, 404]
+
+
+def test_should_serve_view_uncached_when_cache_backend_fails(app):
+    """
+    Test: View cache outage
+    Given: A cached GET endpoint and a cache backend that raises on every call
+    When: Requesting it
+    Then: The view runs and its response is returned without an X-Cache header
+    """
+    app.cache = BrokenCache()
+
+    @app.route('/items/<int:item_id>')
+    @cached_view(tags=lambda item_id: [entity_tag('item', item_id)])
+    def item(item_id):
+        return jsonify({'id': item_id})
+
+    response = app.test_client().get('/items/1')
+
+    assert response.status_code == 200
+    assert response.get_json() == {'id': 1}
+    assert 'X-Cache' not in response.headers
+
+
+# ========================================
+# SESSION HOOK TESTS
+# ========================================
+
+def test_should_invalidate_collected_tags_when_session_commits(app):
+    """
+    Test: Commit-time invalidation
+    Given: A session whose flushes collected a component tag
+    When: It commits
+    Then: Entries tagged with that component become misses
+    """
+    calls = []
+
+    @cached(tags=['component:5'])
+    def payload():
+        calls.append(1)
+        return {'ok': True}
+
+    payload()
+    _invalidate_cache_tags(SimpleNamespace(app=app, info={'cache_tags_pending': {'component:5'}}))
+    payload()
+
+    assert len(calls) == 2
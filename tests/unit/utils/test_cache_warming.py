@@ -0,0 +1,221 @@
+"""
+Cache Warming Unit Tests
+Covers the startup warmer and the background refresher's scheduling and leases
+"""
+import pytest
+import sys
+import os
+from flask import Flask
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../../..'))
+
+from app.utils import cache_warming
+from app.utils.cache import cached, invalidate_tags
+from app.utils.cache_warming import CacheRefresher, init_cache_warming, warm_cache
+from app.utils.two_tier_cache import MemoryBackend
+
+
+def make_app(cache):
+    app = Flask(__name__)
+    app.config.update(CACHE_TYPE='simple', CACHE_REFRESH_CHECK_SECONDS=5, CACHE_REFRESH_AHEAD=0.8)
+    app.cache = cache
+    return app
+
+
+def counting_job(timeout=300):
+    calls = []
+
+    @cached(timeout=timeout, tags=('components',))
+    def aggregate():
+        calls.append(1)
+        return {'version': len(calls)}
+
+    return aggregate, calls
+
+
+# ========================================
+# FIXTURES
+# ========================================
+
+@pytest.fixture
+def shared():
+    return MemoryBackend()
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Controllable time.monotonic for the refresher"""
+    now = [1000.0]
+    monkeypatch.setattr(cache_warming.time, 'monotonic', lambda: now[0])
+    return now
+
+
+# ========================================
+# WARMER TESTS
+# ========================================
+
+def test_should_fill_cache_and_render_index_pages_when_warming(shared, monkeypatch):
+    """
+    Test: Startup warming
+    Given: A warm task filling a cached aggregate and an index route
+    When: Warming the cache
+    Then: The aggregate is stored, the configured index pages are requested and timings reported
+    """
+    aggregate, calls = counting_job()
+    monkeypatch.setattr(cache_warming, 'WARM_TASKS', (('aggregate', aggregate.refresh),))
+    app = make_app(shared)
+    app.config['CACHE_WARM_INDEX_PAGES'] = 2
+    pages = []
+
+    @app.route('/')
+    def index():
+        from flask import request
+        pages.append(request.args['page'])
+        return 'ok'
+
+    results = warm_cache(app)
+
+    assert set(results) == {'aggregate', 'index_pages'}
+    assert all(isinstance(value, float) for value in results.values())
+    assert pages == ['1', '2']
+    with app.app_context():
+        assert aggregate.is_cached()
+        assert aggregate() == {'version': 1}
+    assert len(calls) == 1
+
+
+def test_should_report_failure_and_continue_when_a_task_raises(shared, monkeypatch):
+    """
+    Test: Failing warm task
+    Given: A first task that raises and a second that succeeds
+    When: Warming the cache
+    Then: The error is reported for the first task and the second still runs
+    """
+    aggregate, calls = counting_job()
+
+    def broken():
+        raise RuntimeError('database unavailable')
+
+    monkeypatch.setattr(cache_warming, 'WARM_TASKS', (('broken', broken), ('aggregate', aggregate.refresh)))
+    monkeypatch.setattr('app.db.session.rollback', lambda: None)
+    app = make_app(shared)
+    app.config['CACHE_WARM_INDEX_PAGES'] = 0
+
+    results = warm_cache(app)
+
+    assert results['broken'] == 'database unavailable'
+    assert isinstance(results['aggregate'], float)
+    assert len(calls) == 1
+
+
+def test_should_report_index_page_failure_when_status_is_not_200(shared, monkeypatch):
+    """
+    Test: Index page status
+    Given: An index route that redirects
+    When: Warming the cache
+    Then: The index_pages task is reported as failed instead of timed
+    """
+    monkeypatch.setattr(cache_warming, 'WARM_TASKS', ())
+    monkeypatch.setattr('app.db.session.rollback', lambda: None)
+    app = make_app(shared)
+
+    @app.route('/')
+    def index():
+        from flask import redirect
+        return redirect('/login')
+
+    results = warm_cache(app)
+
+    assert results['index_pages'] == 'index page 1 returned 302'
+
+
+def test_should_warm_only_from_cli_command_when_app_is_created_in_debug_mode(shared, monkeypatch):
+    """
+    Test: Warming outside the factory
+    Given: A debug app with the refresher enabled
+    When: Initialising cache warming, serving a request, then running `flask warm-cache`
+    Then: Initialisation sends no request, the app still serves, and the command warms
+    """
+    aggregate, calls = counting_job()
+    monkeypatch.setattr(cache_warming, 'WARM_TASKS', (('aggregate', aggregate.refresh),))
+    monkeypatch.setattr(CacheRefresher, 'ensure_running', lambda self: None)
+    app = make_app(shared)
+    app.debug = True
+    app.config.update(CACHE_REFRESH_ENABLED=True, CACHE_WARM_INDEX_PAGES=0)
+    pages = []
+
+    @app.route('/')
+    def index():
+        pages.append(1)
+        return 'ok'
+
+    init_cache_warming(app)
+    assert pages == [] and calls == []
+
+    assert app.test_client().get('/').status_code == 200
+    result = app.test_cli_runner().invoke(args=['warm-cache'])
+
+    assert result.exit_code == 0
+    assert 'aggregate: ' in result.output
+    assert len(calls) == 1
+
+
+# ========================================
+# REFRESHER TESTS
+# ========================================
+
+def test_should_refresh_job_before_it_expires_when_interval_passes(shared, clock):
+    """
+    Test: Refresh ahead of expiry
+    Given: A job with a 100 second timeout, refreshed once
+    When: Checking again after 50 and after 80 seconds
+    Then: Nothing happens at 50 seconds and the job is recomputed at 80
+    """
+    aggregate, calls = counting_job(timeout=100)
+    refresher = CacheRefresher(make_app(shared), [aggregate])
+
+    assert refresher.run_once() == [aggregate.key_prefix]
+    clock[0] += 50
+    assert refresher.run_once() == []
+    clock[0] += 30
+    shared.delete(f'refresh:due:{aggregate.key_prefix}')  # The first lease has expired by now
+    assert refresher.run_once() == [aggregate.key_prefix]
+    assert len(calls) == 2
+
+
+def test_should_refresh_once_across_workers_when_job_is_due(shared, clock):
+    """
+    Test: Shared leases
+    Given: Two workers' refreshers over one shared cache
+    When: The job is due in both
+    Then: Only the first worker recomputes it
+    """
+    aggregate, calls = counting_job()
+    worker_a = CacheRefresher(make_app(shared), [aggregate])
+    worker_b = CacheRefresher(make_app(shared), [aggregate])
+
+    assert worker_a.run_once() == [aggregate.key_prefix]
+    assert worker_b.run_once() == []
+    assert len(calls) == 1
+
+
+def test_should_recompute_at_next_check_when_write_invalidates_entry(shared, clock):
+    """
+    Test: Refresh after invalidation
+    Given: A freshly refreshed job
+    When: A write invalidates its tag
+    Then: The next check recomputes it, so readers find a current entry
+    """
+    aggregate, calls = counting_job()
+    app = make_app(shared)
+    refresher = CacheRefresher(app, [aggregate])
+    refresher.run_once()
+
+    with app.app_context():
+        invalidate_tags('components')
+        assert not aggregate.is_cached()
+
+    clock[0] += 5
+    assert refresher.run_once() == [aggregate.key_prefix]
+    with app.app_context():
+        assert aggregate() == {'version': 2}
@@ -0,0 +1,166 @@
+"""
+Response Compression Unit Tests
+Covers encoding negotiation, the size threshold, skipped responses and on-the-fly compression
+of streamed responses
+"""
+import pytest
+import sys
+import os
+import gzip
+import zlib
+from flask import Flask, Response, jsonify, stream_with_context
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../../..'))
+
+from app.utils import compression
+from app.utils.compression import init_compression, negotiate_encoding
+from werkzeug.datastructures import Accept
+
+
+LARGE_TEXT = 'component ' * 200
+
+
+# ========================================
+# FIXTURES
+# ========================================
+
+@pytest.fixture
+def app(monkeypatch):
+    monkeypatch.setattr(compression, 'brotli', None)
+    app = Flask(__name__)
+    app.config.update(TESTING=True, COMPRESS_MIN_SIZE=500)
+    consumed = []
+
+    @app.route('/large')
+    def large():
+        return Response(LARGE_TEXT, mimetype='text/html')
+
+    @app.route('/small')
+    def small():
+        return jsonify({'ok': True})
+
+    @app.route('/encoded')
+    def encoded():
+        response = Response(gzip.compress(LARGE_TEXT.encode()), mimetype='text/css')
+        response.headers['Content-Encoding'] = 'gzip'
+        return response
+
+    @app.route('/image')
+    def image():
+        return Response(b'\x89PNG' + b'\x00' * 2000, mimetype='image/png')
+
+    @app.route('/export.jsonl')
+    def export():
+        def lines():
+            for index in range(500):
+                consumed.append(index)
+                yield f'{{"id": {index}, "name": "Component {index}"}}\n'
+        return Response(stream_with_context(lines()), mimetype='application/x-ndjson')
+
+    app.consumed = consumed
+    init_compression(app)
+    return app
+
+
+# ========================================
+# NEGOTIATION TESTS
+# ========================================
+
+def test_should_prefer_brotli_when_installed_and_accepted(monkeypatch):
+    """
+    Test: Encoding negotiation
+    Given: Accept-Encoding headers with and without br, and brotli installed or not
+    When: Negotiating the encoding
+    Then: br wins when available, gzip is the fallback and q=0 or identity-only yields None
+    """
+    monkeypatch.setattr(compression, 'brotli', object())
+    assert negotiate_encoding(Accept([('gzip', 1), ('br', 1)])) == 'br'
+    assert negotiate_encoding(Accept([('gzip', 1), ('br', 0.5)])) == 'gzip'
+
+    monkeypatch.setattr(compression, 'brotli', None)
+    assert negotiate_encoding(Accept([('gzip', 1), ('br', 1)])) == 'gzip'
+    assert negotiate_encoding(Accept([('gzip', 0)])) is None
+    assert negotiate_encoding(Accept([('identity', 1)])) is None
+
+
+# ========================================
+# BUFFERED RESPONSE TESTS
+# ========================================
+
+def test_should_gzip_text_response_when_above_threshold_and_accepted(app):
+    """
+    Test: Buffered compression
+    Given: An HTML response larger than COMPRESS_MIN_SIZE
+    When: Requesting it with Accept-Encoding: gzip
+    Then: The body is gzipped with matching headers
+    """
+    response = app.test_client().get('/large', headers={'Accept-Encoding': 'gzip, deflate'})
+
+    assert response.headers['Content-Encoding'] == 'gzip'
+    assert 'Accept-Encoding' in response.vary
+    assert int(response.headers['Content-Length']) == len(response.get_data())
+    assert gzip.decompress(response.get_data()).decode() == LARGE_TEXT
+
+
+def test_should_send_identity_body_when_client_does_not_accept_gzip(app):
+    """
+    Test: No Accept-Encoding
+    Given: A large HTML response
+    When: Requesting it without Accept-Encoding
+    Then: The body is sent as is, still varying on Accept-Encoding for shared caches
+    """
+    response = app.test_client().get('/large')
+
+    assert 'Content-Encoding' not in response.headers
+    assert 'Accept-Encoding' in response.vary
+    assert response.get_data(as_text=True) == LARGE_TEXT
+
+
+def test_should_skip_small_non_text_and_already_encoded_responses(app):
+    """
+    Test: Skipped responses
+    Given: A small JSON body, a PNG and a precompressed stylesheet
+    When: Requesting them with Accept-Encoding: gzip
+    Then: None is (re)compressed
+    """
+    client = app.test_client()
+    headers = {'Accept-Encoding': 'gzip'}
+
+    small = client.get('/small', headers=headers)
+    assert 'Content-Encoding' not in small.headers
+    assert small.get_json() == {'ok': True}
+
+    image = client.get('/image', headers=headers)
+    assert 'Content-Encoding' not in image.headers
+
+    encoded = client.get('/encoded', headers=headers)
+    assert encoded.headers['Content-Encoding'] == 'gzip'
+    assert gzip.decompress(encoded.get_data()).decode() == LARGE_TEXT
+
+
+# ========================================
+# STREAMING TESTS
+# ========================================
+
+def test_should_compress_streamed_response_incrementally_when_accepted(app):
+    """
+    Test: Streamed compression
+    Given: A JSON Lines export yielding one line at a time
+    When: Requesting it with Accept-Encoding: gzip
+    Then: The generator is only consumed while the body is read, and the chunks decompress
+          to the full export
+    """
+    response = app.test_client().get('/export.jsonl', headers={'Accept-Encoding': 'gzip'}, buffered=False)
+
+    assert response.headers['Content-Encoding'] == 'gzip'
+    assert 'Content-Length' not in response.headers
+    assert len(app.consumed) < 500
+
+    decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+    body = b''.join(decompressor.decompress(chunk) for chunk in response.response) + decompressor.flush()
+    response.close()
+
+    lines = body.decode().splitlines()
+    assert len(lines) == 500
+    assert lines[-1] == '{"id": 499, "name": "Component 499"}'
+    assert len(app.consumed) == 500
@@ -0,0 +1,96 @@
+"""
+Database Utilities Unit Tests
+Covers chunked bulk writes with savepoint splitting
+"""
+import pytest
+import sys
+import os
+from unittest.mock import MagicMock, patch
+from sqlalchemy.exc import IntegrityError
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../../..'))
+
+from app.utils.database import safe_bulk_insert, safe_bulk_delete
+
+
+# ========================================
+# FIXTURES
+# ========================================
+
+@pytest.fixture
+def session(app):
+    """Mocked session whose flush fails while a 'bad' row is pending in the savepoint"""
+    with app.app_context():
+        with patch('app.utils.database.db.session') as mock_session:
+            state = {'pending': [], 'flushed': []}
+
+            def insert_mappings(model, chunk):
+                state['pending'] = list(chunk)
+
+            def flush():
+                pending, state['pending'] = state['pending'], []
+                if any(row.get('bad') for row in pending):
+                    raise IntegrityError('INSERT', {}, Exception('duplicate key'))
+                state['flushed'].extend(pending)
+
+            mock_session.bulk_insert_mappings.side_effect = insert_mappings
+            mock_session.flush.side_effect = flush
+            mock_session.begin_nested.return_value = MagicMock()
+            mock_session.state = state
+            yield mock_session
+
+
+# ========================================
+# BULK INSERT TESTS
+# ========================================
+
+def test_should_isolate_failing_rows_when_chunk_contains_bad_data(session):
+    """
+    Test: Savepoint splitting
+    Given: Ten rows where rows 3 and 7 violate a constraint
+    When: Bulk inserting them in one chunk
+    Then: Only the two bad rows are reported and the rest are written in a single commit
+    """
+    rows = [{'n': n, 'bad': n in (3, 7)} for n in range(10)]
+
+    success_count, error_count, errors = safe_bulk_insert(MagicMock(), rows, chunk_size=10)
+
+    assert (success_count, error_count) == (8, 2)
+    assert len(errors) == 2
+    assert "'n': 3" in errors[0] and "'n': 7" in errors[1]
+    assert sorted(row['n'] for row in session.state['flushed']) == [0, 1, 2, 4, 5, 6, 8, 9]
+    session.commit.assert_called_once()
+    session.rollback.assert_not_called()
+
+
+def test_should_flush_each_chunk_once_when_all_rows_are_valid(session):
+    """
+    Test: Chunking
+    Given: Five valid rows and a chunk size of two
+    When: Bulk inserting them
+    Then: Three chunks are flushed in savepoints and committed once
+    """
+    rows = [{'n': n} for n in range(5)]
+
+    result = safe_bulk_insert(MagicMock(), rows, chunk_size=2)
+
+    assert result == (5, 0, [])
+    assert session.begin_nested.call_count == 3
+    assert session.flush.call_count == 3
+    session.commit.assert_called_once()
+
+
+def test_should_report_every_row_when_final_commit_fails(session):
+    """
+    Test: Commit failure
+    Given: Valid rows whose transaction fails to commit
+    When: Bulk deleting them
+    Then: The transaction is rolled back and every row counts as failed
+    """
+    session.commit.side_effect = IntegrityError('COMMIT', {}, Exception('deferred constraint'))
+
+    success_count, error_count, errors = safe_bulk_delete([MagicMock(), MagicMock()])
+
+    assert (success_count, error_count) == (0, 2)
+    assert 'rolled back' in errors[0]
+    session.rollback.assert_called_once()
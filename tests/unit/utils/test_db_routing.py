@@ -0,0 +1,109 @@
+"""
+Read-Replica Routing Unit Tests
+Covers which statements RoutingSession sends to the replica bind
+"""
+import pytest
+import sys
+import os
+from sqlalchemy import select, update
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../../..'))
+
+from app import create_app, db
+from app.models import Brand
+from app.utils.db_routing import replica_reads, read_only
+from config import Config
+
+
+class ReplicaConfig(Config):
+    TESTING = True
+    WTF_CSRF_ENABLED = False
+    SQLALCHEMY_BINDS = {'replica': 'postgresql://replica_user@replica-host:5432/promo_database'}
+
+
+# ========================================
+# FIXTURES
+# ========================================
+
+@pytest.fixture
+def replica_app():
+    """App with a replica bind; engines are created but never connected"""
+    app = create_app(ReplicaConfig)
+    with app.test_request_context('/'):
+        yield app
+        db.session.remove()
+
+
+@pytest.fixture
+def engines(replica_app):
+    return db.get_engine(replica_app), db.get_engine(replica_app, bind='replica')
+
+
+# ========================================
+# ROUTING TESTS
+# ========================================
+
+def test_should_use_primary_when_reads_are_not_marked_read_only(engines):
+    """
+    Test: Default routing
+    Given: A configured replica
+    When: Selecting outside any read-only scope
+    Then: The primary engine is used
+    """
+    primary, _ = engines
+
+    assert db.session.get_bind(clause=select(Brand.id)) is primary
+
+
+def test_should_use_replica_when_selecting_in_read_only_scope(engines):
+    """
+    Test: Read-only scope
+    Given: A configured replica
+    When: Selecting inside replica_reads()
+    Then: Plain selects use the replica, SELECT ... FOR UPDATE and DML use the primary
+    """
+    primary, replica = engines
+
+    with replica_reads():
+        assert db.session.get_bind(clause=select(Brand.id)) is replica
+        assert db.session.get_bind(clause=select(Brand.id).with_for_update()) is primary
+        assert db.session.get_bind(clause=update(Brand).values(name='x')) is primary
+
+
+def test_should_keep_reads_on_primary_when_session_has_written(engines):
+    """
+    Test: Read-your-writes
+    Given: A session that already issued a DML statement
+    When: Selecting inside a read-only service method
+    Then: The primary engine is used
+    """
+    primary, _ = engines
+
+    @read_only
+    def lookup():
+        return db.session.get_bind(clause=select(Brand.id))
+
+    db.session.get_bind(clause=update(Brand).values(name='x'))
+
+    assert lookup() is primary
+
+
+def test_should_route_get_only_endpoint_to_replica_when_request_starts(replica_app, engines):
+    """
+    Test: Request routing
+    Given: A GET-only endpoint and a GET/POST form endpoint
+    When: Each is requested with GET
+    Then: Only the GET-only endpoint reads from the replica
+    """
+    primary, replica = engines
+    before_request = replica_app.before_request_funcs[None][-1]
+
+    with replica_app.test_request_context('/api/components/export.jsonl'):
+        before_request()
+        assert db.session.get_bind(clause=select(Brand.id)) is replica
+        db.session.remove()
+
+    with replica_app.test_request_context('/component/new'):
+        before_request()
+        assert db.session.get_bind(clause=select(Brand.id)) is primary
+        db.session.remove()
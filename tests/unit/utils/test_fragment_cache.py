@@ -0,0 +1,173 @@
+"""
+Fragment Cache Unit Tests
+Covers the {% cache %} template tag, its keys and its invalidation tags
+"""
+import pytest
+import sys
+import os
+from datetime import datetime
+from flask import Flask, render_template_string
+from jinja2 import DictLoader
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../../..'))
+
+from app.models import Component, Keyword, ComponentBrand
+from app.utils.cache import entity_tag, invalidate_tags
+from app.utils.fragment_cache import component_fragment_tags, fragment_key
+from app.utils.two_tier_cache import MemoryBackend
+
+
+CARD_TEMPLATE = "{% for component in components %}{% cache 'card', component %}{% include 'card.html' %}{% endcache %}{% endfor %}"
+
+
+# ========================================
+# FIXTURES
+# ========================================
+
+@pytest.fixture
+def renders():
+    return []
+
+
+@pytest.fixture
+def app(renders):
+    app = Flask(__name__)
+    app.config.update(TESTING=True, CACHE_TYPE='simple', FRAGMENT_CACHE_TIMEOUT=60)
+    app.jinja_env.add_extension('app.utils.fragment_cache.FragmentCacheExtension')
+    app.jinja_loader = DictLoader({'card.html': '<b>{{ component.product_number }}:{{ count() }}</b>'})
+    app.jinja_env.globals['count'] = lambda: renders.append(1) or len(renders)
+    app.cache = MemoryBackend()
+    with app.app_context():
+        yield app
+
+
+def component(component_id=1, updated_at=datetime(2024, 1, 1), product_number='P-1'):
+    return Component(id=component_id, product_number=product_number, updated_at=updated_at)
+
+
+# ========================================
+# RENDERING TESTS
+# ========================================
+
+def test_should_serve_unchanged_fragment_from_cache_when_rendered_again(app, renders):
+    """
+    Test: Fragment hit
+    Given: A cached card block around an include using the loop variable
+    When: Rendering the same component twice
+    Then: The include runs once and both renders produce the same markup
+    """
+    first = render_template_string(CARD_TEMPLATE, components=[component()])
+    second = render_template_string(CARD_TEMPLATE, components=[component()])
+
+    assert first == second == '<b>P-1:1</b>'
+    assert len(renders) == 1
+
+
+def test_should_render_again_when_updated_at_changes(app, renders):
+    """
+    Test: Versioned keys
+    Given: A cached card
+    When: The component's updated_at changes
+    Then: The card is rendered with the new data
+    """
+    render_template_string(CARD_TEMPLATE, components=[component()])
+    html = render_template_string(
+        CARD_TEMPLATE, components=[component(updated_at=datetime(2024, 1, 2), product_number='P-2')]
+    )
+
+    assert html == '<b>P-2:2</b>'
+
+
+def test_should_render_again_when_component_tag_is_invalidated(app, renders):
+    """
+    Test: Invalidation by variant/picture writes
+    Given: A cached card
+    When: The component's tag is invalidated (as a variant or picture commit does)
+    Then: Only that component's card is rendered again
+    """
+    render_template_string(CARD_TEMPLATE, components=[component(1), component(2)])
+    invalidate_tags(entity_tag('component', 2))
+    render_template_string(CARD_TEMPLATE, components=[component(1), component(2)])
+
+    assert len(renders) == 3
+
+
+def test_should_escape_nothing_twice_when_serving_cached_markup(app):
+    """
+    Test: Markup safety
+    Given: A fragment containing HTML and an escaped value
+    When: Serving it from the cache
+    Then: The HTML is output as is and the value stays escaped once
+    """
+    template = "{% cache 'x', 1 %}<i>{{ value }}</i>{% endcache %}"
+    render_template_string(template, value='<script>')
+
+    assert render_template_string(template, value='<script>') == '<i>&lt;script&gt;</i>'
+
+
+def test_should_render_block_when_cache_backend_fails(app, renders):
+    """
+    Test: Fragment cache outage
+    Given: A cache backend whose reads and writes raise
+    When: Rendering a cached card twice
+    Then: The block renders both times instead of failing the page
+    """
+    def fail(*args, **kwargs):
+        raise ConnectionError('Connection refused')
+
+    app.cache.get = app.cache.set = fail
+
+    first = render_template_string(CARD_TEMPLATE, components=[component()])
+    second = render_template_string(CARD_TEMPLATE, components=[component()])
+
+    assert (first, second) == ('<b>P-1:1</b>', '<b>P-1:2</b>')
+
+
+def test_should_render_every_time_when_fragment_cache_is_disabled(app, renders):
+    """
+    Test: Switch
+    Given: FRAGMENT_CACHE_ENABLED set to False
+    When: Rendering a card twice
+    Then: The include runs both times
+    """
+    app.config['FRAGMENT_CACHE_ENABLED'] = False
+    render_template_string(CARD_TEMPLATE, components=[component()])
+    render_template_string(CARD_TEMPLATE, components=[component()])
+
+    assert len(renders) == 2
+
+
+# ========================================
+# KEY AND TAG TESTS
+# ========================================
+
+def test_should_build_same_key_when_instances_differ_but_versions_match():
+    """
+    Test: Stable keys
+    Given: Two instances of the same component row
+    When: Building fragment keys with the same extra arguments
+    Then: The keys match, and differ from another name or argument
+    """
+    key = fragment_key('card', component(), 'search')
+
+    assert key == fragment_key('card', component(), 'search')
+    assert key != fragment_key('card', component(), '')
+    assert key != fragment_key('header', component(), 'search')
+
+
+def test_should_tag_related_rows_when_they_are_loaded():
+    """
+    Test: Fragment tags
+    Given: A component with a supplier, keywords, a brand and index variant dicts
+    When: Computing its fragment tags
+    Then: The component and every displayed related row are tagged
+    """
+    item = component(7)
+    item.supplier_id = 3
+    item.keywords = [Keyword(id=11, name='soft')]
+    item.brand_associations = [ComponentBrand(brand_id=5)]
+    item._cached_variants = [{'id': 1, 'color_id': 9}]
+
+    assert component_fragment_tags(item) == {
+        'component:7', 'supplier:3', 'keyword:11', 'brand:5', 'color:9'
+    }
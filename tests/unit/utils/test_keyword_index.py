@@ -0,0 +1,85 @@
+"""
+KeywordIndex Unit Tests
+Covers prefix and fuzzy lookups of the in-memory keyword suggestion index
+"""
+import pytest
+import sys
+import os
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../../..'))
+
+from app.utils.keyword_index import KeywordIndex
+
+
+# ========================================
+# FIXTURES
+# ========================================
+
+@pytest.fixture
+def index():
+    """Index over a handful of fabric keywords"""
+    return KeywordIndex([
+        (1, 'polyester'),
+        (2, 'Polyamide'),
+        (3, 'cotton'),
+        (4, 'poly-cotton'),
+        (5, 'shiny'),
+    ])
+
+
+# ========================================
+# PREFIX TESTS
+# ========================================
+
+def test_should_return_case_insensitive_prefix_matches_in_name_order(index):
+    """
+    Test: Prefix lookup
+    Given: Keywords sharing the "poly" prefix with mixed case
+    When: Looking up the prefix "POLY"
+    Then: All matches are returned in name order, up to the limit
+    """
+    assert index.prefix('POLY', 10) == [(4, 'poly-cotton'), (2, 'Polyamide'), (1, 'polyester')]
+    assert index.prefix('poly', 1) == [(4, 'poly-cotton')]
+
+
+def test_should_reflect_renames_and_deletes_when_index_is_updated(index):
+    """
+    Test: Incremental updates
+    Given: An existing index
+    When: A keyword is renamed, another deleted and a new one added
+    Then: Lookups reflect the changes without a rebuild
+    """
+    index.add(5, 'glossy')
+    index.remove(3)
+    index.add(6, 'cord')
+
+    assert index.prefix('shi', 10) == []
+    assert index.prefix('co', 10) == [(6, 'cord')]
+    assert len(index) == 5
+
+
+# ========================================
+# FUZZY TESTS
+# ========================================
+
+def test_should_find_misspellings_when_similarity_above_threshold(index):
+    """
+    Test: Fuzzy lookup
+    Given: A misspelled query
+    When: Looking up fuzzy matches above 0.6 similarity
+    Then: The intended keyword ranks first and excluded IDs are skipped
+    """
+    matches = index.fuzzy('polyestr', 0.6)
+
+    assert matches[0][:2] == (1, 'polyester')
+    assert all(keyword_id != 1 for keyword_id, _, _ in index.fuzzy('polyestr', 0.6, exclude={1}))
+
+
+def test_should_return_nothing_when_query_shares_no_trigrams(index):
+    """
+    Test: Unrelated queries
+    Given: A query sharing no character trigrams with any keyword
+    When: Looking up fuzzy matches
+    Then: No keyword is compared or returned
+    """
+    assert index.fuzzy('xyz', 0.1) == []
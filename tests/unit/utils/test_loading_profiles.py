@@ -0,0 +1,77 @@
+"""
+Component Loading Profile Unit Tests
+Covers the profile registry and the cheap default relationship loading
+"""
+import pytest
+import sys
+import os
+from sqlalchemy import inspect
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../../..'))
+
+from app.models import Component
+from app.utils.loading_profiles import COMPONENT_PROFILES, component_profile
+
+
+def _loaded_paths(options):
+    """Component relationship keys the options start from"""
+    return {option.path[0].key for option in options}
+
+
+# ========================================
+# DEFAULT LOADING TESTS
+# ========================================
+
+def test_should_load_every_component_relationship_lazily_when_no_profile_is_given():
+    """
+    Test: Default loading
+    Given: The Component mapper
+    When: Inspecting relationship loader strategies
+    Then: None of them loads eagerly, so a plain Component query is a single statement
+    """
+    strategies = {rel.key: rel.lazy for rel in inspect(Component).relationships}
+
+    assert strategies['keywords'] is True
+    assert strategies['categories'] is True
+    assert all(lazy in ('select', True) for lazy in strategies.values())
+
+
+# ========================================
+# PROFILE TESTS
+# ========================================
+
+def test_should_return_fresh_options_when_profile_is_requested_twice():
+    """
+    Test: Profile registry
+    Given: Every registered profile
+    When: Requesting each one twice
+    Then: Each call returns a new, non-empty list of loader options
+    """
+    assert set(COMPONENT_PROFILES) == {'minimal', 'listing', 'detail', 'edit', 'export'}
+    for name in COMPONENT_PROFILES:
+        first, second = component_profile(name), component_profile(name)
+        assert first and first is not second
+
+
+def test_should_load_collections_shown_on_list_pages_when_using_listing_profile():
+    """
+    Test: Listing profile
+    Given: The listing profile
+    When: Collecting the relationships it loads
+    Then: Lookups and list-item collections are included but variants are not
+    """
+    paths = _loaded_paths(component_profile('listing'))
+
+    assert {'component_type', 'supplier', 'pictures', 'keywords', 'categories', 'brand_associations'} <= paths
+    assert 'variants' not in paths
+
+
+def test_should_raise_error_when_profile_is_unknown():
+    """
+    Test: Unknown profile
+    Given: A profile name that is not registered
+    When: Requesting its options
+    Then: ValueError names the profile
+    """
+    with pytest.raises(ValueError, match='everything'):
+        component_profile('everything')
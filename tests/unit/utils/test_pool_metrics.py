@@ -0,0 +1,63 @@
+"""
+Pool Metrics Unit Tests
+Covers checkout instrumentation of InstrumentedQueuePool
+"""
+import pytest
+import sys
+import os
+from sqlalchemy import create_engine, exc
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../../..'))
+
+from app.utils.pool_metrics import InstrumentedQueuePool, pool_status
+
+
+# ========================================
+# FIXTURES
+# ========================================
+
+@pytest.fixture
+def engine():
+    """Single-connection SQLite engine with no overflow and a short timeout"""
+    engine = create_engine(
+        'sqlite://', poolclass=InstrumentedQueuePool, pool_size=1, max_overflow=0, pool_timeout=0.05
+    )
+    yield engine
+    engine.dispose()
+
+
+# ========================================
+# CHECKOUT TESTS
+# ========================================
+
+def test_should_count_checkouts_and_in_use_when_connections_are_held(engine):
+    """
+    Test: Checkout tracking
+    Given: An instrumented pool of one connection
+    When: Checking a connection out twice in sequence
+    Then: Both checkouts are counted and the peak in-use count is one
+    """
+    with engine.connect() as connection:
+        assert pool_status(engine)['in_use'] == 1
+    with engine.connect():
+        pass
+
+    status = pool_status(engine)
+    assert status['checkouts'] == 2
+    assert status['peak_in_use'] == 1
+    assert status['in_use'] == 0
+    assert status['max_connections'] == 1
+
+
+def test_should_record_timeout_when_pool_is_exhausted(engine):
+    """
+    Test: Saturation
+    Given: An instrumented pool whose only connection is in use
+    When: Another checkout is attempted
+    Then: The checkout times out and the timeout is counted
+    """
+    with engine.connect():
+        with pytest.raises(exc.TimeoutError):
+            engine.connect()
+
+    assert pool_status(engine)['timeouts'] == 1
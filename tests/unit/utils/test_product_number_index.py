@@ -0,0 +1,107 @@
+"""
+Product-Number Index Unit Tests
+Covers pair lookups, exclusion in edit mode, miss short-circuiting and commit-time updates
+"""
+import pytest
+import sys
+import os
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../../..'))
+
+import app.utils.product_number_index as product_number_index
+from app.utils.product_number_index import ProductNumberIndex, find_duplicate
+
+
+# ========================================
+# FIXTURES
+# ========================================
+
+@pytest.fixture
+def index(monkeypatch):
+    """Process index preloaded with two suppliers' components"""
+    built = ProductNumberIndex(
+        [(1, 10, 'SHIRT-1'), (2, 10, 'SHIRT-2'), (3, None, 'LOOSE-1'), (4, None, 'LOOSE-1')],
+        [10, 11]
+    )
+    monkeypatch.setattr(product_number_index, '_index', built)
+    return built
+
+
+# ========================================
+# LOOKUP TESTS
+# ========================================
+
+def test_should_report_holders_per_supplier_when_pair_is_indexed(index):
+    """
+    Test: Pair lookup
+    Given: The same product number under one supplier and without a supplier
+    When: Looking up holders
+    Then: Only components of the matching supplier are returned
+    """
+    assert index.holders(10, 'SHIRT-1') == {1}
+    assert index.holders(11, 'SHIRT-1') == set()
+    assert index.holders(None, 'LOOSE-1') == {3, 4}
+    assert index.holders(10, 'shirt-1') == set()
+
+
+def test_should_ignore_current_component_when_excluded_in_edit_mode(index):
+    """
+    Test: Edit mode
+    Given: A component editing its own unchanged product number
+    When: Looking up holders excluding it
+    Then: The pair is free
+    """
+    assert index.holders(10, 'SHIRT-1', exclude_id=1) == set()
+
+
+def test_should_answer_without_database_when_pair_is_not_indexed(index):
+    """
+    Test: Miss short-circuit
+    Given: A product number no indexed component uses
+    When: Looking for a duplicate outside any app context
+    Then: None is returned without touching the database
+    """
+    assert find_duplicate('NEW-1', 10) is None
+    assert find_duplicate('SHIRT-1', 10, exclude_id=1) is None
+
+
+# ========================================
+# COMMIT HOOK TESTS
+# ========================================
+
+def test_should_apply_rename_and_delete_when_session_commits(index):
+    """
+    Test: Commit-time maintenance
+    Given: Pending changes renaming one component, deleting another and adding a supplier
+    When: The session commits
+    Then: The index reflects every change
+    """
+    session = SimpleNamespace(info={product_number_index._PENDING_KEY: [
+        ('remove', 1, 10, 'SHIRT-1'),
+        ('add', 1, 10, 'SHIRT-1B'),
+        ('remove', 2, 10, 'SHIRT-2'),
+        ('add_supplier', 12, None, None),
+    ]})
+
+    product_number_index._apply_component_changes(session)
+
+    assert index.holders(10, 'SHIRT-1') == set()
+    assert index.holders(10, 'SHIRT-1B') == {1}
+    assert index.holders(10, 'SHIRT-2') == set()
+    assert index.has_supplier(12)
+    assert session.info == {}
+
+
+def test_should_drop_index_when_bulk_statement_was_committed(index):
+    """
+    Test: Bulk changes
+    Given: A session that ran a bulk statement against the component table
+    When: The session commits
+    Then: The index is discarded and rebuilt on next use
+    """
+    session = SimpleNamespace(info={product_number_index._REBUILD_KEY: True})
+
+    product_number_index._apply_component_changes(session)
+
+    assert product_number_index._index is None
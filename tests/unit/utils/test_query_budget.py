@@ -0,0 +1,132 @@
+"""
+Query Budget Unit Tests
+Covers statement counting, shape grouping and per-request budget enforcement
+"""
+import pytest
+import sys
+import os
+from flask import Flask
+from sqlalchemy import create_engine, text
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../../..'))
+
+from app.utils.query_budget import (
+    count_queries, statement_shape, query_budget, init_query_budget, QueryBudgetExceeded
+)
+
+
+# ========================================
+# FIXTURES
+# ========================================
+
+@pytest.fixture
+def engine():
+    engine = create_engine('sqlite://')
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def budget_app(engine):
+    """Minimal app with one endpoint that queries in a loop and one that batches"""
+    app = Flask(__name__)
+    app.config.update(TESTING=True, QUERY_BUDGET_ENABLED=True, QUERY_BUDGET_RAISE=True,
+                      QUERY_BUDGET_DEFAULT=50, QUERY_REPEAT_THRESHOLD=5)
+    init_query_budget(app)
+
+    @app.route('/loop')
+    def loop():
+        with engine.connect() as connection:
+            for item_id in range(6):
+                connection.execute(text('SELECT :id'), {'id': item_id})
+        return 'ok'
+
+    @app.route('/batched')
+    @query_budget(1)
+    def batched():
+        with engine.connect() as connection:
+            connection.execute(text('SELECT 1'))
+        return 'ok'
+
+    @app.route('/over-budget')
+    @query_budget(1)
+    def over_budget():
+        with engine.connect() as connection:
+            connection.execute(text('SELECT 1'))
+            connection.execute(text('SELECT 2'))
+        return 'ok'
+
+    return app
+
+
+# ========================================
+# SHAPE TESTS
+# ========================================
+
+def test_should_give_same_shape_when_statements_differ_only_in_parameters():
+    """
+    Test: Shape normalization
+    Given: Two statements with different parameter names, IN-list lengths and limits
+    When: Normalizing them
+    Then: Both produce the same shape
+    """
+    first = 'SELECT * FROM picture WHERE variant_id IN (%(id_1_1)s, %(id_1_2)s)\n LIMIT 5'
+    second = 'SELECT * FROM picture WHERE variant_id IN (%(id_1_1)s, %(id_1_2)s, %(id_1_3)s) LIMIT 10'
+
+    assert statement_shape(first) == statement_shape(second)
+    assert statement_shape(first) == 'SELECT * FROM picture WHERE variant_id IN (?) LIMIT N'
+
+
+def test_should_group_repeated_statements_when_counting_a_block(engine):
+    """
+    Test: Block counting
+    Given: A loop executing the same statement with different parameters
+    When: Counting queries around it
+    Then: Every execution is counted and grouped under one shape
+    """
+    with count_queries() as queries:
+        with engine.connect() as connection:
+            for item_id in range(3):
+                connection.execute(text('SELECT :id'), {'id': item_id})
+
+    assert queries.count == 3
+    assert queries.repeated(3) == [('SELECT ?', 3)]
+
+
+# ========================================
+# REQUEST BUDGET TESTS
+# ========================================
+
+def test_should_report_query_count_when_endpoint_is_within_budget(budget_app):
+    """
+    Test: Within budget
+    Given: An endpoint declaring a budget of one query
+    When: It executes one query
+    Then: The response succeeds and reports the count
+    """
+    response = budget_app.test_client().get('/batched')
+
+    assert response.status_code == 200
+    assert response.headers['X-Query-Count'] == '1'
+
+
+def test_should_fail_when_endpoint_exceeds_declared_budget(budget_app):
+    """
+    Test: Over budget
+    Given: An endpoint declaring a budget of one query
+    When: It executes two queries
+    Then: QueryBudgetExceeded is raised
+    """
+    with pytest.raises(QueryBudgetExceeded, match='2 queries'):
+        budget_app.test_client().get('/over-budget')
+
+
+def test_should_fail_when_endpoint_repeats_a_statement_in_a_loop(budget_app):
+    """
+    Test: N+1 detection
+    Given: An endpoint within the default budget that runs one statement per item
+    When: It is requested
+    Then: QueryBudgetExceeded names the repeated statement
+    """
+    with pytest.raises(QueryBudgetExceeded, match=r'6x SELECT \?'):
+        budget_app.test_client().get('/loop')
@@ -0,0 +1,117 @@
+"""
+Slow-Query Log Unit Tests
+Covers parameter redaction, recording through engine events and offender ranking
+"""
+import pytest
+import sys
+import os
+from datetime import datetime
+from sqlalchemy import create_engine, text
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../../..'))
+
+from app.utils.slow_query_log import (
+    SlowQueryRecorder, redact_parameters, rank_offenders, slow_query_recorder, _ensure_listeners
+)
+
+
+# ========================================
+# FIXTURES
+# ========================================
+
+@pytest.fixture
+def recorder():
+    """Global recorder capturing every statement, restored afterwards"""
+    settings = (slow_query_recorder.threshold_ms, slow_query_recorder.explain_ms,
+                slow_query_recorder._entries.maxlen, slow_query_recorder.persist)
+    slow_query_recorder.clear()
+    slow_query_recorder.configure(threshold_ms=0, explain_ms=10 ** 6, buffer_size=10, persist=False)
+    _ensure_listeners()
+    yield slow_query_recorder
+    slow_query_recorder.clear()
+    slow_query_recorder.configure(*settings)
+
+
+def _entry(shape, duration_ms, endpoint=None):
+    return {'recorded_at': datetime.utcnow(), 'duration_ms': duration_ms, 'shape': shape,
+            'statement': shape, 'parameters': {}, 'endpoint': endpoint, 'plan': None}
+
+
+# ========================================
+# REDACTION TESTS
+# ========================================
+
+def test_should_keep_only_numbers_and_flags_when_redacting_parameters():
+    """
+    Test: Redaction
+    Given: Parameters with IDs, a search term, a flag, a NULL and a list
+    When: Redacting them
+    Then: Strings are replaced by their type and length, everything numeric is kept
+    """
+    redacted = redact_parameters({
+        'id_1': 42, 'name_1': 'secret@example.com', 'active': True, 'note': None, 'ids': [1, 'x']
+    })
+
+    assert redacted == {'id_1': 42, 'name_1': '<str:18>', 'active': True, 'note': None, 'ids': [1, '<str:1>']}
+
+
+# ========================================
+# RECORDING TESTS
+# ========================================
+
+def test_should_record_statement_shape_and_duration_when_query_is_slow(recorder):
+    """
+    Test: Recording
+    Given: A zero threshold
+    When: A statement with a string parameter runs through an engine
+    Then: It is recorded with its shape, redacted parameters and a duration
+    """
+    engine = create_engine('sqlite://')
+    with engine.connect() as connection:
+        connection.execute(text('SELECT :term'), {'term': 'polyester'})
+    engine.dispose()
+
+    entry = recorder.entries()[-1]
+    assert entry['shape'] == 'SELECT ?'
+    assert entry['parameters'] == ['<str:9>']
+    assert entry['duration_ms'] >= 0
+    assert entry['endpoint'] is None
+
+
+def test_should_drop_oldest_entries_when_buffer_is_full():
+    """
+    Test: Ring buffer
+    Given: A recorder holding three entries
+    When: Five statements are recorded
+    Then: Only the three most recent are kept
+    """
+    small = SlowQueryRecorder(threshold_ms=0, buffer_size=3)
+
+    for number in range(5):
+        small.record(f'SELECT {number}', {}, float(number))
+
+    assert [entry['duration_ms'] for entry in small.entries()] == [2.0, 3.0, 4.0]
+
+
+# ========================================
+# RANKING TESTS
+# ========================================
+
+def test_should_rank_shapes_by_total_time_when_aggregating():
+    """
+    Test: Top offenders
+    Given: A frequent fast shape and a rare slow shape
+    When: Ranking offenders
+    Then: Shapes are ordered by total time with counts, averages, maxima and endpoints
+    """
+    entries = [_entry('SELECT a', 300, 'component_web.index') for _ in range(4)]
+    entries += [_entry('SELECT b', 1000, 'supplier_web.suppliers')]
+
+    ranked = rank_offenders(entries)
+
+    assert [group['shape'] for group in ranked] == ['SELECT a', 'SELECT b']
+    assert ranked[0]['count'] == 4
+    assert ranked[0]['total_ms'] == 1200
+    assert ranked[0]['avg_ms'] == 300
+    assert ranked[0]['endpoints'] == ['component_web.index']
+    assert ranked[1]['max_ms'] == 1000
@@ -0,0 +1,277 @@
+"""
+Two-Tier Cache Unit Tests
+Covers the local LRU, the shared fall-through and cross-worker invalidation, with the in-memory
+stand-ins playing Redis
+"""
+import pytest
+import sys
+import os
+import time
+from types import SimpleNamespace
+from flask import Flask
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../../..'))
+
+from app.utils.cache import cached, entity_tag, invalidate_tags
+from app.utils import two_tier_cache
+from app.utils.two_tier_cache import LocalLRU, TwoTierCache, MemoryBackend, MemoryBroadcaster, RedisBroadcaster
+
+
+class CountingBackend(MemoryBackend):
+    """MemoryBackend that counts reads, to tell local hits from shared ones"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.reads = 0
+
+    def get(self, key):
+        self.reads += 1
+        return super().get(key)
+
+
+class FlakyRedis:
+    """Redis client stand-in whose pub/sub subscribe fails while down is set"""
+
+    def __init__(self):
+        self.down = True
+        self.subscribes = 0
+
+    def pubsub(self, ignore_subscribe_messages=False):
+        return self
+
+    def subscribe(self, **handlers):
+        self.subscribes += 1
+        if self.down:
+            raise ConnectionError('Connection refused')
+
+    def run_in_thread(self, sleep_time=0, daemon=False):
+        return SimpleNamespace(is_alive=lambda: True, stop=lambda: None)
+
+
+# ========================================
+# FIXTURES
+# ========================================
+
+@pytest.fixture
+def shared():
+    return CountingBackend()
+
+
+@pytest.fixture
+def workers(shared):
+    """Two TwoTierCaches over one shared backend, as two worker processes would be"""
+    hub = []
+    return (
+        TwoTierCache(shared, LocalLRU(), MemoryBroadcaster(hub)),
+        TwoTierCache(shared, LocalLRU(), MemoryBroadcaster(hub)),
+    )
+
+
+# ========================================
+# LOCAL TIER TESTS
+# ========================================
+
+def test_should_serve_repeated_reads_locally_when_value_was_fetched_once(workers, shared):
+    """
+    Test: Local hits
+    Given: A value written by worker A
+    When: Worker B reads it three times
+    Then: Only the first read reaches the shared tier
+    """
+    worker_a, worker_b = workers
+    worker_a.set('key', {'value': 1})
+
+    assert [worker_b.get('key') for _ in range(3)] == [{'value': 1}] * 3
+    assert shared.reads == 1
+    assert worker_b.stats()['hits'] == 2
+
+
+def test_should_evict_least_recently_used_when_entry_limit_is_reached():
+    """
+    Test: LRU eviction by entries
+    Given: A local tier holding two entries
+    When: Reading the first entry, then storing a third
+    Then: The second entry (least recently used) is evicted
+    """
+    local = LocalLRU(max_entries=2)
+    local.set('a', 1)
+    local.set('b', 2)
+    local.get('a')
+    local.set('c', 3)
+
+    assert local.get('a') == (True, 1)
+    assert local.get('b') == (False, None)
+    assert local.get('c') == (True, 3)
+    assert local.evictions == 1
+
+
+def test_should_evict_when_byte_limit_is_exceeded_and_skip_oversized_values():
+    """
+    Test: LRU eviction by size
+    Given: A local tier with a small byte budget
+    When: Storing values until the budget is exceeded, and one value above a tenth of it
+    Then: Old entries are evicted, the oversized value is never stored locally
+    """
+    local = LocalLRU(max_entries=100, max_bytes=2000)
+    for index in range(20):
+        local.set(index, 'x' * 150)
+
+    assert local.stats()['bytes'] <= 2000
+    assert local.get(0) == (False, None)
+    assert local.get(19)[0]
+
+    local.set('big', 'x' * 500)
+    assert local.get('big') == (False, None)
+
+
+def test_should_expire_local_copy_when_local_timeout_passes():
+    """
+    Test: Local staleness bound
+    Given: A local tier with a very short timeout
+    When: Reading after the timeout
+    Then: The entry is gone even though the shared timeout is longer
+    """
+    local = LocalLRU(timeout=0.01)
+    local.set('key', 'value', timeout=300)
+    time.sleep(0.02)
+
+    assert local.get('key') == (False, None)
+
+
+def test_should_return_independent_copies_when_serving_local_hits():
+    """
+    Test: Copy semantics
+    Given: A cached list
+    When: A caller mutates the list it got back
+    Then: The next hit returns the original contents
+    """
+    local = LocalLRU()
+    local.set('key', [1, 2])
+    local.get('key')[1].append(3)
+
+    assert local.get('key') == (True, [1, 2])
+
+
+# ========================================
+# INVALIDATION TESTS
+# ========================================
+
+def test_should_drop_other_workers_local_copy_when_key_is_written(workers):
+    """
+    Test: Cross-worker invalidation
+    Given: Both workers holding a local copy of a key
+    When: Worker A writes a new value
+    Then: Worker B reads the new value instead of its stale copy
+    """
+    worker_a, worker_b = workers
+    worker_a.set('key', 'old')
+    worker_b.get('key')
+
+    worker_a.set('key', 'new')
+    assert worker_b.get('key') == 'new'
+
+    worker_a.delete('key')
+    assert worker_b.get('key') is None
+
+
+def test_should_not_copy_value_locally_when_invalidation_arrives_during_fetch(shared):
+    """
+    Test: Race guard
+    Given: A shared read during which another worker's invalidation arrives
+    When: The fetch completes
+    Then: The fetched value is returned but not kept in the local tier
+    """
+    cache = TwoTierCache(shared, LocalLRU(), MemoryBroadcaster())
+    shared.set('key', 'maybe stale')
+    original_get = shared.get
+
+    def get_with_concurrent_write(key):
+        value = original_get(key)
+        cache._on_invalidate([key])
+        return value
+
+    shared.get = get_with_concurrent_write
+    assert cache.get('key') == 'maybe stale'
+    assert cache.local.get('key') == (False, None)
+
+
+def test_should_clear_every_local_tier_when_cache_is_cleared(workers):
+    """
+    Test: Clear broadcast
+    Given: Worker B holding local copies
+    When: Worker A clears the cache
+    Then: Worker B's local tier is empty
+    """
+    worker_a, worker_b = workers
+    worker_a.set_many({'a': 1, 'b': 2})
+    worker_b.get_many('a', 'b')
+
+    worker_a.clear()
+    assert len(worker_b.local) == 0
+    assert worker_b.get_many('a', 'b') == [None, None]
+
+
+def test_should_invalidate_tagged_entries_in_every_worker_when_tag_is_invalidated(workers):
+    """
+    Test: Tag invalidation across workers
+    Given: A @cached function whose entry worker B holds locally
+    When: Worker A invalidates the entry's tag
+    Then: Worker B recomputes instead of serving its local copy
+    """
+    worker_a, worker_b = workers
+    app = Flask(__name__)
+    app.config.update(TESTING=True, CACHE_TYPE='app.utils.two_tier_cache.two_tier_memory')
+    calls = []
+
+    @cached(tags=lambda component_id: [entity_tag('component', component_id)])
+    def payload(component_id):
+        calls.append(component_id)
+        return {'id': component_id, 'version': len(calls)}
+
+    with app.app_context():
+        app.cache = worker_b
+        assert payload(7)['version'] == 1
+        assert payload(7)['version'] == 1
+
+        invalidate_tags(entity_tag('component', 7), cache=worker_a)
+        assert payload(7)['version'] == 2
+
+
+# ========================================
+# OUTAGE TESTS
+# ========================================
+
+def test_should_bypass_local_tier_and_retry_with_backoff_when_subscribe_fails(shared, monkeypatch):
+    """
+    Test: Invalidation channel down
+    Given: A Redis client whose pub/sub subscribe fails
+    When: Reading repeatedly before and after the retry delay, then after Redis recovers
+    Then: Reads never raise and go to the shared tier, subscribe is only retried once the
+          backoff elapses, and local hits resume (from a cleared tier) once subscribed
+    """
+    now = [1000.0]
+    monkeypatch.setattr(two_tier_cache.time, 'monotonic', lambda: now[0])
+    redis = FlakyRedis()
+    cache = TwoTierCache(shared, LocalLRU(), RedisBroadcaster(redis, 'invalidate', retry_min=1, retry_max=4))
+    cache.local.set('key', 'stale')
+    shared.set('key', 'fresh')
+
+    assert [cache.get('key') for _ in range(3)] == ['fresh'] * 3
+    assert cache.get_many('key') == ['fresh']
+    assert shared.reads == 4
+    assert redis.subscribes == 1
+
+    now[0] += 1
+    cache.get('key')
+    assert redis.subscribes == 2
+
+    now[0] += 1
+    cache.get('key')
+    assert redis.subscribes == 2
+
+    redis.down = False
+    now[0] += 1
+    assert cache.get('key') == 'fresh'
+    assert cache.get('key') == 'fresh'
+    assert redis.subscribes == 3
+    assert shared.reads == 7
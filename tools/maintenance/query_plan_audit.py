@@ -0,0 +1,232 @@
+#!/usr/bin/env python3
+"""
+Query Plan Audit Tool
+Runs EXPLAIN (ANALYZE, BUFFERS) over the application's hot queries and flags sequential scans
+
+Usage:
+    python tools/maintenance/query_plan_audit.py
+    python tools/maintenance/query_plan_audit.py --query component_list_rejected --verbose
+    python tools/maintenance/query_plan_audit.py --min-rows 500 --json
+
+Exit codes: 0 when no query scans a large table sequentially, 1 otherwise, 2 when a query (or the
+tool itself) fails. A failing query is reported and the remaining queries are still audited.
+"""
+import sys
+import json
+import argparse
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from sqlalchemy import and_, or_, func
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.expression import ClauseElement, Executable
+
+from app import create_app, db
+from app.models import (
+    Component, ComponentVariant, Picture, Keyword, ComponentBrand, Subbrand,
+    keyword_component, component_category
+)
+from app.services.brand_service import BrandService
+from app.services.supplier_service import SupplierService
+from app.services.property_service import PropertyService
+
+
+def sample_ids():
+    """One existing ID per entity so parameterized queries hit real rows"""
+    def first(column):
+        return db.session.query(func.min(column)).scalar() or 0
+
+    return {
+        'component_id': first(Component.id),
+        'supplier_id': first(Component.supplier_id),
+        'component_type_id': first(Component.component_type_id),
+        'variant_id': first(Picture.variant_id),
+        'brand_id': first(ComponentBrand.brand_id),
+        'keyword_id': first(keyword_component.c.keyword_id),
+        'category_id': first(component_category.c.category_id),
+    }
+
+
+def hot_queries(ids):
+    """Catalogue of (name, query) pairs mirroring the index, detail, delete and export paths"""
+    listing = Component.query.order_by(Component.created_at.desc())
+    return [
+        ('component_list_default', listing.limit(50)),
+        ('component_list_supplier', listing.filter(Component.supplier_id == ids['supplier_id']).limit(50)),
+        ('component_list_type', listing.filter(Component.component_type_id == ids['component_type_id']).limit(50)),
+        ('component_list_approved', listing.filter(and_(
+            Component.proto_status == 'ok', Component.sms_status == 'ok', Component.pps_status == 'ok'
+        )).limit(50)),
+        ('component_list_pending', listing.filter(or_(
+            Component.proto_status == 'pending', Component.sms_status == 'pending', Component.pps_status == 'pending'
+        )).limit(50)),
+        ('component_list_rejected', listing.filter(or_(
+            Component.proto_status == 'not_ok', Component.sms_status == 'not_ok', Component.pps_status == 'not_ok'
+        )).limit(50)),
+        ('component_list_brand', listing.filter(Component.id.in_(
+            db.session.query(ComponentBrand.component_id).filter(ComponentBrand.brand_id == ids['brand_id'])
+        )).limit(50)),
+        ('component_list_keyword', listing.filter(Component.id.in_(
+            db.session.query(keyword_component.c.component_id)
+            .filter(keyword_component.c.keyword_id == ids['keyword_id'])
+        )).limit(50)),
+        ('component_list_category', listing.filter(Component.id.in_(
+            db.session.query(component_category.c.component_id)
+            .filter(component_category.c.category_id == ids['category_id'])
+        )).limit(50)),
+        ('component_list_property', listing.filter(
+            PropertyService.component_property_filter('material', ['polyester'])
+        ).limit(50)),
+        ('component_detail_variants', ComponentVariant.query.filter(
+            ComponentVariant.component_id == ids['component_id'], ComponentVariant.is_active.is_(True)
+        ).order_by(ComponentVariant.id)),
+        ('component_detail_pictures', Picture.query.filter(
+            Picture.component_id == ids['component_id']
+        ).order_by(Picture.picture_order)),
+        ('variant_primary_picture', Picture.query.filter(
+            Picture.variant_id == ids['variant_id'], Picture.is_primary.is_(True)
+        )),
+        ('supplier_components', SupplierService.components_query(ids['supplier_id']).limit(20)),
+        ('supplier_overview', SupplierService.overview_query()),
+        ('brand_stats_page', BrandService.brand_stats_query().limit(20)),
+        ('brand_delete_dependencies', db.session.query(Subbrand.id).filter(Subbrand.brand_id == ids['brand_id'])),
+        ('keyword_popular', Keyword.query.order_by(Keyword.usage_count.desc(), Keyword.name).limit(20)),
+        ('export_window', Component.query.order_by(Component.id).limit(500)),
+    ]
+
+
+class Explain(Executable, ClauseElement):
+    """EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) around a statement, keeping its bind types"""
+
+    inherit_cache = False
+
+    def __init__(self, statement):
+        self.statement = statement
+
+
+@compiles(Explain, 'postgresql')
+def _compile_explain(element, compiler, **kw):
+    # Compiled by the statement's own compiler, so JSONB and IN parameters are processed as usual
+    return f'EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) {compiler.process(element.statement, **kw)}'
+
+
+def explain(query):
+    """Run EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) inside a rolled-back transaction"""
+    connection = db.engine.connect()
+    transaction = connection.begin()
+    try:
+        result = connection.execute(Explain(query.statement)).scalar()
+    finally:
+        transaction.rollback()
+        connection.close()
+    plan = result if isinstance(result, list) else json.loads(result)
+    return plan[0]
+
+
+def find_seq_scans(plan_node, min_rows):
+    """Sequential scans over tables that read at least min_rows rows"""
+    scans = []
+    if plan_node.get('Node Type') == 'Seq Scan':
+        rows_read = plan_node.get('Actual Rows', 0) + plan_node.get('Rows Removed by Filter', 0)
+        if rows_read >= min_rows:
+            scans.append({
+                'relation': plan_node.get('Relation Name'),
+                'rows_read': rows_read,
+                'filter': plan_node.get('Filter')
+            })
+    for child in plan_node.get('Plans', []):
+        scans.extend(find_seq_scans(child, min_rows))
+    return scans
+
+
+def audit(names=None, min_rows=1000, verbose=False):
+    """
+    Explain every selected hot query and collect timing, buffer and seq scan findings.
+    A query that fails gets {'name': ..., 'error': ...} instead of findings.
+    """
+    results = []
+    for name, query in hot_queries(sample_ids()):
+        if names and name not in names:
+            continue
+        try:
+            explained = explain(query)
+        except Exception as e:
+            results.append({'name': name, 'error': str(e)})
+            continue
+        plan = explained['Plan']
+        result = {
+            'name': name,
+            'execution_ms': explained.get('Execution Time'),
+            'shared_hit_blocks': plan.get('Shared Hit Blocks', 0),
+            'shared_read_blocks': plan.get('Shared Read Blocks', 0),
+            'seq_scans': find_seq_scans(plan, min_rows)
+        }
+        if verbose:
+            result['plan'] = plan
+        results.append(result)
+    return results
+
+
+def print_report(results):
+    flagged = [r for r in results if r.get('seq_scans')]
+    failed = [r for r in results if 'error' in r]
+    print(f"{'Query':<30} {'Time (ms)':>10} {'Hit':>8} {'Read':>8}  Status")
+    print('-' * 72)
+    for result in results:
+        if 'error' in result:
+            print(f"{result['name']:<30} {'-':>10} {'-':>8} {'-':>8}  ❌ ERROR")
+            print(f"   {result['error']}")
+            continue
+        status = '❌ SEQ SCAN' if result['seq_scans'] else '✅'
+        print(f"{result['name']:<30} {result['execution_ms'] or 0:>10.2f} "
+              f"{result['shared_hit_blocks']:>8} {result['shared_read_blocks']:>8}  {status}")
+        for scan in result['seq_scans']:
+            print(f"   {scan['relation']}: {scan['rows_read']} rows read"
+                  + (f" (filter: {scan['filter']})" if scan['filter'] else ''))
+        if 'plan' in result:
+            print(json.dumps(result['plan'], indent=2))
+    print('-' * 72)
+    print(f"{len(results)} queries audited, {len(flagged)} with sequential scans, {len(failed)} failed")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Audit query plans of hot application queries")
+    parser.add_argument('--query', action='append', help='Only audit this query (repeatable)')
+    parser.add_argument('--list', action='store_true', help='List catalogued queries and exit')
+    parser.add_argument(
+        '--min-rows',
+        type=int,
+        default=1000,
+        help='Ignore sequential scans reading fewer rows; small tables are cheaper to scan (default: 1000)'
+    )
+    parser.add_argument('--verbose', action='store_true', help='Print the full plan of each query')
+    parser.add_argument('--json', action='store_true', help='Output results in JSON format')
+
+    args = parser.parse_args()
+
+    app = create_app()
+    with app.app_context():
+        if args.list:
+            for name, _ in hot_queries(sample_ids()):
+                print(name)
+            return 0
+
+        try:
+            results = audit(args.query, args.min_rows, args.verbose)
+        except Exception as e:
+            print(f"❌ Query plan audit failed: {str(e)}")
+            return 2
+
+    if args.json:
+        print(json.dumps(results, indent=2, default=str))
+    else:
+        print_report(results)
+
+    if any('error' in r for r in results):
+        return 2
+    return 1 if any(r.get('seq_scans') for r in results) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
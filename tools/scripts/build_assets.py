@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+"""
+Static Asset Build Tool
+Fingerprints the JS and CSS under app/static into ASSETS_OUTPUT_FOLDER, builds the per-page
+bundles with their .gz/.br variants and writes the manifest, so deployments start with ready
+assets instead of building them at startup
+
+Usage:
+    python tools/scripts/build_assets.py
+    python tools/scripts/build_assets.py --output /srv/assets --list
+
+Exit codes: 0 on success, 2 on errors.
+"""
+import sys
+import argparse
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from config import Config
+from app.utils.assets import build_manifest
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fingerprint static assets and write the asset manifest")
+    parser.add_argument(
+        '--static', default=str(Path(__file__).parent.parent.parent / 'app' / 'static'),
+        help='Static source folder (default: app/static)'
+    )
+    parser.add_argument('--output', default=Config.ASSETS_OUTPUT_FOLDER, help='Output folder (default: ASSETS_OUTPUT_FOLDER)')
+    parser.add_argument('--list', action='store_true', help='Print every source -> fingerprinted name')
+    args = parser.parse_args()
+
+    try:
+        manifest = build_manifest(args.static, args.output)
+    except (OSError, ValueError) as e:
+        print(f"❌ Asset build failed: {e}")
+        return 2
+
+    if args.list:
+        for source, fingerprinted in sorted(manifest.items()):
+            print(f"{source} -> {fingerprinted}")
+    print(f"✅ {len(manifest)} assets fingerprinted into {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())